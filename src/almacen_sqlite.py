@@ -0,0 +1,274 @@
+"""
+Almacén de partidas en SQLite (alternativa a historial.py).
+
+Pensado para clasificaciones con cientos de miles de partidas: por día,
+por nivel y por jugador. Usa solo el módulo sqlite3 de la biblioteca
+estándar:
+
+- Modo WAL: las lecturas no esperan a las escrituras.
+- Índices sobre puntuación, día, nivel y jugador, para que las consultas
+  de "mejores N" y percentiles recorran solo el índice.
+- Las inserciones las hace un hilo escritor en segundo plano, agrupadas en
+  lotes (una transacción por lote), así que agregar() no espera al disco.
+- record() y len() salen de un máximo y un contador en memoria que se
+  actualizan al encolar, sin esperar al hilo escritor: main.py los
+  consulta desde el hilo de Tk justo al terminar cada partida.
+- Si falla un lote, el error se lanza en el siguiente agregar() (y en
+  esperar()), así que el escritor de main.py lo muestra con
+  informar_escritura. Tras un fallo, record() y len() pueden contar
+  partidas que no llegaron a guardarse.
+
+Tiene la misma interfaz que HistorialPartidas (agregar, ultimas, mejores,
+record, cerrar), así que main.py puede usar uno u otro.
+"""
+
+import queue
+import sqlite3
+import threading
+
+# =============================================
+# CONFIGURACIÓN DEL ALMACÉN
+# =============================================
+
+# Máximo de partidas por transacción del hilo escritor
+TAMANO_LOTE = 500
+
+# Segundos que el hilo escritor espera a que lleguen más partidas antes de
+# confirmar un lote incompleto
+ESPERA_LOTE = 0.05
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    dia TEXT NOT NULL,
+    jugador TEXT NOT NULL DEFAULT '',
+    puntuacion INTEGER NOT NULL,
+    nivel INTEGER NOT NULL,
+    lineas INTEGER NOT NULL,
+    tiempo REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_puntuacion ON partidas (puntuacion DESC);
+CREATE INDEX IF NOT EXISTS idx_partidas_dia ON partidas (dia, puntuacion DESC);
+CREATE INDEX IF NOT EXISTS idx_partidas_nivel ON partidas (nivel, puntuacion DESC);
+CREATE INDEX IF NOT EXISTS idx_partidas_jugador ON partidas (jugador, puntuacion DESC);
+"""
+
+COLUMNAS = ("fecha", "jugador", "puntuacion", "nivel", "lineas", "tiempo")
+
+# Filtros permitidos en mejores() y su columna
+FILTROS = {"dia": "dia", "nivel": "nivel", "jugador": "jugador"}
+
+# Marca que pide al hilo escritor que termine
+_FIN = object()
+
+# =============================================
+# ALMACÉN
+# =============================================
+
+class AlmacenSQLite:
+    """
+    Partidas guardadas en una base de datos SQLite.
+
+    Uso típico:
+        almacen = AlmacenSQLite("tetris.db")
+        almacen.agregar({'fecha': '2024-05-01 10:00:00', 'puntuacion': 1200, ...})
+        almacen.mejores(10, dia='2024-05-01')
+        almacen.percentil(90)
+        almacen.cerrar()        # espera a que se escriban las pendientes
+    """
+
+    def __init__(self, ruta, tamano_lote=TAMANO_LOTE):
+        """
+        Args:
+            ruta (str): Archivo de la base de datos
+            tamano_lote (int): Máximo de partidas por transacción
+        """
+        self.ruta = ruta
+        self.tamano_lote = tamano_lote
+
+        # Conexión de lectura (hilo de la interfaz)
+        self.conexion = self._conectar()
+        self.conexion.executescript(ESQUEMA)
+
+        # Récord y número de partidas, actualizados al encolar
+        self.cerrojo = threading.Lock()
+        self.total, self.maximo = self.conexion.execute(
+            "SELECT COUNT(*), COALESCE(MAX(puntuacion), 0) FROM partidas"
+        ).fetchone()
+
+        # Hilo escritor con su propia conexión
+        self.cola = queue.Queue()
+        self.error_escritura = None
+        self.hilo = threading.Thread(target=self._escribir_en_segundo_plano,
+                                     name="AlmacenSQLite", daemon=True)
+        self.hilo.start()
+
+    def _conectar(self):
+        """Abre una conexión configurada en modo WAL"""
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")  # Seguro en WAL, fsync por checkpoint
+        return conexion
+
+    # -----------------------------------------
+    # Escritura
+    # -----------------------------------------
+
+    def agregar(self, partida):
+        """
+        Encola una partida para guardarla (no espera al disco).
+
+        Args:
+            partida (dict): 'fecha', 'puntuacion', 'nivel', 'lineas', 'tiempo'
+                            y opcionalmente 'jugador'
+
+        Raises:
+            sqlite3.Error: Si falló un lote anterior (esta partida sí se encola)
+        """
+        self.cola.put(tuple(partida.get(columna, "") if columna == "jugador"
+                            else partida[columna] for columna in COLUMNAS))
+        with self.cerrojo:
+            self.total += 1
+            self.maximo = max(self.maximo, partida['puntuacion'])
+        self._lanzar_error()
+        return True
+
+    def importar(self, partidas):
+        """Encola muchas partidas de golpe (por ejemplo, el historial JSONL)"""
+        for partida in partidas:
+            self.agregar(partida)
+
+    def _escribir_en_segundo_plano(self):
+        """Bucle del hilo escritor: agrupa lo que haya en la cola en lotes"""
+        conexion = self._conectar()
+        terminar = False
+        while not terminar:
+            lote = [self.cola.get()]
+            while len(lote) < self.tamano_lote and lote[-1] is not _FIN:
+                try:
+                    lote.append(self.cola.get(timeout=ESPERA_LOTE))
+                except queue.Empty:
+                    break
+
+            filas = [fila for fila in lote if fila is not _FIN]
+            terminar = len(filas) != len(lote)
+            try:
+                if filas:
+                    with conexion:  # Una transacción por lote
+                        conexion.executemany(
+                            "INSERT INTO partidas (fecha, dia, jugador, puntuacion, nivel, lineas, tiempo) "
+                            "VALUES (?, substr(?, 1, 10), ?, ?, ?, ?, ?)",
+                            [(fila[0],) + fila for fila in filas]
+                        )
+            except sqlite3.Error as e:
+                self.error_escritura = e
+                print(f"Error guardando partidas en {self.ruta}: {e}")
+            finally:
+                for _ in lote:
+                    self.cola.task_done()
+        conexion.close()
+
+    def _lanzar_error(self):
+        """Lanza (una sola vez) el último error del hilo escritor, si lo hubo"""
+        error, self.error_escritura = self.error_escritura, None
+        if error is not None:
+            raise error
+
+    def esperar(self):
+        """
+        Espera a que el hilo escritor haya guardado todo lo encolado.
+
+        Raises:
+            sqlite3.Error: Si falló algún lote desde el último aviso
+        """
+        if self.hilo.is_alive():
+            self.cola.join()
+        self._lanzar_error()
+
+    def cerrar(self):
+        """Guarda lo pendiente y cierra las conexiones"""
+        if self.hilo.is_alive():
+            self.cola.put(_FIN)
+            self.hilo.join()
+        self.conexion.close()
+
+    # -----------------------------------------
+    # Consultas
+    # -----------------------------------------
+
+    def _consultar(self, sql, parametros=()):
+        """Ejecuta una consulta tras guardar lo pendiente"""
+        self.esperar()
+        return self.conexion.execute(sql, parametros).fetchall()
+
+    @staticmethod
+    def _como_dict(fila):
+        """Convierte una fila (fecha, jugador, puntuacion, ...) en dict"""
+        return dict(zip(COLUMNAS, fila))
+
+    def __len__(self):
+        """Partidas guardadas o encoladas (sin esperar al hilo escritor)"""
+        return self.total
+
+    def record(self):
+        """Mejor puntuación guardada o encolada (0 si no hay partidas)"""
+        return self.maximo
+
+    def ultimas(self, cantidad=10):
+        """Últimas partidas, la más reciente primero"""
+        filas = self._consultar(
+            f"SELECT {', '.join(COLUMNAS)} FROM partidas ORDER BY id DESC LIMIT ?", (cantidad,)
+        )
+        return [self._como_dict(fila) for fila in filas]
+
+    def mejores(self, cantidad=10, **filtros):
+        """
+        Partidas con más puntos, la mejor primero.
+
+        Args:
+            cantidad (int): Número de partidas
+            **filtros: dia='AAAA-MM-DD', nivel=N y/o jugador='nombre'
+
+        Returns:
+            list: Partidas (dict)
+        """
+        condiciones = []
+        parametros = []
+        for nombre, valor in filtros.items():
+            if nombre not in FILTROS:
+                raise ValueError(f"Filtro desconocido: {nombre}")
+            condiciones.append(f"{FILTROS[nombre]} = ?")
+            parametros.append(valor)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        filas = self._consultar(
+            f"SELECT {', '.join(COLUMNAS)} FROM partidas {donde} "
+            f"ORDER BY puntuacion DESC, id LIMIT ?",
+            parametros + [cantidad]
+        )
+        return [self._como_dict(fila) for fila in filas]
+
+    def percentil(self, porcentaje):
+        """
+        Puntuación por debajo de la cual queda el 'porcentaje' % de las partidas.
+
+        Args:
+            porcentaje (float): 0..100
+
+        Returns:
+            int: Puntuación (0 si no hay partidas)
+        """
+        self.esperar()  # Para que el total coincida con las filas de la tabla
+        total = len(self)
+        if total == 0:
+            return 0
+        posicion = min(total - 1, int(total * porcentaje / 100))
+        return self._consultar(
+            "SELECT puntuacion FROM partidas ORDER BY puntuacion LIMIT 1 OFFSET ?", (posicion,)
+        )[0][0]
+
+    def posicion(self, puntuacion):
+        """Puesto que tendría una puntuación en la clasificación general (1 = mejor)"""
+        return self._consultar(
+            "SELECT COUNT(*) FROM partidas WHERE puntuacion > ?", (puntuacion,)
+        )[0][0] + 1
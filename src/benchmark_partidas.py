@@ -0,0 +1,259 @@
+"""
+Benchmark de partidas completas sin interfaz.
+
+Complementa a benchmark_reglas.py: en lugar de funciones sueltas, juega
+partidas enteras con MotorTetris por el camino completo de las reglas
+(aparición con crear_siguiente_pieza, movimientos y gravedad, fijar_pieza_actual,
+líneas, actualizar_estadisticas y fin de partida), con semillas fijas.
+
+Cada ejecución combina una política y un tablero:
+
+- Políticas: "aleatoria" (rotación y columna al azar con su propia semilla,
+  partidas cortas), "codiciosa" (granja_simulacion.politica_codiciosa, solo
+  la pieza actual y caída vertical) y "bot" (JugadorAutomatico con
+  jugar_partida_automatica, el jugador de la tecla A). Las dos últimas
+  juegan partidas largas hasta MAXIMO_PIEZAS.
+- Tableros: "lista" (TableroLista, el de main.py) y "bits" (TableroBits).
+
+Por cada una da partidas por segundo, piezas por segundo y el pico de
+memoria (tracemalloc, en una pasada aparte porque ralentiza), además de
+la puntuación y las piezas totales: con las mismas semillas tienen que
+coincidir entre tableros. Donde existe el módulo resource (no en
+Windows) el informe incluye también la memoria residente máxima.
+--comparar marca las ejecuciones cuyas piezas por segundo bajan más de
+--tolerancia respecto a un informe guardado.
+
+    python benchmark_partidas.py --guardar-base base.json
+    python benchmark_partidas.py --comparar base.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage
+    resource = None
+
+from granja_simulacion import jugar_partida, politica_codiciosa
+from jugador_automatico import jugar_partida_automatica
+from motor_tetris import ANCHO_TABLERO, FORMAS_PIEZAS, MotorTetris, TableroLista
+from tablero_bits import TableroBits
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Semilla de la primera partida (la partida i usa SEMILLA_INICIAL + i)
+SEMILLA_INICIAL = 1000
+
+# Partidas por ejecución y tope de piezas por partida
+PARTIDAS = {"aleatoria": 2000, "codiciosa": 10, "bot": 3}
+MAXIMO_PIEZAS = 500
+
+# Partidas de la pasada con tracemalloc
+PARTIDAS_MEMORIA = 3
+
+# Pérdida de piezas por segundo a partir de la cual hay regresión
+TOLERANCIA = 0.10
+
+TABLEROS = {"lista": TableroLista, "bits": TableroBits}
+
+# =============================================
+# POLÍTICAS
+# =============================================
+
+def crear_politica_aleatoria(semilla):
+    """Política que elige rotación y columna al azar (reproducible con la semilla)"""
+    aleatorio = random.Random(semilla)
+
+    def politica(motor):
+        tipo = motor.pieza_actual['tipo']
+        return (aleatorio.randrange(len(FORMAS_PIEZAS[tipo])),
+                aleatorio.randrange(-1, ANCHO_TABLERO - 1))
+
+    return politica
+
+
+def crear_politica(nombre, semilla):
+    """Política para jugar_partida: la aleatoria depende de la semilla, la codiciosa no"""
+    if nombre == "aleatoria":
+        return crear_politica_aleatoria(semilla)
+    if nombre == "codiciosa":
+        return politica_codiciosa
+    raise ValueError(f"Política desconocida: {nombre}")
+
+
+def jugar_una(politica, semilla, clase_tablero, maximo_piezas):
+    """
+    Juega una partida con la política indicada.
+
+    "bot" juega con JugadorAutomatico pulsando sus teclas, sin gravedad;
+    las demás, con granja_simulacion.jugar_partida.
+
+    Returns:
+        tuple: (puntuación, piezas)
+    """
+    if politica == "bot":
+        motor = MotorTetris(semilla=semilla, clase_tablero=clase_tablero)
+        piezas = jugar_partida_automatica(motor, maximo_piezas)
+        return motor.puntuacion, piezas
+    resultado = jugar_partida(semilla, politica=crear_politica(politica, semilla),
+                              maximo_piezas=maximo_piezas, clase_tablero=clase_tablero)
+    return resultado[1], resultado[4]
+
+# =============================================
+# MEDICIÓN
+# =============================================
+
+def jugar_partidas(politica, clase_tablero, partidas, maximo_piezas=MAXIMO_PIEZAS):
+    """
+    Juega 'partidas' partidas con semillas fijas.
+
+    Returns:
+        tuple: (puntuación total, piezas totales)
+    """
+    puntuacion = 0
+    piezas = 0
+    for indice in range(partidas):
+        puntos, colocadas = jugar_una(politica, SEMILLA_INICIAL + indice, clase_tablero,
+                                      maximo_piezas)
+        puntuacion += puntos
+        piezas += colocadas
+    return puntuacion, piezas
+
+
+def medir(politica, nombre_tablero, partidas, maximo_piezas=MAXIMO_PIEZAS):
+    """
+    Cronometra una ejecución y mide su pico de memoria aparte.
+
+    Returns:
+        dict: partidas_por_segundo, piezas_por_segundo, segundos,
+              memoria_pico_bytes, puntuacion_total, piezas_total
+    """
+    clase_tablero = TABLEROS[nombre_tablero]
+    inicio = time.perf_counter()
+    puntuacion, piezas = jugar_partidas(politica, clase_tablero, partidas, maximo_piezas)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    try:
+        jugar_partidas(politica, clase_tablero, min(partidas, PARTIDAS_MEMORIA), maximo_piezas)
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'partidas_por_segundo': round(partidas / segundos, 2),
+        'piezas_por_segundo': round(piezas / segundos, 1),
+        'segundos': round(segundos, 3),
+        'memoria_pico_bytes': memoria_pico,
+        'puntuacion_total': puntuacion,
+        'piezas_total': piezas,
+    }
+
+
+def ejecutar(politicas=tuple(PARTIDAS), tableros=tuple(TABLEROS), escala=1.0,
+             maximo_piezas=MAXIMO_PIEZAS):
+    """
+    Ejecuta todas las combinaciones de política y tablero.
+
+    Args:
+        escala (float): Multiplica el número de partidas de PARTIDAS
+
+    Returns:
+        dict: Informe con la plataforma y 'resultados' por "politica/tablero"
+    """
+    resultados = {}
+    for politica in politicas:
+        partidas = max(1, round(PARTIDAS[politica] * escala))
+        for tablero in tableros:
+            resultados[f"{politica}/{tablero}"] = medir(politica, tablero, partidas, maximo_piezas)
+    informe = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'maximo_piezas': maximo_piezas,
+        'resultados': resultados,
+    }
+    if resource is not None:
+        # Pico de memoria residente de todo el proceso (KiB en Linux)
+        informe['memoria_residente_maxima'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return informe
+
+
+def comparar(informe, base, tolerancia=TOLERANCIA):
+    """
+    Compara las piezas por segundo de cada ejecución con las de un informe base.
+
+    Returns:
+        dict: nombre -> {base, actual, cambio (fracción), regresion (bool)}
+    """
+    comparacion = {}
+    for nombre, actual in informe['resultados'].items():
+        anterior = base['resultados'].get(nombre)
+        if anterior is None:
+            continue
+        cambio = actual['piezas_por_segundo'] / anterior['piezas_por_segundo'] - 1
+        comparacion[nombre] = {
+            'base': anterior['piezas_por_segundo'],
+            'actual': actual['piezas_por_segundo'],
+            'cambio': round(cambio, 4),
+            'regresion': cambio < -tolerancia,
+        }
+    return comparacion
+
+# =============================================
+# LÍNEA DE COMANDOS
+# =============================================
+
+def main(argumentos=None):
+    """Ejecuta el benchmark y escribe el informe JSON; devuelve 1 si hay regresiones"""
+    parser = argparse.ArgumentParser(description="Benchmark de partidas completas de Tetris")
+    parser.add_argument("--politica", choices=sorted(PARTIDAS), action="append",
+                        help="Solo esta política (se puede repetir)")
+    parser.add_argument("--tablero", choices=sorted(TABLEROS), action="append",
+                        help="Solo este tablero (se puede repetir)")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="Multiplica el número de partidas de cada ejecución")
+    parser.add_argument("--maximo-piezas", type=int, default=MAXIMO_PIEZAS)
+    parser.add_argument("--salida", help="Archivo JSON del informe (por defecto, la salida estándar)")
+    parser.add_argument("--guardar-base", help="Guarda también el informe como base de comparación")
+    parser.add_argument("--comparar", help="Informe base con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Pérdida de piezas/s que cuenta como regresión (0.10 = 10 %%)")
+    opciones = parser.parse_args(argumentos)
+
+    informe = ejecutar(opciones.politica or tuple(PARTIDAS), opciones.tablero or tuple(TABLEROS),
+                       opciones.escala, opciones.maximo_piezas)
+    regresiones = []
+    if opciones.comparar:
+        with open(opciones.comparar, 'r', encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        informe['comparacion'] = comparar(informe, base, opciones.tolerancia)
+        regresiones = [nombre for nombre, datos in informe['comparacion'].items()
+                       if datos['regresion']]
+        informe['regresiones'] = regresiones
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    if opciones.guardar_base:
+        with open(opciones.guardar_base, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + "\n")
+
+    for nombre in regresiones:
+        print(f"Regresión: {nombre} ({informe['comparacion'][nombre]['cambio']:+.1%})",
+              file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
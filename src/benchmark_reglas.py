@@ -0,0 +1,433 @@
+"""
+Micro-benchmarks de las funciones básicas de las reglas.
+
+Mide, sobre tableros de prueba reproducibles (SITUACIONES: vacío, mitad
+de partida, a punto de perder y "queso suizo"), las funciones que se
+llaman en cada pulsación o en cada pieza:
+
+- MotorTetris (main.py), con TableroLista y con TableroBits:
+  verificar_colision, encontrar_lineas_completas,
+  obtener_posicion_fantasma y rotar_pieza.
+- La versión con velocidad (funciones de módulo sobre board_state):
+  verificar_colision, limpiar_lineas_completas y obtener_posicion_fantasma.
+  Su rotar_pieza dibuja en el lienzo, así que no se mide.
+
+Por cada medida da operaciones por segundo, p50 y p99 de lotes
+(p50_lote_ns/p99_lote_ns: percentiles del tiempo medio por llamada de
+cada lote de SONDAS llamadas, no de llamadas sueltas, que duran decenas
+de ns y el reloj no las resuelve bien) y, con tracemalloc, el pico de
+memoria de una llamada y los bytes que quedan reservados por llamada.
+
+Las medidas se repiten en --ejecuciones pasadas cortas por todas ellas
+y de cada una se queda la mediana de las medianas de las pasadas, que es
+lo que menos cambia de una ejecución a otra. El mínimo no sirve: en
+máquinas con CPU a ráfagas recoge las pasadas que caen en una ráfaga, y
+con pocas pasadas largas una ráfaga se lleva la mediana entera. El
+resultado es JSON; con --comparar se compara con un informe guardado con
+--guardar-base y se marcan las regresiones (mediana de las medianas más
+de --tolerancia más lenta):
+
+    python benchmark_reglas.py --guardar-base base.json
+    ... cambios ...
+    python benchmark_reglas.py --comparar base.json
+
+Los dos informes tienen que hacerse en la misma máquina y sin carga: en
+máquinas virtuales con CPU a ráfagas una sola pasada puede variar más
+que la tolerancia, y por eso se compara la mediana de varias.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import tetris_game_final_version_con_velocidad as version_velocidad
+from motor_tetris import ALTO_TABLERO, ANCHO_TABLERO, FORMAS_PIEZAS, MotorTetris, TableroLista
+from tablero_bits import TableroBits
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Semilla de los tableros de prueba y de las posiciones que se consultan
+SEMILLA = 2024
+
+# Posiciones de pieza (tipo, rotación, x, y) por lote de llamadas
+SONDAS = 64
+
+# Lotes cronometrados por medida y pasada (y lotes de calentamiento antes)
+REPETICIONES = 100
+CALENTAMIENTO = 20
+
+# Pasadas completas por todas las medidas; se queda la mediana de las medianas
+EJECUCIONES = 15
+
+# Llamadas sobre las que se mide la memoria que queda reservada
+LLAMADAS_MEMORIA = 200
+
+# Pérdida de velocidad (en la mediana de las medianas) a partir de la cual hay regresión
+TOLERANCIA = 0.10
+
+# =============================================
+# TABLEROS DE PRUEBA
+# =============================================
+
+def fila_con_huecos(aleatorio, huecos):
+    """Fila llena de piezas al azar salvo 'huecos' columnas vacías"""
+    fila = [aleatorio.randint(1, 7) for _ in range(ANCHO_TABLERO)]
+    for columna in aleatorio.sample(range(ANCHO_TABLERO), huecos):
+        fila[columna] = 0
+    return fila
+
+
+def crear_situacion(nombre, semilla=SEMILLA):
+    """
+    Matriz de filas de un tablero de prueba, siempre la misma para cada nombre.
+
+    - vacio: tablero vacío
+    - medio: 8 filas ocupadas con 1-2 huecos, una de ellas completa
+    - casi_lleno: 17 filas ocupadas con un hueco, dos completas
+    - queso: 12 filas con cada celda ocupada al 55 %, sin filas completas
+    """
+    aleatorio = random.Random(f"{semilla}-{nombre}")
+    filas = [[0] * ANCHO_TABLERO for _ in range(ALTO_TABLERO)]
+    if nombre == "medio":
+        for fila in range(ALTO_TABLERO - 8, ALTO_TABLERO):
+            filas[fila] = fila_con_huecos(aleatorio, aleatorio.randint(1, 2))
+        filas[ALTO_TABLERO - 3] = fila_con_huecos(aleatorio, 0)
+    elif nombre == "casi_lleno":
+        for fila in range(3, ALTO_TABLERO):
+            filas[fila] = fila_con_huecos(aleatorio, 1)
+        filas[10] = fila_con_huecos(aleatorio, 0)
+        filas[ALTO_TABLERO - 2] = fila_con_huecos(aleatorio, 0)
+    elif nombre == "queso":
+        for fila in range(ALTO_TABLERO - 12, ALTO_TABLERO):
+            filas[fila] = [aleatorio.randint(1, 7) if aleatorio.random() < 0.55 else 0
+                           for _ in range(ANCHO_TABLERO)]
+            if 0 not in filas[fila]:
+                filas[fila][aleatorio.randrange(ANCHO_TABLERO)] = 0
+    elif nombre != "vacio":
+        raise ValueError(f"Tablero de prueba desconocido: {nombre}")
+    return filas
+
+
+SITUACIONES = ("vacio", "medio", "casi_lleno", "queso")
+
+
+def crear_sondas(filas, semilla=SEMILLA, cantidad=SONDAS):
+    """
+    Posiciones de pieza para consultar sobre un tablero.
+
+    Returns:
+        tuple: (todas, validas): 'cantidad' posiciones (tipo, rotación, x, y)
+               al azar y las que no colisionan (al menos una)
+    """
+    aleatorio = random.Random(semilla)
+    tablero = TableroLista.desde_filas(filas)
+    todas = []
+    validas = []
+    while len(todas) < cantidad or not validas:
+        tipo = aleatorio.randint(1, 7)
+        sonda = (tipo, aleatorio.randrange(len(FORMAS_PIEZAS[tipo])),
+                 aleatorio.randint(-2, ANCHO_TABLERO - 1), aleatorio.randint(0, ALTO_TABLERO - 1))
+        if len(todas) < cantidad:
+            todas.append(sonda)
+        if not tablero.colisiona(*sonda):
+            validas.append(sonda)
+    return todas, validas[:cantidad]
+
+# =============================================
+# FUNCIONES A MEDIR
+# =============================================
+
+def medidas_motor(nombre_tablero, clase_tablero, filas):
+    """
+    Medidas de MotorTetris sobre un tablero de prueba.
+
+    Returns:
+        dict: nombre -> (función, argumentos de un lote, restaurar)
+    """
+    todas, validas = crear_sondas(filas)
+    motor = MotorTetris(semilla=SEMILLA, clase_tablero=clase_tablero)
+    motor.tablero = clase_tablero.desde_filas(filas)
+    # rotar_pieza cambia la rotación de la pieza: cada medida tiene sus
+    # propias piezas y las de rotar se reponen antes de cada lote
+    piezas_fantasma = [{'tipo': t, 'rotacion': r, 'x': x, 'y': y} for t, r, x, y in validas]
+    piezas_rotar = [dict(pieza) for pieza in piezas_fantasma]
+
+    def colision(sonda):
+        return motor.verificar_colision(*sonda)
+
+    def lineas(_):
+        return motor.encontrar_lineas_completas()
+
+    def restaurar_tablero():
+        motor.tablero = clase_tablero.desde_filas(filas)
+
+    def restaurar_rotar():
+        restaurar_tablero()
+        for pieza, (_, rotacion, _, _) in zip(piezas_rotar, validas):
+            pieza['rotacion'] = rotacion
+
+    def fantasma(pieza):
+        motor.pieza_actual = pieza
+        return motor.obtener_posicion_fantasma()
+
+    def rotar(pieza):
+        motor.pieza_actual = pieza
+        return motor.rotar_pieza()
+
+    # Todas comparten el motor: cada lote empieza con el tablero de prueba
+    prefijo = f"motor_{nombre_tablero}"
+    return {
+        f"{prefijo}.verificar_colision": (colision, todas, restaurar_tablero),
+        f"{prefijo}.encontrar_lineas_completas": (lineas, [None], restaurar_tablero),
+        f"{prefijo}.obtener_posicion_fantasma": (fantasma, piezas_fantasma, restaurar_tablero),
+        f"{prefijo}.rotar_pieza": (rotar, piezas_rotar, restaurar_rotar),
+    }
+
+
+def medidas_velocidad(filas):
+    """Medidas de las funciones de la versión con velocidad (ver medidas_motor)"""
+    todas, validas = crear_sondas(filas)
+    formas = version_velocidad.PIECE_SHAPES_COMPILED
+    sondas = [(formas[t][r % len(formas[t])], x, y) for t, r, x, y in todas]
+    piezas = [{'shape_index': t, 'rotation': r % len(formas[t]), 'x': x, 'y': y}
+              for t, r, x, y in validas]
+
+    def colision(sonda):
+        return version_velocidad.verificar_colision(*sonda)
+
+    def lineas(_):
+        return version_velocidad.limpiar_lineas_completas()
+
+    def restaurar_tablero():
+        version_velocidad.board_state = [list(fila) for fila in filas]
+        version_velocidad.recalcular_alturas()
+
+    def fantasma(pieza):
+        version_velocidad.current_piece = pieza
+        return version_velocidad.obtener_posicion_fantasma()
+
+    # board_state es global del módulo: cada lote empieza con el tablero de prueba
+    return {
+        "velocidad.verificar_colision": (colision, sondas, restaurar_tablero),
+        "velocidad.limpiar_lineas_completas": (lineas, [None], restaurar_tablero),
+        "velocidad.obtener_posicion_fantasma": (fantasma, piezas, restaurar_tablero),
+    }
+
+
+def crear_medidas(situaciones=SITUACIONES):
+    """Todas las medidas: 'objetivo.funcion/situacion' -> (función, argumentos, restaurar)"""
+    medidas = {}
+    for situacion in situaciones:
+        filas = crear_situacion(situacion)
+        for grupo in (medidas_motor("lista", TableroLista, filas),
+                      medidas_motor("bits", TableroBits, filas),
+                      medidas_velocidad(filas)):
+            for nombre, medida in grupo.items():
+                medidas[f"{nombre}/{situacion}"] = medida
+    return medidas
+
+# =============================================
+# MEDICIÓN
+# =============================================
+
+def percentil(valores_ordenados, fraccion):
+    """Percentil (por el rango más cercano) de una lista ya ordenada"""
+    indice = min(len(valores_ordenados) - 1, int(fraccion * len(valores_ordenados)))
+    return valores_ordenados[indice]
+
+
+def cronometrar(funcion, argumentos, restaurar=None, repeticiones=REPETICIONES):
+    """
+    Cronometra 'repeticiones' lotes de llamadas.
+
+    Cada lote llama a funcion(argumento) para cada argumento; 'restaurar'
+    (si lo hay) se llama antes de cada lote, fuera del cronómetro, para las
+    funciones que modifican el tablero o la pieza.
+
+    Returns:
+        dict: ops_por_segundo y p50_lote_ns, p99_lote_ns (percentiles del
+              tiempo medio por llamada de cada lote)
+    """
+    reloj = time.perf_counter_ns
+    por_lote = []
+    total_ns = 0
+    for repeticion in range(CALENTAMIENTO + repeticiones):
+        if restaurar is not None:
+            restaurar()
+        inicio = reloj()
+        for argumento in argumentos:
+            funcion(argumento)
+        duracion = reloj() - inicio
+        if repeticion >= CALENTAMIENTO:
+            total_ns += duracion
+            por_lote.append(duracion / len(argumentos))
+    por_lote.sort()
+    return {
+        'ops_por_segundo': round(repeticiones * len(argumentos) / (total_ns / 1e9)),
+        'p50_lote_ns': round(percentil(por_lote, 0.50), 1),
+        'p99_lote_ns': round(percentil(por_lote, 0.99), 1),
+    }
+
+
+def medir_memoria(funcion, argumentos, restaurar=None):
+    """
+    Mide con tracemalloc la memoria de las llamadas.
+
+    Va aparte del cronometraje porque tracemalloc ralentiza mucho las llamadas.
+
+    Returns:
+        dict: bytes_pico (memoria temporal de una llamada) y bytes_retenidos
+              (lo que queda reservado por llamada)
+    """
+    tracemalloc.start()
+    try:
+        if restaurar is not None:
+            restaurar()
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        funcion(argumentos[0])
+        bytes_pico = tracemalloc.get_traced_memory()[1] - antes
+
+        retenidos = 0
+        llamadas = 0
+        while llamadas < LLAMADAS_MEMORIA:
+            if restaurar is not None:
+                restaurar()
+            antes = tracemalloc.get_traced_memory()[0]
+            for argumento in argumentos:
+                funcion(argumento)
+            retenidos += tracemalloc.get_traced_memory()[0] - antes
+            llamadas += len(argumentos)
+    finally:
+        tracemalloc.stop()
+    return {'bytes_pico': bytes_pico, 'bytes_retenidos': round(retenidos / llamadas, 1)}
+
+
+def combinar_ejecuciones(tiempos):
+    """
+    Resume los cronometrajes de varias pasadas de una medida.
+
+    Returns:
+        dict: mediana de cada campo entre las pasadas (p50_lote_ns es el
+              que se compara) y las medianas de cada pasada
+    """
+    medianas = [tiempo['p50_lote_ns'] for tiempo in tiempos]
+    return {
+        'ops_por_segundo': percentil(sorted(tiempo['ops_por_segundo'] for tiempo in tiempos), 0.50),
+        'p50_lote_ns': percentil(sorted(medianas), 0.50),
+        'p99_lote_ns': percentil(sorted(tiempo['p99_lote_ns'] for tiempo in tiempos), 0.50),
+        'p50_lote_ns_ejecuciones': medianas,
+    }
+
+
+def ejecutar(filtro=None, repeticiones=REPETICIONES, ejecuciones=EJECUCIONES):
+    """
+    Ejecuta las medidas cuyo nombre contiene 'filtro' (todas si es None).
+
+    Hace 'ejecuciones' pasadas completas por las medidas (no seguidas por
+    medida, para que una racha lenta de la máquina no caiga entera sobre
+    una sola) y la memoria se mide una vez.
+
+    Returns:
+        dict: Informe con la plataforma y 'resultados' por medida
+    """
+    medidas = {nombre: medida for nombre, medida in crear_medidas().items()
+               if filtro is None or filtro in nombre}
+    tiempos = {nombre: [] for nombre in medidas}
+    for _ in range(ejecuciones):
+        for nombre, (funcion, argumentos, restaurar) in medidas.items():
+            tiempos[nombre].append(cronometrar(funcion, argumentos, restaurar, repeticiones))
+
+    resultados = {}
+    for nombre, (funcion, argumentos, restaurar) in medidas.items():
+        resultados[nombre] = combinar_ejecuciones(tiempos[nombre])
+        resultados[nombre].update(medir_memoria(funcion, argumentos, restaurar))
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticiones': repeticiones,
+        'ejecuciones': ejecuciones,
+        'resultados': resultados,
+    }
+
+
+def comparar(informe, base, tolerancia=TOLERANCIA):
+    """
+    Compara el p50_lote_ns de un informe con el de uno base.
+
+    Se usa la mediana de las medianas de varias pasadas y no
+    ops_por_segundo porque la media se dispara con cualquier interrupción
+    del sistema, y la mediana de una sola pasada también puede moverse
+    más que la tolerancia: las dos darían falsas regresiones.
+
+    Returns:
+        dict: nombre -> {base, actual (p50_lote_ns), cambio (fracción de
+              velocidad: -0.2 = un 20 % más lento), regresion (bool)}
+              para las medidas que están en los dos
+    """
+    comparacion = {}
+    for nombre, actual in informe['resultados'].items():
+        anterior = base['resultados'].get(nombre)
+        if anterior is None:
+            continue
+        cambio = anterior['p50_lote_ns'] / actual['p50_lote_ns'] - 1
+        comparacion[nombre] = {
+            'base': anterior['p50_lote_ns'],
+            'actual': actual['p50_lote_ns'],
+            'cambio': round(cambio, 4),
+            'regresion': cambio < -tolerancia,
+        }
+    return comparacion
+
+# =============================================
+# LÍNEA DE COMANDOS
+# =============================================
+
+def main(argumentos=None):
+    """Ejecuta los benchmarks y escribe el informe JSON; devuelve 1 si hay regresiones"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de las reglas del Tetris")
+    parser.add_argument("--filtro", help="Solo las medidas cuyo nombre contenga este texto")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--ejecuciones", type=int, default=EJECUCIONES,
+                        help="Pasadas completas; se compara la mediana de sus medianas")
+    parser.add_argument("--salida", help="Archivo JSON del informe (por defecto, la salida estándar)")
+    parser.add_argument("--guardar-base", help="Guarda también el informe como base de comparación")
+    parser.add_argument("--comparar", help="Informe base con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Pérdida de velocidad que cuenta como regresión (0.10 = 10 %%)")
+    opciones = parser.parse_args(argumentos)
+
+    informe = ejecutar(opciones.filtro, opciones.repeticiones, opciones.ejecuciones)
+    regresiones = []
+    if opciones.comparar:
+        with open(opciones.comparar, 'r', encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        informe['comparacion'] = comparar(informe, base, opciones.tolerancia)
+        regresiones = [nombre for nombre, datos in informe['comparacion'].items()
+                       if datos['regresion']]
+        informe['regresiones'] = regresiones
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    if opciones.guardar_base:
+        with open(opciones.guardar_base, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + "\n")
+
+    for nombre in regresiones:
+        print(f"Regresión: {nombre} ({informe['comparacion'][nombre]['cambio']:+.1%})",
+              file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Caché en memoria del récord guardado en tetris_record.json.
+
+El archivo se lee una sola vez. Después, obtener() solo consulta la fecha
+de modificación del archivo (os.stat) para saber si otra instancia del
+juego lo cambió, y únicamente en ese caso vuelve a leerlo. Los récords
+nuevos se marcan como pendientes (sucio) y se escriben todos juntos con
+guardar(), que no hace nada si no hay cambios; así varias partidas
+terminadas seguidas producen una sola escritura.
+
+Si dos instancias comparten el archivo, al guardar se combina con lo que
+haya en disco (se queda el mayor), de modo que ninguna pisa el récord de
+la otra.
+"""
+
+import os
+import threading
+
+from persistencia import DatosCorruptos, cargar_json, guardar_json
+
+# =============================================
+# CACHÉ DEL RÉCORD
+# =============================================
+
+class CacheRecord:
+    """
+    Récord en memoria sincronizado con un archivo JSON.
+
+    Uso típico:
+        cache = CacheRecord("tetris_record.json")
+        record = cache.obtener()          # sin leer el archivo si no cambió
+        cache.actualizar(puntuacion)      # solo en memoria
+        cache.guardar()                   # al terminar la partida y al salir
+    """
+
+    def __init__(self, nombre_archivo, clave='record'):
+        """
+        Args:
+            nombre_archivo (str): Archivo JSON del récord
+            clave (str): Clave del récord dentro del JSON
+        """
+        self.nombre_archivo = nombre_archivo
+        self.clave = clave
+        self.valor = 0
+        self.sucio = False
+        self.firma = None
+        self.lecturas = 0
+        self.escrituras = 0
+        # guardar() puede llamarse desde el hilo escritor
+        self.cerrojo = threading.Lock()
+
+    def _firma_archivo(self):
+        """(mtime, tamaño) del archivo, o None si no existe"""
+        try:
+            estado = os.stat(self.nombre_archivo)
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
+
+    def _leer_disco(self):
+        """Lee el récord del archivo y recuerda su firma"""
+        firma = self._firma_archivo()
+        datos = cargar_json(self.nombre_archivo, {})
+        self.firma = firma
+        self.lecturas += 1
+        return datos.get(self.clave, 0) if isinstance(datos, dict) else 0
+
+    def cargar(self):
+        """
+        Lee el archivo (la primera vez o para forzar la recarga).
+
+        Raises:
+            DatosCorruptos: Si el archivo y su copia de seguridad están dañados
+        """
+        with self.cerrojo:
+            en_disco = self._leer_disco()
+            self.valor = max(self.valor, en_disco) if self.sucio else en_disco
+            return self.valor
+
+    def obtener(self):
+        """Devuelve el récord; relee el archivo solo si cambió desde la última vez"""
+        with self.cerrojo:
+            if self._firma_archivo() != self.firma:
+                try:
+                    en_disco = self._leer_disco()
+                except DatosCorruptos:
+                    return self.valor  # Se conserva el valor en memoria
+                self.valor = max(self.valor, en_disco) if self.sucio else en_disco
+            return self.valor
+
+    def actualizar(self, puntuacion):
+        """
+        Anota una puntuación; si supera el récord queda pendiente de guardar.
+
+        Returns:
+            bool: True si es un récord nuevo
+        """
+        with self.cerrojo:
+            if puntuacion <= self.valor:
+                return False
+            self.valor = puntuacion
+            self.sucio = True
+            return True
+
+    def guardar(self):
+        """
+        Escribe el récord si hay cambios pendientes.
+
+        Returns:
+            bool: True cuando el archivo queda al día (aunque no hiciera falta escribir)
+        """
+        with self.cerrojo:
+            if not self.sucio:
+                return True
+            if self._firma_archivo() != self.firma:
+                # Otra instancia escribió mientras tanto: quedarse con el mayor
+                try:
+                    self.valor = max(self.valor, self._leer_disco())
+                except DatosCorruptos:
+                    pass
+            guardar_json(self.nombre_archivo, {self.clave: self.valor})
+            self.firma = self._firma_archivo()
+            self.sucio = False
+            self.escrituras += 1
+            return True
@@ -0,0 +1,205 @@
+"""
+Enumeración de todas las colocaciones alcanzables de una pieza.
+
+Un bot o una pista necesita saber dónde puede acabar la pieza actual, no
+solo moverla paso a paso. enumerar_colocaciones() devuelve cada posición
+de reposo (rotación, x, y) a la que se puede llegar desde la posición de
+la pieza con los movimientos de MotorTetris: izquierda, derecha, rotar
+(siempre hacia la rotación siguiente, sin "wall kicks") y bajar.
+
+La búsqueda es un BFS sobre el grafo de movimientos, pero cada nodo es
+una columna (rotación, x) con todas sus filas a la vez como máscara de
+bits (bit y = la pieza está en la fila y):
+
+- libres[r][x]: filas donde la forma cabe, calculadas con una máscara por
+  columna del tablero (4 desplazamientos y OR por columna de la forma).
+- alcanzables[r][x]: filas ya visitadas (la memoria del BFS). Bajar es
+  rellenar hacia abajo dentro de 'libres' y moverse o rotar es un AND con
+  'libres' de la columna vecina, así que cada columna se revisita solo
+  cuando gana filas nuevas.
+- La pieza reposa en y si y es alcanzable y y + 1 no está libre.
+
+Las rotaciones que dan exactamente las mismas celdas se cuentan una vez:
+el ciclo de rotación usa len(FORMAS_PIEZAS[tipo]) (1 para la O, 2 para
+I, S y Z) y, además, las formas repetidas dentro de una pieza se reducen
+a la primera (FORMAS_EQUIVALENTES), por si una tabla de formas tuviera
+rotaciones redundantes.
+"""
+
+from motor_tetris import ALTO_TABLERO, ANCHO_TABLERO, FORMAS_COMPILADAS
+
+# Filas 0..ALTO_TABLERO - 1 como máscara
+TODAS_LAS_FILAS = (1 << ALTO_TABLERO) - 1
+
+# =============================================
+# TABLAS PRECOMPILADAS
+# =============================================
+
+def compilar_equivalencias(formas_compiladas):
+    """
+    Para cada (tipo, rotación), la primera rotación con las mismas celdas.
+
+    Returns:
+        list: [tipo][rotacion] -> (rotacion_canonica, dx, dy) tal que la
+              forma en (x, y) ocupa lo mismo que la canónica en (x + dx, y + dy)
+    """
+    tabla = []
+    for rotaciones in formas_compiladas:
+        vistas = {}
+        por_rotacion = []
+        for rotacion, forma in enumerate(rotaciones):
+            origen = (forma.min_x, forma.min_y)
+            normalizada = frozenset((dx - origen[0], dy - origen[1]) for dx, dy in forma.celdas)
+            if normalizada not in vistas:
+                vistas[normalizada] = (rotacion, origen)
+            canonica, origen_canonica = vistas[normalizada]
+            por_rotacion.append((canonica, origen[0] - origen_canonica[0],
+                                 origen[1] - origen_canonica[1]))
+        tabla.append(por_rotacion)
+    return tabla
+
+
+# FORMAS_EQUIVALENTES[tipo][rotacion] -> (rotacion_canonica, dx, dy)
+FORMAS_EQUIVALENTES = compilar_equivalencias(FORMAS_COMPILADAS)
+
+# =============================================
+# MÁSCARAS DEL TABLERO
+# =============================================
+
+def mascaras_columnas(tablero):
+    """
+    Ocupación de cada columna como máscara de filas (bit y = fila y ocupada).
+
+    Args:
+        tablero: TableroLista o TableroBits (se usa tablero.filas), o
+                 directamente la matriz de filas
+
+    Returns:
+        list: ANCHO_TABLERO enteros
+    """
+    columnas = [0] * ANCHO_TABLERO
+    bit = 1
+    for fila in getattr(tablero, 'filas', tablero):
+        if any(fila):
+            for columna, valor in enumerate(fila):
+                if valor:
+                    columnas[columna] |= bit
+        bit <<= 1
+    return columnas
+
+
+def filas_libres(columnas, forma, pos_x):
+    """Filas y en las que 'forma' cabe con su matriz en la columna pos_x"""
+    ocupadas = 0
+    for dx, dy in forma.celdas:
+        ocupadas |= columnas[pos_x + dx] >> dy
+    # Sin salirse por el suelo: y + max_y < ALTO_TABLERO
+    return ((1 << (ALTO_TABLERO - forma.max_y)) - 1) & ~ocupadas
+
+
+def tabla_filas_libres(columnas, tipo):
+    """
+    filas_libres() de todas las rotaciones y columnas de una pieza.
+
+    Returns:
+        list: [rotacion] -> {x: filas libres} (sin las x que salen por una pared)
+    """
+    libres = []
+    for forma in FORMAS_COMPILADAS[tipo]:
+        por_x = {}
+        for x in range(-forma.min_x, ANCHO_TABLERO - forma.max_x):
+            por_x[x] = filas_libres(columnas, forma, x)
+        libres.append(por_x)
+    return libres
+
+
+def rellenar_hacia_abajo(alcanzables, libres):
+    """
+    Extiende cada fila alcanzable hacia abajo mientras haya filas libres.
+
+    Relleno por duplicación (Kogge-Stone): 5 pasos cubren 32 filas.
+    """
+    propagar = libres
+    alcanzables |= propagar & (alcanzables << 1)
+    propagar &= propagar << 1
+    alcanzables |= propagar & (alcanzables << 2)
+    propagar &= propagar << 2
+    alcanzables |= propagar & (alcanzables << 4)
+    propagar &= propagar << 4
+    alcanzables |= propagar & (alcanzables << 8)
+    propagar &= propagar << 8
+    alcanzables |= propagar & (alcanzables << 16)
+    return alcanzables
+
+# =============================================
+# ENUMERACIÓN
+# =============================================
+
+def enumerar_colocaciones(tablero, tipo, rotacion=0, pos_x=ANCHO_TABLERO // 2 - 1, pos_y=0,
+                          columnas=None):
+    """
+    Todas las posiciones de reposo alcanzables por una pieza.
+
+    Args:
+        tablero: TableroLista o TableroBits
+        tipo (int): Tipo de pieza (1..7)
+        rotacion, pos_x, pos_y (int): Posición de partida (por defecto, la de aparición)
+        columnas (list): mascaras_columnas(tablero) si ya se calcularon
+                         (para enumerar varias piezas sobre el mismo tablero)
+
+    Returns:
+        list: (rotacion, x, y) de cada colocación, sin repetir las que
+              ocupan las mismas celdas; vacía si la posición de partida
+              no es válida
+    """
+    if columnas is None:
+        columnas = mascaras_columnas(tablero)
+    cantidad_rotaciones = len(FORMAS_COMPILADAS[tipo])
+    libres = tabla_filas_libres(columnas, tipo)
+
+    if pos_y < 0 or not (libres[rotacion].get(pos_x, 0) >> pos_y) & 1:
+        return []
+
+    alcanzables = [dict.fromkeys(por_x, 0) for por_x in libres]
+    alcanzables[rotacion][pos_x] = rellenar_hacia_abajo(1 << pos_y, libres[rotacion][pos_x])
+    pendientes = [(rotacion, pos_x)]
+    while pendientes:
+        r, x = pendientes.pop()
+        actuales = alcanzables[r][x]
+        siguiente_rotacion = (r + 1) % cantidad_rotaciones
+        for vecino_r, vecino_x in ((r, x - 1), (r, x + 1), (siguiente_rotacion, x)):
+            libres_vecino = libres[vecino_r].get(vecino_x, 0)
+            visitadas = alcanzables[vecino_r].get(vecino_x, 0)
+            nuevas = actuales & libres_vecino & ~visitadas
+            if nuevas:
+                alcanzables[vecino_r][vecino_x] = rellenar_hacia_abajo(visitadas | nuevas,
+                                                                       libres_vecino)
+                pendientes.append((vecino_r, vecino_x))
+
+    equivalentes = FORMAS_EQUIVALENTES[tipo]
+    colocaciones = []
+    vistas = set()
+    for r in range(cantidad_rotaciones):
+        canonica, desplazamiento_x, desplazamiento_y = equivalentes[r]
+        for x, filas in alcanzables[r].items():
+            # Reposo: la fila de debajo no está libre
+            reposo = filas & ~(libres[r][x] >> 1)
+            y = 0
+            while reposo:
+                if reposo & 1:
+                    colocacion = (canonica, x + desplazamiento_x, y + desplazamiento_y)
+                    if colocacion not in vistas:
+                        vistas.add(colocacion)
+                        colocaciones.append(colocacion)
+                reposo >>= 1
+                y += 1
+    return colocaciones
+
+
+def colocaciones_pieza_actual(motor):
+    """Colocaciones alcanzables por la pieza actual de un MotorTetris"""
+    if not motor.puede_actuar():
+        return []
+    pieza = motor.pieza_actual
+    return enumerar_colocaciones(motor.tablero, pieza['tipo'], pieza['rotacion'],
+                                 pieza['x'], pieza['y'])
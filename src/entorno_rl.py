@@ -0,0 +1,418 @@
+"""
+Entorno de aprendizaje por refuerzo con las reglas del juego (estilo Gym).
+
+EntornoTetris envuelve MotorTetris, la lógica sin interfaz de main.py:
+
+    entorno = EntornoTetris(modo=MODO_COLOCACIONES)
+    observacion = entorno.reset(semilla=7)
+    while True:
+        accion = agente(observacion, entorno.acciones_validas())
+        observacion, recompensa, terminado, info = entorno.step(accion)
+        if terminado:
+            break
+
+Hay dos tipos de acción:
+
+- MODO_TECLAS: las teclas de manejar_tecla_presionada (ACCION_IZQUIERDA,
+  ..., ACCION_CAIDA_RAPIDA de repeticion.py) más ACCION_NINGUNA. Después de
+  cada acción pasan 'cuadros_por_paso' cuadros de gravedad, como en
+  granja_simulacion.py, así que la velocidad del nivel cuenta.
+- MODO_COLOCACIONES: una acción es (rotación, x) codificada como
+  rotacion * POSICIONES_X + (x - X_MINIMA), la misma codificación que
+  MotorVectorizado.colocaciones_validas(): la pieza gira en la aparición,
+  se desplaza hasta x y cae. Una colocación no alcanzable cae sin girar ni
+  moverse, igual que en MotorVectorizado.
+
+La recompensa es la puntuación ganada en el paso, con las reglas de la
+partida (ReglasJuego). La observación es un array uint8 de
+TAMANO_OBSERVACION reservado una sola vez: las celdas del tablero fijado
+(tipo de pieza, 0 = vacía) fila a fila y después la pieza actual (tipo,
+rotación, x - X_MINIMA, y) y la siguiente. step() devuelve siempre el
+mismo array, actualizado solo en las celdas que cambiaron
+(motor.tomar_cambios(), lo mismo que usa el renderizador); quien quiera
+guardarlo tiene que copiarlo.
+
+EntornoVectorizado da un paso en N entornos a la vez con observaciones
+(N, TAMANO_OBSERVACION). En MODO_COLOCACIONES usa MotorVectorizado (todas
+las partidas en operaciones de array); en MODO_TECLAS, N EntornoTetris
+que escriben en filas del mismo array.
+
+Necesita NumPy.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy no instalado: el módulo se importa pero no se puede usar
+    np = None
+
+from granja_simulacion import CUADROS_POR_ACCION, MAXIMO_PIEZAS
+from generador_piezas import MODO_UNIFORME
+from motor_tetris import (
+    ALTO_TABLERO, ANCHO_TABLERO, FORMAS_PIEZAS, REGLAS_CLASICAS, MotorTetris, TableroLista
+)
+from motor_vectorizado import POSICIONES_X, ROTACIONES, X_APARICION, X_MINIMA, MotorVectorizado
+from repeticion import (
+    ACCION_BAJAR, ACCION_CAIDA_RAPIDA, ACCION_DERECHA, ACCION_IZQUIERDA, ACCION_ROTAR,
+    METODOS_ACCIONES
+)
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+MODO_TECLAS = "teclas"
+MODO_COLOCACIONES = "colocaciones"
+
+# Acción de no pulsar nada (solo avanza la gravedad)
+ACCION_NINGUNA = 0
+
+# Acciones de MODO_TECLAS: ACCION_NINGUNA y las de repeticion.py
+ACCIONES_TECLAS = (ACCION_NINGUNA, ACCION_IZQUIERDA, ACCION_DERECHA, ACCION_ROTAR,
+                   ACCION_BAJAR, ACCION_CAIDA_RAPIDA)
+
+# Número de acciones de cada modo
+CANTIDAD_ACCIONES = {
+    MODO_TECLAS: len(ACCIONES_TECLAS),
+    MODO_COLOCACIONES: ROTACIONES * POSICIONES_X,
+}
+
+# Disposición de la observación: tablero y después los datos de las piezas
+CELDAS_TABLERO = ALTO_TABLERO * ANCHO_TABLERO
+OBS_TIPO = CELDAS_TABLERO
+OBS_ROTACION = CELDAS_TABLERO + 1
+OBS_X = CELDAS_TABLERO + 2          # x - X_MINIMA, para que no sea negativa
+OBS_Y = CELDAS_TABLERO + 3
+OBS_SIGUIENTE = CELDAS_TABLERO + 4
+TAMANO_OBSERVACION = CELDAS_TABLERO + 5
+
+
+def decodificar_colocacion(accion):
+    """Acción de MODO_COLOCACIONES -> (rotación, x)"""
+    return accion // POSICIONES_X, accion % POSICIONES_X + X_MINIMA
+
+
+def codificar_colocacion(rotacion, x):
+    """(rotación, x) -> acción de MODO_COLOCACIONES"""
+    return rotacion * POSICIONES_X + (x - X_MINIMA)
+
+# =============================================
+# ENTORNO DE UNA PARTIDA
+# =============================================
+
+class EntornoTetris:
+    """
+    Una partida de MotorTetris con interfaz reset() / step().
+
+    Atributos:
+        motor (MotorTetris): Partida actual
+        observacion (array uint8): Buffer que devuelven reset() y step()
+        info (dict): Estadísticas de la partida; step() devuelve siempre
+                     este mismo diccionario actualizado
+    """
+
+    def __init__(self, modo=MODO_TECLAS, reglas=REGLAS_CLASICAS, clase_tablero=TableroLista,
+                 modo_generador=MODO_UNIFORME, cuadros_por_paso=CUADROS_POR_ACCION,
+                 maximo_piezas=MAXIMO_PIEZAS, observacion=None):
+        """
+        Args:
+            modo (str): MODO_TECLAS o MODO_COLOCACIONES
+            reglas (ReglasJuego): Reglas de las partidas
+            clase_tablero: TableroLista o TableroBits
+            modo_generador (str): MODO_UNIFORME o MODO_BOLSA
+            cuadros_por_paso (int): Cuadros de gravedad tras cada acción (MODO_TECLAS)
+            maximo_piezas (int): Piezas tras las que la partida se corta
+                                 (info['truncado']); None = sin tope
+            observacion (array): Buffer de TAMANO_OBSERVACION en el que
+                                 escribir (por defecto se reserva uno)
+        """
+        if np is None:
+            raise ImportError("EntornoTetris necesita NumPy (pip install numpy)")
+        if modo not in CANTIDAD_ACCIONES:
+            raise ValueError(f"Modo de acciones desconocido: {modo}")
+
+        self.modo = modo
+        self.cantidad_acciones = CANTIDAD_ACCIONES[modo]
+        self.reglas = reglas
+        self.clase_tablero = clase_tablero
+        self.modo_generador = modo_generador
+        self.cuadros_por_paso = cuadros_por_paso
+        self.maximo_piezas = maximo_piezas
+
+        if observacion is None:
+            observacion = np.zeros(TAMANO_OBSERVACION, dtype=np.uint8)
+        self.observacion = observacion
+        self.celdas = observacion[:CELDAS_TABLERO].reshape(ALTO_TABLERO, ANCHO_TABLERO)
+        self.validas = np.ones(self.cantidad_acciones, dtype=bool)
+
+        self.motor = None
+        self.piezas = 0
+        self.info = {}
+
+    def reset(self, semilla=None):
+        """
+        Empieza una partida nueva.
+
+        Args:
+            semilla: Semilla del generador de piezas (None = no reproducible)
+
+        Returns:
+            array: La observación inicial
+        """
+        self.motor = MotorTetris(semilla=semilla, clase_tablero=self.clase_tablero,
+                                 modo_generador=self.modo_generador, reglas=self.reglas)
+        self.piezas = 0
+        self.info.clear()
+        self._actualizar_info(0, False)
+        self._actualizar_observacion()
+        return self.observacion
+
+    def step(self, accion):
+        """
+        Ejecuta una acción.
+
+        Returns:
+            tuple: (observación, recompensa, terminado, info)
+        """
+        motor = self.motor
+        if motor is None:
+            raise RuntimeError("Hay que llamar a reset() antes de step()")
+
+        puntuacion_anterior = motor.puntuacion
+        lineas_anteriores = motor.lineas_completadas
+        if self.modo == MODO_COLOCACIONES:
+            self._colocar(*decodificar_colocacion(int(accion)))
+            self.piezas += 1
+        else:
+            accion = ACCIONES_TECLAS[accion]
+            pieza = motor.pieza_actual
+            if accion != ACCION_NINGUNA and motor.puede_actuar():
+                getattr(motor, METODOS_ACCIONES[accion])()
+            motor.avanzar_cuadros(self.cuadros_por_paso)
+            if motor.pieza_actual is not pieza:
+                self.piezas += 1
+
+        truncado = (self.maximo_piezas is not None and self.piezas >= self.maximo_piezas
+                    and not motor.juego_terminado)
+        self._actualizar_info(motor.lineas_completadas - lineas_anteriores, truncado)
+        self._actualizar_observacion()
+        return (self.observacion, motor.puntuacion - puntuacion_anterior,
+                motor.juego_terminado or truncado, self.info)
+
+    def acciones_validas(self):
+        """
+        Acciones con efecto en el estado actual.
+
+        En MODO_TECLAS todas; en MODO_COLOCACIONES las colocaciones
+        alcanzables desde la aparición, como MotorVectorizado.colocaciones_validas()
+        (la rotación cuenta módulo las rotaciones de la pieza).
+
+        Returns:
+            array bool: Buffer de longitud cantidad_acciones (se reutiliza)
+        """
+        if self.modo == MODO_TECLAS:
+            return self.validas
+        self.validas[:] = False
+        if self.motor.puede_actuar():
+            rotaciones = len(FORMAS_PIEZAS[self.motor.pieza_actual['tipo']])
+            for rotacion in range(ROTACIONES):
+                for x in range(X_MINIMA, ANCHO_TABLERO):
+                    if self._alcanzable(rotacion % rotaciones, x):
+                        self.validas[codificar_colocacion(rotacion, x)] = True
+        return self.validas
+
+    # -----------------------------------------
+    # Colocaciones
+    # -----------------------------------------
+
+    def _alcanzable(self, rotacion, x):
+        """Si la pieza puede girar en la aparición y desplazarse hasta x"""
+        motor = self.motor
+        pieza = motor.pieza_actual
+        tipo, x_inicio, y = pieza['tipo'], pieza['x'], pieza['y']
+        for paso in range(1, rotacion + 1):
+            if motor.verificar_colision(tipo, paso, x_inicio, y):
+                return False
+        direccion = 1 if x >= x_inicio else -1
+        for columna in range(x_inicio, x + direccion, direccion):
+            if motor.verificar_colision(tipo, rotacion, columna, y):
+                return False
+        return True
+
+    def _colocar(self, rotacion, x):
+        """Gira, desplaza y deja caer la pieza actual (o solo la deja caer)"""
+        motor = self.motor
+        if not motor.puede_actuar():
+            return
+        rotacion %= len(FORMAS_PIEZAS[motor.pieza_actual['tipo']])
+        if self._alcanzable(rotacion, x):
+            motor.pieza_actual['rotacion'] = rotacion
+            motor.pieza_actual['x'] = x
+        motor.caida_rapida()
+
+    # -----------------------------------------
+    # Observación
+    # -----------------------------------------
+
+    def _actualizar_observacion(self):
+        """Copia al buffer solo las celdas y filas que cambiaron"""
+        motor = self.motor
+        cambios = motor.tomar_cambios()
+        filas = motor.tablero.filas
+        if cambios.todo:
+            self.celdas[:] = filas
+        else:
+            for fila in cambios.filas:
+                self.celdas[fila] = filas[fila]
+            for columna, fila in cambios.celdas:
+                self.celdas[fila, columna] = filas[fila][columna]
+
+        pieza = motor.pieza_actual
+        observacion = self.observacion
+        observacion[OBS_TIPO] = pieza['tipo']
+        observacion[OBS_ROTACION] = pieza['rotacion']
+        observacion[OBS_X] = pieza['x'] - X_MINIMA
+        observacion[OBS_Y] = pieza['y']
+        observacion[OBS_SIGUIENTE] = motor.siguiente_pieza['tipo']
+
+    def _actualizar_info(self, lineas, truncado):
+        """Rellena self.info con las estadísticas de la partida"""
+        motor = self.motor
+        info = self.info
+        info['puntuacion'] = motor.puntuacion
+        info['lineas'] = motor.lineas_completadas
+        info['nivel'] = motor.nivel
+        info['piezas'] = self.piezas
+        info['cuadros'] = motor.cuadro
+        info['lineas_paso'] = lineas
+        info['truncado'] = truncado
+
+# =============================================
+# ENTORNOS EN LOTE
+# =============================================
+
+class EntornoVectorizado:
+    """
+    N entornos que avanzan a la vez con un array de acciones.
+
+    Las partidas terminadas no se reinician solas: siguen terminadas (con
+    recompensa 0) hasta el siguiente reset(), que reinicia todo el lote.
+
+    Atributos:
+        observaciones (array uint8): (N, TAMANO_OBSERVACION), se reutiliza
+        recompensas (array int64), terminados (array bool): (N,), se reutilizan
+    """
+
+    def __init__(self, cantidad, modo=MODO_COLOCACIONES, reglas=REGLAS_CLASICAS,
+                 modo_generador=MODO_UNIFORME, cuadros_por_paso=CUADROS_POR_ACCION,
+                 maximo_piezas=MAXIMO_PIEZAS):
+        """
+        Args:
+            cantidad (int): Número de entornos N
+            modo (str): MODO_TECLAS o MODO_COLOCACIONES
+            (el resto, como EntornoTetris)
+        """
+        if np is None:
+            raise ImportError("EntornoVectorizado necesita NumPy (pip install numpy)")
+        if modo not in CANTIDAD_ACCIONES:
+            raise ValueError(f"Modo de acciones desconocido: {modo}")
+
+        self.cantidad = cantidad
+        self.modo = modo
+        self.cantidad_acciones = CANTIDAD_ACCIONES[modo]
+        self.maximo_piezas = maximo_piezas
+        self.observaciones = np.zeros((cantidad, TAMANO_OBSERVACION), dtype=np.uint8)
+        self.recompensas = np.zeros(cantidad, dtype=np.int64)
+        self.terminados = np.zeros(cantidad, dtype=bool)
+        self.truncados = np.zeros(cantidad, dtype=bool)
+
+        if modo == MODO_COLOCACIONES:
+            self.entornos = None
+            self.motor = MotorVectorizado(cantidad, modo_generador=modo_generador, reglas=reglas)
+            self.celdas = self.observaciones[:, :CELDAS_TABLERO].reshape(
+                cantidad, ALTO_TABLERO, ANCHO_TABLERO)
+            self.puntuacion_anterior = np.zeros(cantidad, dtype=np.int64)
+        else:
+            self.motor = None
+            self.entornos = [
+                EntornoTetris(modo, reglas, modo_generador=modo_generador,
+                              cuadros_por_paso=cuadros_por_paso, maximo_piezas=maximo_piezas,
+                              observacion=self.observaciones[indice])
+                for indice in range(cantidad)
+            ]
+
+    def reset(self, semilla=0):
+        """
+        Reinicia todas las partidas; la partida i usa la semilla semilla + i.
+
+        Returns:
+            array: Observaciones (N, TAMANO_OBSERVACION)
+        """
+        self.terminados[:] = False
+        self.truncados[:] = False
+        if self.entornos is not None:
+            for indice, entorno in enumerate(self.entornos):
+                entorno.reset(semilla + indice)
+            return self.observaciones
+
+        self.motor.reiniciar([semilla + indice for indice in range(self.cantidad)])
+        self.puntuacion_anterior[:] = 0
+        self._actualizar_observaciones()
+        return self.observaciones
+
+    def step(self, acciones):
+        """
+        Un paso en cada entorno que no haya terminado.
+
+        Args:
+            acciones (array): Acción de cada entorno (N,)
+
+        Returns:
+            tuple: (observaciones, recompensas, terminados, info), con
+                   info = {'truncados': array bool de las partidas cortadas
+                   por maximo_piezas}
+        """
+        if self.entornos is not None:
+            for indice, entorno in enumerate(self.entornos):
+                if self.terminados[indice]:
+                    self.recompensas[indice] = 0
+                    continue
+                _, recompensa, terminado, info = entorno.step(acciones[indice])
+                self.recompensas[indice] = recompensa
+                self.terminados[indice] = terminado
+                self.truncados[indice] = info['truncado']
+            return self.observaciones, self.recompensas, self.terminados, {'truncados': self.truncados}
+
+        motor = self.motor
+        acciones = np.asarray(acciones, dtype=np.int64)
+        motor.colocar(acciones // POSICIONES_X, acciones % POSICIONES_X + X_MINIMA)
+        np.subtract(motor.puntuacion, self.puntuacion_anterior, out=self.recompensas)
+        self.puntuacion_anterior[:] = motor.puntuacion
+        if self.maximo_piezas is not None:
+            np.greater_equal(motor.piezas, self.maximo_piezas, out=self.truncados)
+            self.truncados &= ~motor.terminado
+            # MotorVectorizado no tiene tope de piezas: se da por terminada
+            motor.terminado |= self.truncados
+        np.copyto(self.terminados, motor.terminado)
+        self._actualizar_observaciones()
+        return self.observaciones, self.recompensas, self.terminados, {'truncados': self.truncados}
+
+    def acciones_validas(self):
+        """
+        Máscara (N, cantidad_acciones) de acciones con efecto.
+
+        En MODO_COLOCACIONES sale de MotorVectorizado.colocaciones_validas().
+        """
+        if self.entornos is not None:
+            return np.array([entorno.acciones_validas() for entorno in self.entornos])
+        return self.motor.colocaciones_validas().reshape(self.cantidad, self.cantidad_acciones)
+
+    def _actualizar_observaciones(self):
+        """Copia los tableros y las piezas de MotorVectorizado al buffer"""
+        motor = self.motor
+        np.copyto(self.celdas, motor.tableros)
+        observaciones = self.observaciones
+        observaciones[:, OBS_TIPO] = motor.pieza_actual
+        observaciones[:, OBS_ROTACION] = 0
+        observaciones[:, OBS_X] = X_APARICION - X_MINIMA
+        observaciones[:, OBS_Y] = 0
+        observaciones[:, OBS_SIGUIENTE] = motor.siguiente_pieza
@@ -0,0 +1,112 @@
+"""
+Hilo escritor para que guardar datos nunca bloquee la interfaz.
+
+Al terminar una partida se guardan el historial, la repetición y el
+récord. Si todo eso se hace dentro del tick de Tk, en un disco lento la
+ventana se congela justo en el game over. EscritorEnSegundoPlano ejecuta
+las escrituras en un hilo propio, en el orden en que se encolaron.
+
+Tk no se puede usar desde otros hilos, así que el hilo escritor no llama a
+la interfaz: deja el resultado de cada tarea en una cola y la interfaz la
+revisa periódicamente con after() (procesar_completadas), donde se
+ejecutan los avisos de cada tarea.
+"""
+
+import queue
+import threading
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Cada cuánto revisa la interfaz las tareas terminadas (ms)
+INTERVALO_SONDEO_MS = 100
+
+# Marca que pide al hilo que termine
+_FIN = object()
+
+# =============================================
+# ESCRITOR
+# =============================================
+
+class EscritorEnSegundoPlano:
+    """
+    Cola de tareas de escritura atendida por un único hilo.
+
+    Uso típico:
+        escritor = EscritorEnSegundoPlano()
+        escritor.encolar(historial.agregar, partida, al_terminar=avisar)
+        ...
+        escritor.procesar_completadas()   # desde after(), en el hilo de Tk
+        escritor.cerrar()                 # al cerrar la ventana
+    """
+
+    def __init__(self):
+        self.tareas = queue.Queue()
+        self.completadas = queue.Queue()
+        self.hilo = threading.Thread(target=self._trabajar, name="EscritorEnSegundoPlano",
+                                     daemon=True)
+        self.hilo.start()
+
+    def encolar(self, funcion, *argumentos, al_terminar=None):
+        """
+        Programa 'funcion(*argumentos)' en el hilo escritor.
+
+        Args:
+            funcion (callable): Tarea de escritura (no debe tocar Tk)
+            *argumentos: Argumentos de la tarea (copias, no estado que cambie)
+            al_terminar (callable): Se llama en el hilo de la interfaz con
+                                    (resultado, error) al procesar_completadas()
+        """
+        self.tareas.put((funcion, argumentos, al_terminar))
+
+    def _trabajar(self):
+        """Bucle del hilo: ejecuta las tareas en orden"""
+        while True:
+            tarea = self.tareas.get()
+            if tarea is _FIN:
+                self.tareas.task_done()
+                return
+            funcion, argumentos, al_terminar = tarea
+            resultado = error = None
+            try:
+                resultado = funcion(*argumentos)
+            except Exception as e:  # El hilo debe seguir atendiendo la cola
+                error = e
+            if al_terminar is not None:
+                self.completadas.put((al_terminar, resultado, error))
+            elif error is not None:
+                print(f"Error en escritura en segundo plano: {error}")
+            self.tareas.task_done()
+
+    def pendientes(self):
+        """Número aproximado de tareas que aún no se han ejecutado"""
+        return self.tareas.qsize()
+
+    def procesar_completadas(self):
+        """
+        Ejecuta los avisos de las tareas terminadas (llamar desde el hilo de Tk).
+
+        Returns:
+            int: Número de avisos ejecutados
+        """
+        procesadas = 0
+        while True:
+            try:
+                al_terminar, resultado, error = self.completadas.get_nowait()
+            except queue.Empty:
+                return procesadas
+            al_terminar(resultado, error)
+            procesadas += 1
+
+    def vaciar(self):
+        """Espera a que se ejecuten todas las tareas encoladas"""
+        if self.hilo.is_alive():
+            self.tareas.join()
+
+    def cerrar(self):
+        """Termina las tareas pendientes, detiene el hilo y procesa los avisos"""
+        if self.hilo.is_alive():
+            self.tareas.put(_FIN)
+            self.hilo.join()
+        self.procesar_completadas()
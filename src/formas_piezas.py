@@ -0,0 +1,88 @@
+"""
+Tablas precompiladas de las formas de las piezas.
+
+Las formas se definen como matrices (FORMAS_PIEZAS en motor_tetris.py,
+PIECE_SHAPES en la versión con velocidad), pero casi todas sus celdas están
+vacías. Este módulo convierte cada (tipo, rotación) una sola vez, al
+importar, en una FormaCompilada con las 4 celdas ocupadas y sus medidas,
+para que las colisiones, el fijado y el dibujo recorran solo esas celdas.
+"""
+
+from collections import namedtuple
+
+# =============================================
+# FORMA COMPILADA
+# =============================================
+
+FormaCompilada = namedtuple("FormaCompilada", [
+    "celdas",       # Tupla de (dx, dy) ocupados, relativos a la matriz
+    "min_x",        # Columna ocupada más a la izquierda
+    "max_x",        # Columna ocupada más a la derecha
+    "min_y",        # Fila ocupada más alta
+    "max_y",        # Fila ocupada más baja
+    "ancho",        # max_x - min_x + 1
+    "alto",         # max_y - min_y + 1
+    "lado",         # Tamaño de la matriz original (2, 3 o 4)
+    "aparicion_x",  # x de la matriz que centra la pieza en el tablero
+    "aparicion_y",  # y de la matriz que deja la pieza pegada al techo
+    "perfil_inferior",  # Tupla de (dx, dy más bajo ocupado en esa columna)
+])
+
+
+def compilar_forma(forma, ancho_tablero):
+    """
+    Compila una matriz de forma.
+
+    Args:
+        forma (list): Matriz de la forma (0 = vacío)
+        ancho_tablero (int): Ancho del tablero, para calcular la aparición
+
+    Returns:
+        FormaCompilada: Celdas ocupadas y medidas de la forma
+    """
+    celdas = tuple(
+        (dx, dy)
+        for dy, fila in enumerate(forma)
+        for dx, valor_celda in enumerate(fila)
+        if valor_celda != 0
+    )
+    min_x = min(dx for dx, _ in celdas)
+    max_x = max(dx for dx, _ in celdas)
+    min_y = min(dy for _, dy in celdas)
+    max_y = max(dy for _, dy in celdas)
+    ancho = max_x - min_x + 1
+
+    fondo_columna = {}
+    for dx, dy in celdas:
+        fondo_columna[dx] = max(dy, fondo_columna.get(dx, dy))
+
+    return FormaCompilada(
+        celdas=celdas,
+        min_x=min_x,
+        max_x=max_x,
+        min_y=min_y,
+        max_y=max_y,
+        ancho=ancho,
+        alto=max_y - min_y + 1,
+        lado=len(forma),
+        aparicion_x=(ancho_tablero - ancho) // 2 - min_x,
+        aparicion_y=-min_y,
+        perfil_inferior=tuple(sorted(fondo_columna.items())),
+    )
+
+
+def compilar_formas(formas, ancho_tablero):
+    """
+    Compila una tabla completa de formas.
+
+    Args:
+        formas (list): Tabla [tipo][rotacion] -> matriz (el índice 0 vacío)
+        ancho_tablero (int): Ancho del tablero
+
+    Returns:
+        list: Tabla [tipo][rotacion] -> FormaCompilada
+    """
+    return [
+        [compilar_forma(forma, ancho_tablero) for forma in rotaciones]
+        for rotaciones in formas
+    ]
@@ -0,0 +1,230 @@
+"""
+Generador determinista de piezas de Tetris.
+
+Cada partida tiene su propio GeneradorPiezas con una semilla explícita, en
+lugar de usar el random global del proceso: la misma semilla produce
+siempre la misma secuencia de piezas, y otras partidas (u otro código del
+proceso) no alteran la secuencia.
+
+Modos:
+- MODO_UNIFORME: cada pieza es independiente (como random.randint(1, 7));
+  con la misma semilla da la misma secuencia que random.seed + randint.
+- MODO_BOLSA: "7-bag", cada bloque de 7 piezas contiene los 7 tipos en
+  orden aleatorio.
+
+generar_secuencia() usa NumPy si está instalado para sortear las piezas
+en bloque (ver _sortear_en_bloque); la secuencia es la misma que sin él.
+"""
+
+import random
+from collections import deque
+from itertools import permutations
+
+try:
+    import numpy as np
+except ImportError:  # NumPy no instalado: generar_secuencia usa el bucle normal
+    np = None
+
+# =============================================
+# CONFIGURACIÓN DEL GENERADOR
+# =============================================
+
+MODO_UNIFORME = "uniforme"
+MODO_BOLSA = "bolsa"
+MODOS = (MODO_UNIFORME, MODO_BOLSA)
+
+# Tipos de pieza: 1..CANTIDAD_TIPOS (igual que FORMAS_PIEZAS)
+CANTIDAD_TIPOS = 7
+
+# Todas las bolsas posibles (7! = 5040): mezclar una bolsa es elegir una
+# sola de ellas con un único número aleatorio
+BOLSAS_POSIBLES = list(permutations(range(1, CANTIDAD_TIPOS + 1)))
+BITS_BOLSA = len(BOLSAS_POSIBLES).bit_length()
+
+# Piezas a partir de las cuales generar_secuencia sortea en bloque con NumPy
+MINIMO_EN_BLOQUE = 64
+
+# Bits de cada salida del Mersenne Twister de random.Random
+BITS_PALABRA = 32
+
+TABLA_BOLSAS = np.array(BOLSAS_POSIBLES, dtype=np.uint8) if np is not None else None
+
+# =============================================
+# GENERADOR
+# =============================================
+
+class GeneradorPiezas:
+    """
+    Secuencia reproducible de tipos de pieza con cola de vista previa.
+
+    Uso típico:
+        generador = GeneradorPiezas(semilla=1234, modo=MODO_BOLSA, vista_previa=3)
+        tipo = generador.siguiente_tipo()
+        proximas = generador.ver(3)        # sin consumirlas
+        lote = generador.generar_secuencia(1000000)
+    """
+
+    def __init__(self, semilla=None, modo=MODO_UNIFORME, vista_previa=1):
+        """
+        Args:
+            semilla: Semilla del generador (None = aleatoria del sistema)
+            modo (str): MODO_UNIFORME o MODO_BOLSA
+            vista_previa (int): Piezas que se mantienen calculadas por adelantado
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo de generador desconocido: {modo}")
+        self.modo = modo
+        self.vista_previa = vista_previa
+        self.reiniciar(semilla)
+
+    def reiniciar(self, semilla=None):
+        """Vuelve a empezar la secuencia con otra semilla"""
+        self.semilla = semilla
+        self.azar = random.Random(semilla)
+        self.cola = deque()
+        self.bolsa = []
+        self.piezas_generadas = 0
+        self._llenar_cola(self.vista_previa)
+
+    # -----------------------------------------
+    # Generación
+    # -----------------------------------------
+
+    def _sortear(self):
+        """Saca el siguiente tipo de la fuente aleatoria (sin pasar por la cola)"""
+        if self.modo == MODO_UNIFORME:
+            return self.azar.randint(1, CANTIDAD_TIPOS)
+
+        if not self.bolsa:
+            bolsa = BOLSAS_POSIBLES[self.azar.randrange(len(BOLSAS_POSIBLES))]
+            self.bolsa = list(reversed(bolsa))  # Se saca del final
+        return self.bolsa.pop()
+
+    def _llenar_cola(self, cantidad):
+        """Asegura que la cola de vista previa tenga al menos 'cantidad' piezas"""
+        while len(self.cola) < cantidad:
+            self.cola.append(self._sortear())
+
+    def siguiente_tipo(self):
+        """Consume y devuelve el siguiente tipo de pieza (1..7)"""
+        self._llenar_cola(max(1, self.vista_previa))
+        self.piezas_generadas += 1
+        tipo = self.cola.popleft()
+        self._llenar_cola(self.vista_previa)
+        return tipo
+
+    def ver(self, cantidad=None):
+        """
+        Devuelve los próximos tipos sin consumirlos.
+
+        Args:
+            cantidad (int): Piezas a mirar (por defecto, la vista previa)
+
+        Returns:
+            list: Próximos tipos en orden
+        """
+        if cantidad is None:
+            cantidad = self.vista_previa
+        self._llenar_cola(cantidad)
+        return [self.cola[i] for i in range(cantidad)]
+
+    def generar_secuencia(self, cantidad):
+        """
+        Genera y consume de golpe 'cantidad' piezas.
+
+        Es equivalente a llamar 'cantidad' veces a siguiente_tipo(), pero
+        mucho más rápido, y devuelve un bytearray (un byte por pieza) para
+        que millones de piezas ocupen poca memoria.
+
+        Args:
+            cantidad (int): Número de piezas
+
+        Returns:
+            bytearray: Tipos de pieza (1..7)
+        """
+        secuencia = bytearray()
+
+        # Primero las que ya estaban en la cola de vista previa
+        while self.cola and len(secuencia) < cantidad:
+            secuencia.append(self.cola.popleft())
+        faltan = cantidad - len(secuencia)
+
+        if np is not None and faltan >= MINIMO_EN_BLOQUE:
+            if self.modo == MODO_BOLSA:
+                # Lo que quede de la bolsa actual va antes que las bolsas nuevas
+                while self.bolsa and faltan > 0:
+                    secuencia.append(self.bolsa.pop())
+                    faltan -= 1
+            secuencia += self._sortear_en_bloque(faltan)
+        elif self.modo == MODO_UNIFORME:
+            # Mismo algoritmo que randint(1, 7): 3 bits con rechazo del 7
+            obtener_bits = self.azar.getrandbits
+            agregar = secuencia.append
+            for _ in range(faltan):
+                valor = obtener_bits(3)
+                while valor >= CANTIDAD_TIPOS:
+                    valor = obtener_bits(3)
+                agregar(valor + 1)
+        else:
+            # Lo que quede de la bolsa actual y luego bolsas completas
+            while self.bolsa and faltan > 0:
+                secuencia.append(self.bolsa.pop())
+                faltan -= 1
+            # Mismo algoritmo que randrange(5040), con rechazo
+            obtener_bits = self.azar.getrandbits
+            total_bolsas = len(BOLSAS_POSIBLES)
+            while faltan > 0:
+                indice = obtener_bits(BITS_BOLSA)
+                while indice >= total_bolsas:
+                    indice = obtener_bits(BITS_BOLSA)
+                bolsa = BOLSAS_POSIBLES[indice]
+                secuencia.extend(bolsa[:faltan])
+                if faltan < CANTIDAD_TIPOS:
+                    # Guardar el resto de la bolsa para las siguientes piezas
+                    self.bolsa = list(reversed(bolsa[faltan:]))
+                faltan -= CANTIDAD_TIPOS
+
+        self.piezas_generadas += cantidad
+        self._llenar_cola(self.vista_previa)
+        return secuencia
+
+    def _sortear_en_bloque(self, cantidad):
+        """
+        Sortea 'cantidad' piezas de golpe con NumPy.
+
+        getrandbits(k) con k <= 32 gasta una salida de 32 bits del Mersenne
+        Twister y se queda con sus k bits altos, y getrandbits(32 * n)
+        devuelve n salidas seguidas (la primera en los bits bajos). Así se
+        piden todas las salidas en una llamada y el rechazo se hace con
+        arrays: sale la misma secuencia que con randint(1, 7) o
+        randrange(5040). Como no se sabe cuántas se rechazarán, se pide
+        algo de más; las piezas sobrantes se dejan en la cola en orden.
+
+        Returns:
+            bytes: Tipos de pieza (1..7)
+        """
+        if self.modo == MODO_UNIFORME:
+            bits, limite, piezas_por_valor = 3, CANTIDAD_TIPOS, 1
+        else:
+            bits, limite, piezas_por_valor = BITS_BOLSA, len(BOLSAS_POSIBLES), CANTIDAD_TIPOS
+        proporcion = (1 << bits) / limite  # Salidas por valor aceptado
+
+        bloques = []
+        obtenidas = 0
+        while obtenidas < cantidad:
+            valores_necesarios = -(-(cantidad - obtenidas) // piezas_por_valor)
+            palabras = int(valores_necesarios * proporcion * 1.02) + 16
+            salida = self.azar.getrandbits(BITS_PALABRA * palabras)
+            valores = np.frombuffer(salida.to_bytes(4 * palabras, 'little'), dtype='<u4')
+            valores = valores >> (BITS_PALABRA - bits)
+            valores = valores[valores < limite]
+            if self.modo == MODO_UNIFORME:
+                piezas = (valores + 1).astype(np.uint8)
+            else:
+                piezas = TABLA_BOLSAS[valores].reshape(-1)
+            bloques.append(piezas)
+            obtenidas += len(piezas)
+
+        piezas = np.concatenate(bloques)
+        self.cola.extend(piezas[cantidad:].tolist())
+        return piezas[:cantidad].tobytes()
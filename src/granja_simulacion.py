@@ -0,0 +1,457 @@
+"""
+Granja de simulación: muchas partidas sin interfaz repartidas entre núcleos.
+
+Sirve para medir cómo cambia la distribución de puntuaciones al tocar las
+reglas (líneas por nivel, velocidades, tabla de puntos) jugando siempre con
+la misma política fija. Cada partida usa MotorTetris con las reglas de
+main.py (ReglasJuego) y la gravedad de paso fijo: la política elige una
+colocación y la ejecuta pulsando teclas, y entre pulsación y pulsación
+pasan CUADROS_POR_ACCION cuadros de gravedad, así que la velocidad del
+nivel influye igual que con un jugador.
+
+Las semillas se reparten entre procesos (uno por núcleo). Cada proceso
+devuelve sus partidas por una tubería como registros binarios de tamaño
+fijo (REGISTRO_PARTIDA, con struct), agrupados en mensajes, en lugar de
+diccionarios serializados con pickle; el proceso principal los va sumando
+a histogramas a medida que llegan, sin guardar las partidas.
+
+Con --guardar y --record el resumen y el mejor resultado se van guardando
+mientras llegan los mensajes. Cada mensaje trae muchas partidas terminadas
+a la vez y se escribe con un solo LoteEscrituras (persistencia.py), no con
+una escritura y un fsync por partida.
+
+    python granja_simulacion.py --partidas 10000 --lineas-por-nivel 10
+    python granja_simulacion.py --partidas 10000 --guardar resumen.json --record tetris_record.json
+"""
+
+import argparse
+import multiprocessing
+import os
+import struct
+from multiprocessing.connection import wait
+
+from generador_piezas import MODO_BOLSA, MODO_UNIFORME
+from jugador_automatico import PESOS, EstadoTablero
+from motor_tetris import ANCHO_TABLERO, FORMAS_COMPILADAS, REGLAS_CLASICAS, MotorTetris
+from persistencia import DatosCorruptos, LoteEscrituras, cargar_json
+from tablero_bits import TableroBits
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Cuadros de gravedad entre dos pulsaciones de la política (10 por segundo)
+CUADROS_POR_ACCION = 6
+
+# Tope de piezas por partida, para que una política buena no juegue siempre
+MAXIMO_PIEZAS = 2000
+
+# Partidas que cada proceso agrupa en un mensaje de la tubería
+PARTIDAS_POR_MENSAJE = 256
+
+# Protocolo de la tubería: un registro por partida (little endian)
+#   semilla (i64: MotorTetris y --semilla admiten negativas),
+#   puntuación, líneas, nivel, piezas, cuadros (u32)
+# Un mensaje vacío indica que el proceso terminó su parte.
+REGISTRO_PARTIDA = struct.Struct("<q5I")
+
+# Ancho de los intervalos de cada histograma: lo bastante finos para
+# comparar reglas (los percentiles se interpolan dentro del intervalo)
+INTERVALOS_HISTOGRAMA = {
+    'puntuacion': 100,
+    'lineas': 1,
+    'nivel': 1,
+    'piezas': 10,
+    'cuadros': 600,  # Diez segundos a 60 cuadros por segundo
+}
+
+# =============================================
+# POLÍTICA FIJA
+# =============================================
+
+def politica_codiciosa(motor):
+    """
+    Elige la mejor colocación de la pieza actual mirando solo esa pieza.
+
+    Prueba cada rotación y cada x en la fila actual de la pieza, la deja
+    caer en vertical (no busca huecos laterales) y valora el tablero con
+    la misma heurística que JugadorAutomatico (EstadoTablero.evaluar y
+    jugador_automatico.PESOS).
+
+    Returns:
+        tuple: (rotacion, x) objetivo
+    """
+    pieza = motor.pieza_actual
+    tablero = motor.tablero
+    tipo = pieza['tipo']
+    estado = EstadoTablero.desde_tablero(tablero)
+    mejor = None
+    for rotacion, forma in enumerate(FORMAS_COMPILADAS[tipo]):
+        for pos_x in range(-forma.min_x, ANCHO_TABLERO - forma.max_x):
+            if tablero.colisiona(tipo, rotacion, pos_x, pieza['y']):
+                continue
+            pos_y = pieza['y'] + tablero.distancia_caida(tipo, rotacion, pos_x, pieza['y'])
+            valor, _ = estado.evaluar(forma, pos_x, pos_y, PESOS)
+            if mejor is None or valor > mejor[0]:
+                mejor = (valor, rotacion, pos_x)
+
+    if mejor is None:
+        return pieza['rotacion'], pieza['x']
+    return mejor[1], mejor[2]
+
+# =============================================
+# UNA PARTIDA
+# =============================================
+
+def jugar_partida(semilla, reglas=REGLAS_CLASICAS, politica=politica_codiciosa,
+                  modo_generador=MODO_UNIFORME, cuadros_por_accion=CUADROS_POR_ACCION,
+                  maximo_piezas=MAXIMO_PIEZAS, clase_tablero=TableroBits):
+    """
+    Juega una partida completa con una política, sin interfaz.
+
+    Por cada pieza la política elige (rotación, x); se gira y se desplaza
+    con una pulsación cada 'cuadros_por_accion' cuadros de gravedad y al
+    final se pulsa caída rápida. Si un movimiento choca, se suelta la pieza
+    donde esté; si la gravedad la fija antes, se pasa a la siguiente.
+
+    Args:
+        semilla (int): Semilla del generador de piezas
+        reglas (ReglasJuego): Reglas de la partida
+        politica (callable): politica(motor) -> (rotacion, x)
+        modo_generador (str): MODO_UNIFORME o MODO_BOLSA
+        cuadros_por_accion (int): Cuadros de gravedad entre pulsaciones
+        maximo_piezas (int): Tope de piezas de la partida
+        clase_tablero: TableroBits (por defecto) o TableroLista
+
+    Returns:
+        tuple: (semilla, puntuacion, lineas, nivel, piezas, cuadros), en el
+               orden de REGISTRO_PARTIDA
+    """
+    motor = MotorTetris(semilla=semilla, clase_tablero=clase_tablero,
+                        modo_generador=modo_generador, reglas=reglas)
+    piezas = 0
+    while not motor.juego_terminado and piezas < maximo_piezas:
+        rotacion, objetivo_x = politica(motor)
+        pieza = motor.pieza_actual
+        fijada = False
+        while pieza['rotacion'] != rotacion or pieza['x'] != objetivo_x:
+            if pieza['rotacion'] != rotacion:
+                se_movio = motor.rotar_pieza()
+            elif pieza['x'] < objetivo_x:
+                se_movio = motor.mover_derecha()
+            else:
+                se_movio = motor.mover_izquierda()
+            if not se_movio:
+                break
+            fijada = motor.avanzar_cuadros(cuadros_por_accion)
+            if fijada:
+                break
+
+        if not fijada:
+            motor.caida_rapida()
+        piezas += 1
+
+    return (semilla, motor.puntuacion, motor.lineas_completadas, motor.nivel,
+            piezas, motor.cuadro)
+
+# =============================================
+# HISTOGRAMAS
+# =============================================
+
+class Histograma:
+    """
+    Histograma de enteros con intervalos de ancho fijo, que se llena de uno en uno.
+
+    Guarda también el total, la suma, el mínimo y el máximo para dar la
+    media sin recorrer los intervalos.
+    """
+
+    def __init__(self, ancho_intervalo=1):
+        self.ancho_intervalo = ancho_intervalo
+        self.conteos = {}
+        self.total = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+
+    def agregar(self, valor):
+        """Cuenta un valor"""
+        intervalo = valor // self.ancho_intervalo
+        self.conteos[intervalo] = self.conteos.get(intervalo, 0) + 1
+        self.total += 1
+        self.suma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    def media(self):
+        """Media de los valores (0 si está vacío)"""
+        return self.suma / self.total if self.total else 0
+
+    def percentil(self, porcentaje):
+        """
+        Percentil aproximado, interpolado dentro de su intervalo.
+
+        Los valores de un intervalo se suponen repartidos por igual entre
+        sus enteros; el resultado nunca sale de [minimo, maximo], y con
+        intervalos de ancho 1 es exacto.
+
+        Returns:
+            int: Valor en el que se alcanza el 'porcentaje' % (0..100)
+        """
+        if not self.total:
+            return 0
+        objetivo = self.total * porcentaje / 100
+        acumulado = 0
+        for intervalo in sorted(self.conteos):
+            conteo = self.conteos[intervalo]
+            if acumulado + conteo >= objetivo:
+                fraccion = (objetivo - acumulado) / conteo
+                desplazamiento = min(self.ancho_intervalo - 1, int(fraccion * self.ancho_intervalo))
+                valor = intervalo * self.ancho_intervalo + desplazamiento
+                return min(self.maximo, max(self.minimo, valor))
+            acumulado += conteo
+        return self.maximo
+
+    def intervalos(self):
+        """Lista de (inicio del intervalo, partidas) ordenada"""
+        return [(intervalo * self.ancho_intervalo, cantidad)
+                for intervalo, cantidad in sorted(self.conteos.items())]
+
+
+class ResultadosGranja:
+    """Histogramas de todas las partidas recibidas hasta el momento"""
+
+    CAMPOS = ('puntuacion', 'lineas', 'nivel', 'piezas', 'cuadros')
+
+    def __init__(self, intervalos=INTERVALOS_HISTOGRAMA):
+        self.histogramas = {campo: Histograma(intervalos[campo]) for campo in self.CAMPOS}
+        self.partidas = 0
+
+    def agregar(self, registro):
+        """Suma una partida (tupla en el orden de REGISTRO_PARTIDA)"""
+        self.partidas += 1
+        for campo, valor in zip(self.CAMPOS, registro[1:]):
+            self.histogramas[campo].agregar(valor)
+
+    def agregar_mensaje(self, mensaje):
+        """Suma todas las partidas de un mensaje binario de la tubería"""
+        for registro in REGISTRO_PARTIDA.iter_unpack(mensaje):
+            self.agregar(registro)
+
+    def resumen(self):
+        """Media, p50, p90 y máximo de cada campo"""
+        return {
+            campo: {
+                'media': round(histograma.media(), 2),
+                'p50': histograma.percentil(50),
+                'p90': histograma.percentil(90),
+                'maximo': histograma.maximo,
+            }
+            for campo, histograma in self.histogramas.items()
+        }
+
+# =============================================
+# PROCESOS
+# =============================================
+
+def _simular_parte(conexion, semillas, parametros):
+    """
+    Cuerpo de cada proceso: juega sus semillas y envía los registros.
+
+    Args:
+        conexion: Extremo de escritura de la tubería
+        semillas (range): Semillas de esta parte
+        parametros (dict): Argumentos de jugar_partida
+    """
+    empaquetar = REGISTRO_PARTIDA.pack
+    mensaje = bytearray()
+    en_mensaje = 0
+    try:
+        for semilla in semillas:
+            mensaje += empaquetar(*jugar_partida(semilla, **parametros))
+            en_mensaje += 1
+            if en_mensaje == PARTIDAS_POR_MENSAJE:
+                conexion.send_bytes(mensaje)
+                mensaje.clear()
+                en_mensaje = 0
+        if mensaje:
+            conexion.send_bytes(mensaje)
+        conexion.send_bytes(b"")  # Fin de la parte
+    finally:
+        conexion.close()
+
+
+def simular(partidas, semilla_inicial=0, reglas=REGLAS_CLASICAS, politica=politica_codiciosa,
+            procesos=None, modo_generador=MODO_UNIFORME, cuadros_por_accion=CUADROS_POR_ACCION,
+            maximo_piezas=MAXIMO_PIEZAS, al_recibir=None):
+    """
+    Juega 'partidas' partidas con semillas consecutivas repartidas entre procesos.
+
+    El proceso k juega las semillas semilla_inicial + k, + k + procesos, ...
+    así que el resultado no depende del número de procesos.
+
+    Args:
+        partidas (int): Número de partidas
+        semilla_inicial (int): Semilla de la primera partida
+        reglas (ReglasJuego): Reglas de todas las partidas
+        politica (callable): Función de módulo politica(motor) -> (rotacion, x)
+        procesos (int): Procesos a usar (None = todos los núcleos; 1 = sin procesos)
+        modo_generador (str): MODO_UNIFORME o MODO_BOLSA
+        cuadros_por_accion (int): Cuadros de gravedad entre pulsaciones
+        maximo_piezas (int): Tope de piezas por partida
+        al_recibir (callable): Se llama con los ResultadosGranja tras cada mensaje
+
+    Returns:
+        ResultadosGranja: Histogramas de todas las partidas
+    """
+    parametros = {
+        'reglas': reglas,
+        'politica': politica,
+        'modo_generador': modo_generador,
+        'cuadros_por_accion': cuadros_por_accion,
+        'maximo_piezas': maximo_piezas,
+    }
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    procesos = max(1, min(procesos, partidas))
+    resultados = ResultadosGranja()
+
+    if procesos == 1:
+        for semilla in range(semilla_inicial, semilla_inicial + partidas):
+            resultados.agregar(jugar_partida(semilla, **parametros))
+        if al_recibir is not None:
+            al_recibir(resultados)
+        return resultados
+
+    activos = {}
+    for parte in range(procesos):
+        lectura, escritura = multiprocessing.Pipe(duplex=False)
+        semillas = range(semilla_inicial + parte, semilla_inicial + partidas, procesos)
+        proceso = multiprocessing.Process(target=_simular_parte, name=f"granja-{parte}",
+                                          args=(escritura, semillas, parametros), daemon=True)
+        proceso.start()
+        escritura.close()  # Solo el hijo escribe: así recv_bytes ve el cierre si falla
+        activos[lectura] = proceso
+
+    fallidos = []
+    try:
+        while activos:
+            for conexion in wait(list(activos)):
+                try:
+                    mensaje = conexion.recv_bytes()
+                except EOFError:
+                    mensaje = None  # El proceso terminó sin el mensaje de fin
+                if mensaje:
+                    resultados.agregar_mensaje(mensaje)
+                    if al_recibir is not None:
+                        al_recibir(resultados)
+                    continue
+
+                proceso = activos.pop(conexion)
+                conexion.close()
+                proceso.join()
+                if mensaje is None or proceso.exitcode != 0:
+                    fallidos.append(proceso.name)
+    finally:
+        for proceso in activos.values():
+            proceso.terminate()
+
+    if fallidos:
+        raise RuntimeError(f"Fallaron los procesos de simulación: {', '.join(fallidos)}")
+    return resultados
+
+# =============================================
+# GUARDADO DE RESULTADOS
+# =============================================
+
+def crear_guardado(archivo_resumen=None, archivo_record=None, clave_record='record'):
+    """
+    Crea un al_recibir para simular() que va guardando los resultados.
+
+    Cada llamada corresponde a un mensaje con muchas partidas terminadas a
+    la vez: el resumen y el récord se escriben en un mismo LoteEscrituras
+    (una escritura por archivo y un fsync del directorio por mensaje). El
+    récord solo se escribe si la mejor partida supera al guardado.
+
+    Args:
+        archivo_resumen (str): JSON con el resumen de los histogramas (o None)
+        archivo_record (str): JSON del récord, como tetris_record.json (o None)
+        clave_record (str): Clave del récord dentro del JSON
+
+    Returns:
+        callable: al_recibir(resultados)
+    """
+    record = 0
+    if archivo_record:
+        try:
+            record = cargar_json(archivo_record, {}).get(clave_record, 0)
+        except (DatosCorruptos, AttributeError):
+            record = 0
+
+    def al_recibir(resultados):
+        nonlocal record
+        with LoteEscrituras() as lote:
+            if archivo_resumen:
+                lote.guardar_json(archivo_resumen, {'partidas': resultados.partidas,
+                                                    'resumen': resultados.resumen()})
+            maximo = resultados.histogramas['puntuacion'].maximo or 0
+            if archivo_record and maximo > record:
+                record = maximo
+                lote.guardar_json(archivo_record, {clave_record: record})
+
+    return al_recibir
+
+# =============================================
+# LÍNEA DE ÓRDENES
+# =============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula muchas partidas con una política fija")
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la primera partida")
+    parser.add_argument("--procesos", type=int, default=None, help="Por defecto, uno por núcleo")
+    parser.add_argument("--bolsa", action="store_true", help="Generador 7-bag")
+    parser.add_argument("--maximo-piezas", type=int, default=MAXIMO_PIEZAS)
+    parser.add_argument("--cuadros-por-accion", type=int, default=CUADROS_POR_ACCION)
+    parser.add_argument("--lineas-por-nivel", type=int, default=REGLAS_CLASICAS.lineas_por_nivel)
+    parser.add_argument("--velocidad-base", type=int, default=REGLAS_CLASICAS.velocidad_base)
+    parser.add_argument("--velocidad-minima", type=int, default=REGLAS_CLASICAS.velocidad_minima)
+    parser.add_argument("--reduccion-velocidad", type=int,
+                        default=REGLAS_CLASICAS.reduccion_velocidad)
+    parser.add_argument("--puntos-lineas", default=None,
+                        help="Puntos por 1..4 líneas separados por comas (p. ej. 40,100,300,1200)")
+    parser.add_argument("--guardar", help="Archivo JSON donde se va guardando el resumen")
+    parser.add_argument("--record", help="Archivo de récord a actualizar con la mejor partida")
+    argumentos = parser.parse_args()
+
+    puntos_lineas = REGLAS_CLASICAS.puntos_lineas
+    if argumentos.puntos_lineas:
+        puntos_lineas = (0,) + tuple(int(p) for p in argumentos.puntos_lineas.split(","))
+    reglas = REGLAS_CLASICAS._replace(
+        lineas_por_nivel=argumentos.lineas_por_nivel,
+        puntos_lineas=puntos_lineas,
+        velocidad_base=argumentos.velocidad_base,
+        velocidad_minima=argumentos.velocidad_minima,
+        reduccion_velocidad=argumentos.reduccion_velocidad,
+    )
+
+    resultados = simular(
+        argumentos.partidas, argumentos.semilla, reglas,
+        procesos=argumentos.procesos,
+        modo_generador=MODO_BOLSA if argumentos.bolsa else MODO_UNIFORME,
+        cuadros_por_accion=argumentos.cuadros_por_accion,
+        maximo_piezas=argumentos.maximo_piezas,
+        al_recibir=(crear_guardado(argumentos.guardar, argumentos.record)
+                    if argumentos.guardar or argumentos.record else None),
+    )
+
+    print(f"Partidas: {resultados.partidas}")
+    for campo, valores in resultados.resumen().items():
+        print(f"  {campo:<11} media {valores['media']:>10}  p50 {valores['p50']:>8}  "
+              f"p90 {valores['p90']:>8}  máx {valores['maximo']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Historial de partidas en un registro de solo-añadir.
+
+Antes, cada game over leía todo tetris_historial.json, añadía una partida,
+lo recortaba a las últimas 10 y lo reescribía entero. HistorialPartidas
+escribe cada partida como una línea JSON al final de un segmento
+(tetris_historial_0001.jsonl, _0002...), así que guardar una partida cuesta
+lo mismo con 10 partidas que con millones. Cuando un segmento supera
+TAMANO_MAXIMO_SEGMENTO se empieza el siguiente.
+
+Un índice pequeño (tetris_historial_indice.json) guarda el total de
+partidas y las últimas y mejores PARTIDAS_EN_INDICE, de modo que las
+consultas habituales (últimas N, mejores N) no leen los segmentos. Si el
+índice falta o no cuadra con los segmentos, se reconstruye leyéndolos.
+"""
+
+import glob
+import heapq
+import itertools
+import json
+import os
+
+from persistencia import escribir_atomico
+
+# =============================================
+# CONFIGURACIÓN DEL HISTORIAL
+# =============================================
+
+# Tamaño a partir del cual se empieza un segmento nuevo (bytes)
+TAMANO_MAXIMO_SEGMENTO = 1024 * 1024
+
+# Partidas que el índice guarda para las consultas rápidas
+PARTIDAS_EN_INDICE = 50
+
+# =============================================
+# HISTORIAL
+# =============================================
+
+class HistorialPartidas:
+    """
+    Registro de partidas en segmentos JSONL con índice.
+
+    Uso típico:
+        historial = HistorialPartidas("tetris_historial")
+        historial.agregar({'puntuacion': 1200, 'nivel': 3, ...})
+        ultimas = historial.ultimas(10)     # la más reciente primero
+        mejores = historial.mejores(5)      # la de más puntos primero
+    """
+
+    def __init__(self, nombre_base, archivo_antiguo=None,
+                 tamano_maximo_segmento=TAMANO_MAXIMO_SEGMENTO):
+        """
+        Args:
+            nombre_base (str): Prefijo de los archivos (segmentos e índice)
+            archivo_antiguo (str): tetris_historial.json del formato anterior;
+                                   sus partidas se importan la primera vez
+            tamano_maximo_segmento (int): Bytes por segmento antes de rotar
+        """
+        self.nombre_base = nombre_base
+        self.archivo_indice = f"{nombre_base}_indice.json"
+        self.tamano_maximo_segmento = tamano_maximo_segmento
+
+        if not self._segmentos() and archivo_antiguo:
+            self._migrar(archivo_antiguo)
+        segmentos = self._segmentos()
+        if segmentos:
+            self._reparar_final(segmentos[-1])
+        self._cargar_indice()
+
+    # -----------------------------------------
+    # Archivos
+    # -----------------------------------------
+
+    def _ruta_segmento(self, numero):
+        """Nombre del archivo del segmento 'numero'"""
+        return f"{self.nombre_base}_{numero:04d}.jsonl"
+
+    def _segmentos(self):
+        """Números de los segmentos existentes, en orden"""
+        numeros = []
+        for ruta in glob.glob(f"{glob.escape(self.nombre_base)}_*.jsonl"):
+            sufijo = ruta[len(self.nombre_base) + 1:-len(".jsonl")]
+            if sufijo.isdigit():
+                numeros.append(int(sufijo))
+        return sorted(numeros)
+
+    def _leer_segmento(self, numero):
+        """Partidas de un segmento (ignora las líneas que quedaron a medio escribir)"""
+        partidas = []
+        try:
+            with open(self._ruta_segmento(numero), 'r', encoding='utf-8') as archivo:
+                for linea in archivo:
+                    try:
+                        partidas.append(json.loads(linea))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return partidas
+
+    # -----------------------------------------
+    # Índice
+    # -----------------------------------------
+
+    def _cargar_indice(self):
+        """Carga el índice o lo reconstruye si no coincide con los segmentos"""
+        try:
+            with open(self.archivo_indice, 'r', encoding='utf-8') as archivo:
+                indice = json.load(archivo)
+            segmento = indice['segmento']
+            if (segmento == (self._segmentos() or [1])[-1]
+                    and indice['bytes_segmento'] == self._tamano_segmento(segmento)):
+                self.total = indice['total']
+                self.segmento_actual = segmento
+                self.bytes_segmento = indice['bytes_segmento']
+                self.recientes = indice['ultimas']
+                self.destacadas = indice['mejores']
+                return
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            pass
+        self.reconstruir_indice()
+
+    def _tamano_segmento(self, numero):
+        """Tamaño en bytes de un segmento (0 si no existe)"""
+        try:
+            return os.path.getsize(self._ruta_segmento(numero))
+        except OSError:
+            return 0
+
+    def _reparar_final(self, numero):
+        """Termina con salto de línea un segmento cortado a mitad de una partida"""
+        ruta = self._ruta_segmento(numero)
+        try:
+            with open(ruta, 'rb+') as archivo:
+                archivo.seek(0, os.SEEK_END)
+                if archivo.tell() == 0:
+                    return
+                archivo.seek(-1, os.SEEK_END)
+                if archivo.read(1) != b"\n":
+                    archivo.write(b"\n")
+        except OSError:
+            pass
+
+    def _guardar_indice(self):
+        """Escribe el índice (es pequeño: tamaño fijo, no crece con el historial)"""
+        indice = {
+            'total': self.total,
+            'segmento': self.segmento_actual,
+            'bytes_segmento': self.bytes_segmento,
+            'ultimas': self.recientes,
+            'mejores': self.destacadas,
+        }
+        try:
+            # Atómico pero sin fsync: si se pierde, se reconstruye
+            escribir_atomico(self.archivo_indice, json.dumps(indice).encode('utf-8'),
+                             sincronizar=False, copia_seguridad=False)
+        except OSError as e:
+            print(f"Error guardando {self.archivo_indice}: {e}")
+
+    def reconstruir_indice(self):
+        """Recorre todos los segmentos y vuelve a calcular el índice"""
+        segmentos = self._segmentos()
+        self.total = 0
+        self.recientes = []
+        self.destacadas = []
+        for numero in segmentos:
+            for partida in self._leer_segmento(numero):
+                self._indexar(partida)
+        self.segmento_actual = segmentos[-1] if segmentos else 1
+        self.bytes_segmento = self._tamano_segmento(self.segmento_actual)
+        self._guardar_indice()
+
+    def _indexar(self, partida):
+        """Cuenta una partida nueva en el índice en memoria"""
+        self.total += 1
+        self.recientes.append(partida)
+        if len(self.recientes) > PARTIDAS_EN_INDICE:
+            del self.recientes[0]
+
+        destacadas = self.destacadas
+        if (len(destacadas) < PARTIDAS_EN_INDICE
+                or partida['puntuacion'] > destacadas[-1]['puntuacion']):
+            # Inserción ordenada (de mayor a menor puntuación, estable)
+            posicion = len(destacadas)
+            while posicion > 0 and destacadas[posicion - 1]['puntuacion'] < partida['puntuacion']:
+                posicion -= 1
+            destacadas.insert(posicion, partida)
+            if len(destacadas) > PARTIDAS_EN_INDICE:
+                destacadas.pop()
+
+    # -----------------------------------------
+    # Escritura
+    # -----------------------------------------
+
+    def agregar(self, partida):
+        """
+        Añade una partida al final del segmento actual.
+
+        Args:
+            partida (dict): Datos de la partida (debe tener 'puntuacion')
+
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        linea = (json.dumps(partida, ensure_ascii=False) + "\n").encode('utf-8')
+        if self.bytes_segmento and self.bytes_segmento + len(linea) > self.tamano_maximo_segmento:
+            # Rotar: las partidas nuevas van a un segmento nuevo
+            self.segmento_actual += 1
+            self.bytes_segmento = 0
+
+        try:
+            with open(self._ruta_segmento(self.segmento_actual), 'ab') as archivo:
+                archivo.write(linea)
+        except OSError as e:
+            print(f"Error guardando el historial: {e}")
+            return False
+
+        self.bytes_segmento += len(linea)
+        self._indexar(partida)
+        self._guardar_indice()
+        return True
+
+    def _migrar(self, archivo_antiguo):
+        """Importa las partidas del historial JSON anterior"""
+        try:
+            with open(archivo_antiguo, 'r', encoding='utf-8') as archivo:
+                partidas = json.load(archivo).get('partidas', [])
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return
+        if not partidas:
+            return
+        with open(self._ruta_segmento(1), 'a', encoding='utf-8') as archivo:
+            for partida in partidas:
+                archivo.write(json.dumps(partida, ensure_ascii=False) + "\n")
+
+    # -----------------------------------------
+    # Consultas
+    # -----------------------------------------
+
+    def __len__(self):
+        return self.total
+
+    def record(self):
+        """Mejor puntuación del historial (0 si no hay partidas)"""
+        return self.destacadas[0]['puntuacion'] if self.destacadas else 0
+
+    def todas(self):
+        """Recorre todas las partidas, de la más antigua a la más reciente"""
+        for numero in self._segmentos():
+            yield from self._leer_segmento(numero)
+
+    def ultimas(self, cantidad=10):
+        """
+        Devuelve las últimas partidas, la más reciente primero.
+
+        Args:
+            cantidad (int): Número de partidas
+
+        Returns:
+            list: Partidas (dict)
+        """
+        if cantidad <= len(self.recientes) or len(self.recientes) == self.total:
+            return list(reversed(self.recientes[-cantidad:])) if cantidad > 0 else []
+
+        # Más de las que guarda el índice: leer segmentos desde el final,
+        # cada uno ya dado la vuelta, y juntarlos una sola vez
+        segmentos = []
+        leidas = 0
+        for numero in reversed(self._segmentos()):
+            segmento = self._leer_segmento(numero)
+            segmento.reverse()
+            segmentos.append(segmento)
+            leidas += len(segmento)
+            if leidas >= cantidad:
+                break
+        return list(itertools.chain.from_iterable(segmentos))[:cantidad]
+
+    def mejores(self, cantidad=10):
+        """
+        Devuelve las partidas con más puntos, la mejor primero.
+
+        Args:
+            cantidad (int): Número de partidas
+
+        Returns:
+            list: Partidas (dict)
+        """
+        if cantidad <= len(self.destacadas) or len(self.destacadas) == self.total:
+            return self.destacadas[:cantidad]
+
+        # Más de las que guarda el índice: recorrer todos los segmentos
+        return heapq.nlargest(cantidad, self.todas(), key=lambda partida: partida['puntuacion'])
+
+    def cerrar(self):
+        """No hay nada pendiente: cada partida se escribe al agregarla"""
@@ -0,0 +1,459 @@
+"""
+Jugador automático con evaluación heurística del tablero.
+
+Para demostraciones y pruebas de resistencia. Por cada pieza:
+
+1. Enumera las colocaciones alcanzables (colocaciones.py) de la pieza
+   actual y, si se puede guardar (hold, en la versión con velocidad), de
+   la pieza que entraría en su lugar.
+2. Valora cada una con las características clásicas: altura total,
+   huecos tapados, irregularidad (diferencia de altura entre columnas
+   vecinas) y líneas completadas, mirando además la mejor colocación de
+   la siguiente pieza sobre el tablero resultante.
+3. Busca el camino de teclas (rotar, izquierda, derecha, bajar) hasta la
+   colocación elegida y lo va devolviendo acción por acción.
+
+El tablero se representa con una máscara de filas por columna
+(mascaras_columnas), y EstadoTablero guarda las características de cada
+columna, así que valorar una colocación solo recalcula las columnas que
+toca la pieza (todas solo si completa alguna línea). Así una jugada con
+anticipación cabe de sobra en un cuadro incluso a VELOCIDAD_MINIMA.
+
+Las acciones son las de repeticion.py (ACCION_IZQUIERDA, ...), de modo
+que en main.py las jugadas del jugador automático se graban igual que
+las de una persona; ACCION_GUARDAR solo existe en la versión con velocidad.
+"""
+
+from collections import deque, namedtuple
+
+from colocaciones import (
+    FORMAS_EQUIVALENTES, enumerar_colocaciones, mascaras_columnas, tabla_filas_libres
+)
+from motor_tetris import ALTO_TABLERO, ANCHO_TABLERO, FORMAS_COMPILADAS
+from repeticion import (
+    ACCION_BAJAR, ACCION_CAIDA_RAPIDA, ACCION_DERECHA, ACCION_IZQUIERDA, ACCION_ROTAR,
+    METODOS_ACCIONES
+)
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Pesos de cada característica: altura total, líneas, huecos, irregularidad
+PESOS = (-0.51, 0.76, -0.36, -0.18)
+
+# Valor de una jugada tras la que la siguiente pieza no cabe
+VALOR_DERROTA = -1e9
+
+# Guardar la pieza (hold); no es una acción de MotorTetris ni se graba
+ACCION_GUARDAR = 6
+
+# Posición de aparición de MotorTetris (la versión con velocidad usa x = 3)
+X_APARICION = ANCHO_TABLERO // 2 - 1
+
+# Jugada elegida: colocación final y si antes hay que guardar la pieza
+Jugada = namedtuple("Jugada", ["rotacion", "x", "y", "valor", "guardar"])
+
+# =============================================
+# EVALUACIÓN INCREMENTAL
+# =============================================
+
+def altura_columna(mascara):
+    """Altura de una columna (0 = vacía) a partir de su máscara de filas"""
+    if not mascara:
+        return 0
+    return ALTO_TABLERO - ((mascara & -mascara).bit_length() - 1)
+
+
+def eliminar_filas(columnas, llenas):
+    """
+    Quita las filas de la máscara 'llenas' de todas las columnas.
+
+    Returns:
+        list: Columnas nuevas, con lo que había encima bajado
+    """
+    resultado = list(columnas)
+    fila = 0
+    while llenas >> fila:
+        if (llenas >> fila) & 1:
+            encima = (1 << fila) - 1
+            for c in range(ANCHO_TABLERO):
+                mascara = resultado[c]
+                resultado[c] = ((mascara & encima) << 1) | (mascara & ~((encima << 1) | 1))
+        fila += 1
+    return resultado
+
+
+class EstadoTablero:
+    """
+    Tablero como máscaras de columna con sus características precalculadas.
+
+    Atributos:
+        columnas (list): Máscara de filas ocupadas de cada columna
+        alturas, huecos (list): Altura y celdas vacías tapadas de cada columna
+        altura_total, huecos_total, irregularidad (int): Totales del tablero
+    """
+
+    def __init__(self, columnas):
+        self.columnas = columnas
+        self.alturas = [altura_columna(mascara) for mascara in columnas]
+        self.huecos = [altura - mascara.bit_count()
+                       for altura, mascara in zip(self.alturas, columnas)]
+        self.altura_total = sum(self.alturas)
+        self.huecos_total = sum(self.huecos)
+        self.irregularidad = sum(abs(self.alturas[c] - self.alturas[c + 1])
+                                 for c in range(ANCHO_TABLERO - 1))
+
+    @classmethod
+    def desde_tablero(cls, tablero):
+        """Estado de un TableroLista o TableroBits"""
+        return cls(mascaras_columnas(tablero))
+
+    def _fijar(self, forma, pos_x, pos_y):
+        """Columnas tocadas por la pieza (con la pieza) y filas que llena"""
+        tocadas = {}
+        filas_pieza = 0
+        for dx, dy in forma.celdas:
+            columna = pos_x + dx
+            tocadas[columna] = tocadas.get(columna, self.columnas[columna]) | (1 << (pos_y + dy))
+            filas_pieza |= 1 << (pos_y + dy)
+
+        llenas = filas_pieza
+        for columna in range(ANCHO_TABLERO):
+            llenas &= tocadas.get(columna, self.columnas[columna])
+            if not llenas:
+                break
+        return tocadas, llenas
+
+    def colocar(self, forma, pos_x, pos_y):
+        """
+        Estado después de fijar la forma y eliminar las líneas completas.
+
+        Returns:
+            tuple: (EstadoTablero nuevo, líneas eliminadas)
+        """
+        tocadas, llenas = self._fijar(forma, pos_x, pos_y)
+        columnas = list(self.columnas)
+        for columna, mascara in tocadas.items():
+            columnas[columna] = mascara
+        if llenas:
+            columnas = eliminar_filas(columnas, llenas)
+        return EstadoTablero(columnas), llenas.bit_count()
+
+    def evaluar(self, forma, pos_x, pos_y, pesos=PESOS):
+        """
+        Valor del tablero después de fijar la forma, sin construir el estado.
+
+        Si la pieza no completa líneas solo se recalculan sus columnas (y
+        la irregularidad de sus vecinas); si completa alguna, todo el tablero.
+
+        Returns:
+            tuple: (valor, líneas eliminadas)
+        """
+        tocadas, llenas = self._fijar(forma, pos_x, pos_y)
+        peso_altura, peso_lineas, peso_huecos, peso_irregularidad = pesos
+        if llenas:
+            estado, lineas = self.colocar(forma, pos_x, pos_y)
+            return (peso_altura * estado.altura_total + peso_lineas * lineas
+                    + peso_huecos * estado.huecos_total
+                    + peso_irregularidad * estado.irregularidad), lineas
+
+        alturas = self.alturas
+        altura_total = self.altura_total
+        huecos_total = self.huecos_total
+        nuevas_alturas = {}
+        for columna, mascara in tocadas.items():
+            altura = altura_columna(mascara)
+            nuevas_alturas[columna] = altura
+            altura_total += altura - alturas[columna]
+            huecos_total += (altura - mascara.bit_count()) - self.huecos[columna]
+
+        # Solo cambian los pares de columnas vecinas de las tocadas
+        irregularidad = self.irregularidad
+        pares = {c for columna in tocadas for c in (columna - 1, columna)
+                 if 0 <= c < ANCHO_TABLERO - 1}
+        for c in pares:
+            izquierda = nuevas_alturas.get(c, alturas[c])
+            derecha = nuevas_alturas.get(c + 1, alturas[c + 1])
+            irregularidad += abs(izquierda - derecha) - abs(alturas[c] - alturas[c + 1])
+
+        return (peso_altura * altura_total + peso_huecos * huecos_total
+                + peso_irregularidad * irregularidad), 0
+
+# =============================================
+# BÚSQUEDA DEL CAMINO
+# =============================================
+
+def buscar_camino(columnas, tipo, origen, destino):
+    """
+    Teclas para llevar una pieza de 'origen' a la colocación 'destino'.
+
+    BFS por estados (rotación, x, y) con los mismos movimientos que
+    enumerar_colocaciones; la bajada final se sustituye por una caída rápida.
+
+    Args:
+        columnas (list): Máscaras de columna del tablero
+        tipo (int): Tipo de pieza
+        origen, destino (tuple): (rotacion, x, y); destino como lo da
+                                 enumerar_colocaciones (rotación canónica)
+
+    Returns:
+        list: Acciones (ACCION_*) terminadas en ACCION_CAIDA_RAPIDA, o None
+              si el destino no es alcanzable
+    """
+    libres = tabla_filas_libres(columnas, tipo)
+    cantidad_rotaciones = len(libres)
+    equivalentes = FORMAS_EQUIVALENTES[tipo]
+
+    def cabe(r, x, y):
+        return (libres[r].get(x, 0) >> y) & 1
+
+    if not cabe(*origen):
+        return None
+
+    anteriores = {origen: None}
+    cola = deque([origen])
+    while cola:
+        estado = cola.popleft()
+        r, x, y = estado
+        canonica, desplazamiento_x, desplazamiento_y = equivalentes[r]
+        if ((canonica, x + desplazamiento_x, y + desplazamiento_y) == destino
+                and not cabe(r, x, y + 1)):
+            break
+        for accion, vecino in ((ACCION_ROTAR, ((r + 1) % cantidad_rotaciones, x, y)),
+                               (ACCION_IZQUIERDA, (r, x - 1, y)),
+                               (ACCION_DERECHA, (r, x + 1, y)),
+                               (ACCION_BAJAR, (r, x, y + 1))):
+            if vecino not in anteriores and cabe(*vecino):
+                anteriores[vecino] = (estado, accion)
+                cola.append(vecino)
+    else:
+        return None
+
+    acciones = []
+    while anteriores[estado] is not None:
+        estado, accion = anteriores[estado]
+        acciones.append(accion)
+    acciones.reverse()
+
+    # La pieza está en reposo en el destino: las últimas bajadas son una caída rápida
+    while acciones and acciones[-1] == ACCION_BAJAR:
+        acciones.pop()
+    acciones.append(ACCION_CAIDA_RAPIDA)
+    return acciones
+
+# =============================================
+# JUGADOR
+# =============================================
+
+class JugadorAutomatico:
+    """
+    Elige y ejecuta jugadas pieza a pieza.
+
+    Uso típico en un bucle de juego (una acción por cuadro):
+        jugador = JugadorAutomatico()
+        accion = jugador.accion_para_motor(motor)   # None = nada que hacer
+
+    Sin interfaz:
+        jugar_partida_automatica(motor)
+    """
+
+    def __init__(self, pesos=PESOS, anticipar=True):
+        """
+        Args:
+            pesos (tuple): Pesos de altura total, líneas, huecos e irregularidad
+            anticipar (bool): Tener en cuenta la siguiente pieza
+        """
+        self.pesos = pesos
+        self.anticipar = anticipar
+        self.jugadas = 0
+        self._reiniciar_plan()
+
+    def _reiniciar_plan(self):
+        self.plan = deque()
+        self.objetivo = None     # (tipo, rotación, x, y) de la jugada en curso
+        self.esperada = None     # Pieza (tipo, rotación, x, y) para la siguiente acción
+        self.columnas_plan = None
+
+    # -----------------------------------------
+    # Elección de la jugada
+    # -----------------------------------------
+
+    def _valorar(self, estado, tipo, colocacion, despues, x_aparicion):
+        """Valor de una colocación, con la mejor respuesta de la pieza 'despues'"""
+        forma = FORMAS_COMPILADAS[tipo][colocacion[0]]
+        if despues is None or not self.anticipar:
+            return estado.evaluar(forma, colocacion[1], colocacion[2], self.pesos)[0]
+
+        nuevo, lineas = estado.colocar(forma, colocacion[1], colocacion[2])
+        mejor = VALOR_DERROTA
+        for rotacion, x, y in enumerar_colocaciones(None, despues, 0, x_aparicion, 0,
+                                                    columnas=nuevo.columnas):
+            valor = nuevo.evaluar(FORMAS_COMPILADAS[despues][rotacion], x, y, self.pesos)[0]
+            if valor > mejor:
+                mejor = valor
+        return mejor + self.pesos[1] * lineas
+
+    def elegir_jugada(self, columnas, pieza, siguiente=None, guardada=None,
+                      puede_guardar=False, x_aparicion=X_APARICION):
+        """
+        Mejor colocación para la pieza actual (o para la que entraría al guardar).
+
+        Args:
+            columnas (list): Máscaras de columna del tablero
+            pieza (tuple): (tipo, rotación, x, y) de la pieza actual
+            siguiente (int): Tipo de la siguiente pieza (None = sin anticipación)
+            guardada (tuple): (tipo, rotación) de la pieza guardada, o None
+            puede_guardar (bool): Se puede guardar la pieza en este turno
+            x_aparicion (int): x en la que aparecen las piezas nuevas
+
+        Returns:
+            Jugada: o None si la pieza no tiene ninguna colocación
+        """
+        estado = EstadoTablero(columnas)
+        tipo = pieza[0]
+
+        # (guardar, tipo que se coloca, posición de partida, pieza que viene después)
+        opciones = [(False, tipo, pieza[1:], siguiente)]
+        if puede_guardar:
+            if guardada is not None:
+                opciones.append((True, guardada[0], (guardada[1], x_aparicion, 0), siguiente))
+            elif siguiente is not None:
+                # La actual queda guardada y se puede recuperar en el turno siguiente
+                opciones.append((True, siguiente, (0, x_aparicion, 0), tipo))
+
+        mejor = None
+        for guardar, tipo_colocado, partida, despues in opciones:
+            for colocacion in enumerar_colocaciones(None, tipo_colocado, *partida,
+                                                    columnas=columnas):
+                valor = self._valorar(estado, tipo_colocado, colocacion, despues, x_aparicion)
+                if mejor is None or valor > mejor.valor:
+                    mejor = Jugada(colocacion[0], colocacion[1], colocacion[2], valor, guardar)
+        return mejor
+
+    # -----------------------------------------
+    # Ejecución
+    # -----------------------------------------
+
+    def planificar(self, columnas, pieza, siguiente=None, guardada=None,
+                   puede_guardar=False, x_aparicion=X_APARICION):
+        """
+        Elige la jugada y prepara sus acciones.
+
+        Returns:
+            bool: False si la pieza no tiene ninguna colocación
+        """
+        self._reiniciar_plan()
+        jugada = self.elegir_jugada(columnas, pieza, siguiente, guardada,
+                                    puede_guardar, x_aparicion)
+        if jugada is None:
+            return False
+
+        self.jugadas += 1
+        self.columnas_plan = columnas
+        if jugada.guardar:
+            # Después de guardar la pieza cambia: se vuelve a planificar
+            self.plan.append(ACCION_GUARDAR)
+            self.esperada = pieza
+            return True
+
+        destino = (jugada.rotacion, jugada.x, jugada.y)
+        acciones = buscar_camino(columnas, pieza[0], pieza[1:], destino)
+        if acciones is None:
+            return False
+        self.plan.extend(acciones)
+        self.objetivo = (pieza[0],) + destino
+        self.esperada = pieza
+        return True
+
+    def _seguir_plan(self, columnas, pieza):
+        """Ajusta el plan si la gravedad movió la pieza; False si hay que replanificar"""
+        if not self.plan or columnas != self.columnas_plan:
+            return False  # Sin plan o se fijó una pieza
+        if pieza == self.esperada:
+            return True
+        if self.objetivo is None or pieza[0] != self.objetivo[0]:
+            return False
+
+        # La gravedad bajó la pieza: camino nuevo hasta el mismo destino
+        acciones = buscar_camino(columnas, pieza[0], pieza[1:], self.objetivo[1:])
+        if acciones is None:
+            return False
+        self.plan = deque(acciones)
+        self.esperada = pieza
+        return True
+
+    def siguiente_accion(self, columnas, pieza, siguiente=None, guardada=None,
+                         puede_guardar=False, x_aparicion=X_APARICION):
+        """
+        Acción que toca ahora (llamar una vez por cuadro con el estado actual).
+
+        Args:
+            Los mismos que elegir_jugada()
+
+        Returns:
+            int: ACCION_* o None si no hay nada que hacer
+        """
+        if not self._seguir_plan(columnas, pieza):
+            if not self.planificar(columnas, pieza, siguiente, guardada,
+                                   puede_guardar, x_aparicion):
+                return None
+
+        accion = self.plan.popleft()
+        tipo, rotacion, x, y = pieza
+        if accion == ACCION_ROTAR:
+            self.esperada = (tipo, (rotacion + 1) % len(FORMAS_COMPILADAS[tipo]), x, y)
+        elif accion == ACCION_IZQUIERDA:
+            self.esperada = (tipo, rotacion, x - 1, y)
+        elif accion == ACCION_DERECHA:
+            self.esperada = (tipo, rotacion, x + 1, y)
+        elif accion == ACCION_BAJAR:
+            self.esperada = (tipo, rotacion, x, y + 1)
+        else:
+            self._reiniciar_plan()  # Caída rápida o guardar: la pieza cambia
+        return accion
+
+    def accion_para_motor(self, motor):
+        """siguiente_accion() para la pieza actual de un MotorTetris (sin hold)"""
+        if not motor.puede_actuar():
+            return None
+        pieza = motor.pieza_actual
+        siguiente = motor.siguiente_pieza['tipo'] if motor.siguiente_pieza else None
+        return self.siguiente_accion(
+            mascaras_columnas(motor.tablero),
+            (pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y']),
+            siguiente,
+        )
+
+    def cerrar(self):
+        """Libera los recursos del jugador (este no usa ninguno)"""
+
+# =============================================
+# PARTIDAS SIN INTERFAZ
+# =============================================
+
+def jugar_partida_automatica(motor, maximo_piezas=None, jugador=None):
+    """
+    Juega con un MotorTetris hasta el final sin gravedad (pruebas de resistencia).
+
+    Args:
+        motor (MotorTetris): Partida a jugar
+        maximo_piezas (int): Tope de piezas (None = hasta perder)
+        jugador (JugadorAutomatico): Jugador a usar (por defecto, uno nuevo)
+
+    Returns:
+        int: Piezas colocadas
+    """
+    if jugador is None:
+        jugador = JugadorAutomatico()
+    metodos = {accion: getattr(motor, nombre) for accion, nombre in METODOS_ACCIONES.items()}
+
+    piezas = 0
+    while motor.puede_actuar() and (maximo_piezas is None or piezas < maximo_piezas):
+        accion = jugador.accion_para_motor(motor)
+        if accion is None:
+            break
+        metodos[accion]()
+        if accion == ACCION_CAIDA_RAPIDA:
+            piezas += 1
+    return piezas
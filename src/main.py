@@ -1,28 +1,37 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
-import json
+import os
 import time
 
+from motor_tetris import (
+    ANCHO_TABLERO, ALTO_TABLERO, CUADROS_POR_SEGUNDO, FORMAS_COMPILADAS, MotorTetris
+)
+from renderizador import RenderizadorTablero
+from planificador_ticks import PlanificadorTicks
+from reloj_simulacion import RelojSimulacion
+from historial import HistorialPartidas
+from almacen_sqlite import AlmacenSQLite
+from persistencia import DatosCorruptos
+from cache_record import CacheRecord
+from escritor_segundo_plano import EscritorEnSegundoPlano, INTERVALO_SONDEO_MS
+from jugador_automatico import JugadorAutomatico
+from planificador_haz import JugadorHaz
+from panel_informacion import PanelInformacion
+from perfil_cuadros import (
+    INTERVALO_SUPERPOSICION_MS, MedidorCuadros, OverlayRendimiento, guardar_csv
+)
+from repeticion import (
+    ACCION_IZQUIERDA, ACCION_DERECHA, ACCION_ROTAR, ACCION_BAJAR, ACCION_CAIDA_RAPIDA,
+    GrabadorRepeticion, guardar_repeticion, nueva_semilla
+)
+
 # =============================================
 # CONFIGURACIÓN DEL JUEGO - VERSIÓN 4
 # =============================================
 
-# Constantes del tablero
-ANCHO_TABLERO = 10
-ALTO_TABLERO = 20
+# Tamaño de cada celda en píxeles
 TAMANO_BLOQUE = 30
 
-# Sistema de puntuación mejorado
-PUNTOS_POR_LINEA = 100
-BONUS_NIVEL = 50
-BONUS_CAIDA_RAPIDA = 1
-
-# Velocidades por nivel
-VELOCIDAD_BASE = 500
-VELOCIDAD_MINIMA = 100
-REDUCCION_VELOCIDAD = 40
-
 # Colores mejorados
 COLORES = [
     "#1a1a1a",  # 0 - Vacío (negro)
@@ -39,211 +48,138 @@ COLORES = [
 COLOR_FONDO = "#1a1a1a"
 COLOR_CUADRICULA = "#404040"
 
-# Formas de las piezas (todas las 7 piezas clásicas)
-FORMAS_PIEZAS = [
-    [], # 0. Vacío
-    
-    # Pieza I
-    [
-        [[0,0,0,0], 
-         [1,1,1,1], 
-         [0,0,0,0], 
-         [0,0,0,0]],
-        [[0,1,0,0], 
-         [0,1,0,0], 
-         [0,1,0,0], 
-         [0,1,0,0]]
-    ],
-    
-    # Pieza O
-    [
-        [[2,2], 
-         [2,2]]
-    ],
-    
-    # Pieza T
-    [
-        [[0,3,0], 
-         [3,3,3], 
-         [0,0,0]],
-        [[0,3,0], 
-         [0,3,3], 
-         [0,3,0]],
-        [[0,0,0], 
-         [3,3,3], 
-         [0,3,0]],
-        [[0,3,0], 
-         [3,3,0], 
-         [0,3,0]]
-    ],
-    
-    # Pieza S
-    [
-        [[0,4,4], 
-         [4,4,0], 
-         [0,0,0]],
-        [[0,4,0], 
-         [0,4,4], 
-         [0,0,4]]
-    ],
-    
-    # Pieza Z
-    [
-        [[5,5,0], 
-         [0,5,5], 
-         [0,0,0]],
-        [[0,0,5], 
-         [0,5,5], 
-         [0,5,0]]
-    ],
-    
-    # Pieza J
-    [
-        [[6,0,0], 
-         [6,6,6], 
-         [0,0,0]],
-        [[0,6,6], 
-         [0,6,0], 
-         [0,6,0]],
-        [[0,0,0], 
-         [6,6,6], 
-         [0,0,6]],
-        [[0,6,0], 
-         [0,6,0], 
-         [6,6,0]]
-    ],
-    
-    # Pieza L
-    [
-        [[0,0,7], 
-         [7,7,7], 
-         [0,0,0]],
-        [[0,7,0], 
-         [0,7,0], 
-         [0,7,7]],
-        [[0,0,0], 
-         [7,7,7], 
-         [7,0,0]],
-        [[7,7,0], 
-         [0,7,0], 
-         [0,7,0]]
-    ]
-]
-
 # Archivos de datos
 ARCHIVO_RECORD = "tetris_record.json"
-ARCHIVO_HISTORIAL = "tetris_historial.json"
+ARCHIVO_HISTORIAL = "tetris_historial.json"  # Formato anterior (se importa)
+NOMBRE_HISTORIAL = "tetris_historial"          # Segmentos .jsonl e índice
+ARCHIVO_BASE_DATOS = "tetris.db"
+
+# Dónde se guardan las partidas: "jsonl" (historial.py) o "sqlite"
+# (almacen_sqlite.py, para clasificaciones con muchas partidas)
+ALMACEN_PARTIDAS = "jsonl"
+
+# Jugador con el que se guardan las partidas
+JUGADOR = os.environ.get("USER") or os.environ.get("USERNAME", "")
+ARCHIVO_REPETICION = "tetris_ultima_repeticion.ttr"
+
+# Jugador automático de la tecla A: "heuristico" (mira la siguiente pieza)
+# o "haz" (planificador_haz.py, varias piezas con tiempo limitado por jugada)
+TIPO_JUGADOR_AUTOMATICO = "heuristico"
+
+# Medición del tiempo de cada cuadro (tecla F la muestra, C la exporta)
+MEDIR_CUADROS = True
+ARCHIVO_PERFIL = "tetris_perfil_cuadros.csv"
+
+# Acción de repetición que corresponde a cada tecla de juego
+ACCIONES_TECLAS = {
+    'Left': ACCION_IZQUIERDA,
+    'Right': ACCION_DERECHA,
+    'Up': ACCION_ROTAR,
+    'Down': ACCION_BAJAR,
+    'space': ACCION_CAIDA_RAPIDA,
+}
 
 # =============================================
 # VARIABLES GLOBALES DEL JUEGO
 # =============================================
 
-# Estado del juego
-tablero = []
-pieza_actual = None
-siguiente_pieza = None
+# Motor con el tablero, las piezas y las estadísticas de la partida
+motor = None
+
+# Grabador de la repetición de la partida en curso
+grabador = None
+
+# Jugador automático (tecla A); None = juega la persona
+jugador_automatico = None
+
+# Historial de partidas (HistorialPartidas o AlmacenSQLite)
+historial = None
+
+# Hilo que guarda los datos sin bloquear la interfaz
+escritor = None
+
+# Récord en memoria (el archivo se lee una vez y se escribe al terminar)
+cache_record = None
+
+# Tiempos de los últimos cuadros (perfil_cuadros.py); None si no se miden
+medidor = None
+
+# Estado de la sesión
 juego_activo = False
 juego_pausado = False
-juego_terminado = False
-
-# Estadísticas
-puntuacion = 0
-nivel = 1
-lineas_completadas = 0
-record = 0
 tiempo_inicio = 0
 
 # Elementos de interfaz
 ventana = None
+planificador = None
+planificador_escrituras = None
+reloj = None
 lienzo = None
+renderizador = None
+superposicion = None
+planificador_superposicion = None
 lienzo_siguiente = None
 etiqueta_puntuacion = None
 etiqueta_nivel = None
 etiqueta_lineas = None
 etiqueta_record = None
 etiqueta_tiempo = None
+panel = None
 
 # =============================================
 # FUNCIONES DE PERSISTENCIA DE DATOS - MEJORADAS
 # =============================================
 
-def cargar_datos_desde_archivo(nombre_archivo):
-    """Carga datos desde un archivo JSON"""
-    try:
-        with open(nombre_archivo, 'r') as archivo:
-            datos = json.load(archivo)
-        return datos
-    except FileNotFoundError:
-        # Si el archivo no existe, devolver datos vacíos
-        return {}
-    except json.JSONDecodeError:
-        messagebox.showerror("Error", f"El archivo {nombre_archivo} está corrupto")
-        return {}
-
-def guardar_datos_en_archivo(nombre_archivo, datos):
-    """Guarda datos en un archivo JSON"""
-    try:
-        with open(nombre_archivo, 'w') as archivo:
-            json.dump(datos, archivo)
-        return True
-    except Exception as error:
-        messagebox.showerror("Error", f"No se pudo guardar: {error}")
-        return False
+def abrir_almacen_partidas():
+    """Abre el almacén de partidas elegido en ALMACEN_PARTIDAS"""
+    historial_jsonl = HistorialPartidas(NOMBRE_HISTORIAL, archivo_antiguo=ARCHIVO_HISTORIAL)
+    if ALMACEN_PARTIDAS != "sqlite":
+        return historial_jsonl
+
+    almacen = AlmacenSQLite(ARCHIVO_BASE_DATOS)
+    if len(almacen) == 0:
+        # Primera vez con SQLite: importar el historial existente
+        almacen.importar(historial_jsonl.todas())
+    return almacen
 
 def cargar_record():
-    """Carga el récord desde el archivo"""
-    global record
-    datos = cargar_datos_desde_archivo(ARCHIVO_RECORD)
-    record = datos.get('record', 0)
-    return record
+    """Toma el récord de la caché (o el mejor del historial si es mayor)"""
+    motor.record = max(cache_record.obtener(), historial.record())
+    return motor.record
 
 def guardar_record():
-    """Guarda el récord actual"""
-    datos = {'record': record}
-    return guardar_datos_en_archivo(ARCHIVO_RECORD, datos)
+    """Anota el récord actual y lo escribe en el hilo escritor si cambió"""
+    if cache_record.actualizar(motor.record):
+        escritor.encolar(cache_record.guardar, al_terminar=informar_escritura)
 
-def guardar_partida_en_historial():
-    """Guarda la partida actual en el historial"""
-    if puntuacion == 0:
+def guardar_partida_en_historial(motor_terminado=None):
+    """Añade la partida actual al final del historial"""
+    if motor.puntuacion == 0:
         return  # No guardar partidas con 0 puntos
     
-    # Cargar historial existente
-    historial = cargar_datos_desde_archivo(ARCHIVO_HISTORIAL)
-    
-    # Crear lista de partidas si no existe
-    if 'partidas' not in historial:
-        historial['partidas'] = []
-    
     # Crear datos de la partida
     partida = {
         'fecha': time.strftime("%Y-%m-%d %H:%M:%S"),
-        'puntuacion': puntuacion,
-        'nivel': nivel,
-        'lineas': lineas_completadas,
+        'jugador': JUGADOR,
+        'puntuacion': motor.puntuacion,
+        'nivel': motor.nivel,
+        'lineas': motor.lineas_completadas,
         'tiempo': time.time() - tiempo_inicio
     }
     
-    # Agregar partida al historial
-    historial['partidas'].append(partida)
-    
-    # Mantener solo las últimas 10 partidas
-    if len(historial['partidas']) > 10:
-        historial['partidas'] = historial['partidas'][-10:]
-    
-    # Guardar historial
-    guardar_datos_en_archivo(ARCHIVO_HISTORIAL, historial)
+    # Agregar partida en el hilo escritor (sin reescribir el historial existente)
+    escritor.encolar(historial.agregar, partida, al_terminar=informar_escritura)
 
 def mostrar_historial():
     """Muestra el historial de partidas"""
-    historial = cargar_datos_desde_archivo(ARCHIVO_HISTORIAL)
-    
-    if 'partidas' not in historial or not historial['partidas']:
+    escritor.vaciar()  # Incluir la última partida si aún se estaba guardando
+    if len(historial) == 0:
         messagebox.showinfo("Historial", "No hay partidas guardadas aún.")
         return
     
     # Crear texto del historial
-    texto_historial = "ÚLTIMAS PARTIDAS:\n\n"
-    for partida in reversed(historial['partidas']):
+    texto_historial = f"ÚLTIMAS PARTIDAS (de {len(historial)}):\n\n"
+    for partida in historial.ultimas(10):
         minutos = int(partida['tiempo']) // 60
         segundos = int(partida['tiempo']) % 60
         texto_historial += f"Puntos: {partida['puntuacion']} | Nivel: {partida['nivel']}\n"
@@ -251,455 +187,282 @@ def mostrar_historial():
         texto_historial += f"Fecha: {partida['fecha']}\n"
         texto_historial += "-" * 30 + "\n"
     
-    messagebox.showinfo("Historial de Partidas", texto_historial)
-
-# =============================================
-# FUNCIONES DE LÓGICA DEL JUEGO - MEJORADAS
-# =============================================
-
-def crear_tablero_vacio():
-    """Crea un tablero vacío para empezar el juego"""
-    tablero_nuevo = []
-    for fila in range(ALTO_TABLERO):
-        fila_nueva = []
-        for columna in range(ANCHO_TABLERO):
-            fila_nueva.append(0)  # 0 representa vacío
-        tablero_nuevo.append(fila_nueva)
-    return tablero_nuevo
-
-def generar_pieza_aleatoria():
-    """Genera una nueva pieza aleatoria"""
-    tipo_pieza = random.randint(1, 7)  # Del 1 al 7 (todas las piezas)
-    return {
-        'tipo': tipo_pieza,
-        'rotacion': 0,
-        'x': ANCHO_TABLERO // 2 - 1,  # Posición centrada
-        'y': 0  # Empieza en la parte superior
-    }
-
-def obtener_forma_actual():
-    """Obtiene la forma de la pieza actual"""
-    if pieza_actual is None:
-        return []
-    
-    tipo = pieza_actual['tipo']
-    rotacion = pieza_actual['rotacion']
-    return FORMAS_PIEZAS[tipo][rotacion]
-
-def verificar_colision(forma, pos_x, pos_y):
-    """Verifica si la pieza colisiona con paredes, suelo u otras piezas"""
-    for fila in range(len(forma)):
-        for columna in range(len(forma[fila])):
-            # Solo verificar celdas que no están vacías
-            if forma[fila][columna] != 0:
-                tablero_x = pos_x + columna
-                tablero_y = pos_y + fila
-                
-                # Verificar paredes izquierda y derecha
-                if tablero_x < 0 or tablero_x >= ANCHO_TABLERO:
-                    return True
-                
-                # Verificar suelo
-                if tablero_y >= ALTO_TABLERO:
-                    return True
-                
-                # Verificar otras piezas (solo si está dentro del tablero)
-                if tablero_y >= 0 and tablero[tablero_y][tablero_x] != 0:
-                    return True
-                    
-    return False
-
-def fijar_pieza_actual():
-    """Fija la pieza actual en el tablero"""
-    global tablero
-    
-    if pieza_actual is None:
-        return
-        
-    forma = obtener_forma_actual()
-    tipo_pieza = pieza_actual['tipo']
-    
-    for fila in range(len(forma)):
-        for columna in range(len(forma[fila])):
-            if forma[fila][columna] != 0:
-                pos_y = pieza_actual['y'] + fila
-                pos_x = pieza_actual['x'] + columna
-                
-                # Solo fijar si está dentro del tablero visible
-                if pos_y >= 0:
-                    tablero[pos_y][pos_x] = tipo_pieza
-
-def encontrar_lineas_completas():
-    """Encuentra y elimina líneas completas, devuelve cuántas eliminó"""
-    global tablero, lineas_completadas
-    
-    lineas_eliminadas = 0
-    fila_actual = ALTO_TABLERO - 1  # Empezar desde abajo
-    
-    while fila_actual >= 0:
-        # Verificar si toda la fila está llena
-        fila_completa = True
-        for columna in range(ANCHO_TABLERO):
-            if tablero[fila_actual][columna] == 0:
-                fila_completa = False
-                break
-                
-        if fila_completa:
-            # Eliminar la fila completa
-            tablero.pop(fila_actual)
-            # Añadir nueva fila vacía al principio
-            tablero.insert(0, [0 for _ in range(ANCHO_TABLERO)])
-            lineas_eliminadas += 1
-            lineas_completadas += 1
-        else:
-            fila_actual -= 1
-            
-    return lineas_eliminadas
-
-def calcular_puntuacion_lineas(cantidad_lineas):
-    """Calcula la puntuación ganada por limpiar líneas"""
-    if cantidad_lineas == 0:
-        return 0
-        
-    # Sistema de puntuación clásico de Tetris
-    if cantidad_lineas == 1:
-        return 100 * nivel
-    elif cantidad_lineas == 2:
-        return 300 * nivel
-    elif cantidad_lineas == 3:
-        return 500 * nivel
-    elif cantidad_lineas == 4:
-        return 800 * nivel
-    else:
-        return cantidad_lineas * 100 * nivel
-
-def actualizar_estadisticas(lineas_limpiadas):
-    """Actualiza puntuación, nivel y récord"""
-    global puntuacion, nivel, record
-    
-    if lineas_limpiadas > 0:
-        # Sumar puntos por líneas
-        puntuacion += calcular_puntuacion_lineas(lineas_limpiadas)
-        
-        # Actualizar nivel cada 5 líneas
-        nuevo_nivel = (lineas_completadas // 5) + 1
-        if nuevo_nivel > nivel:
-            nivel = nuevo_nivel
-            
-        # Actualizar récord si es necesario
-        if puntuacion > record:
-            record = puntuacion
-            
-    # Actualizar la interfaz
-    actualizar_panel_informacion()
-
-def crear_siguiente_pieza():
-    """Crea la siguiente pieza y verifica fin del juego"""
-    global pieza_actual, siguiente_pieza, juego_terminado
-    
-    # Mover siguiente pieza a actual
-    pieza_actual = siguiente_pieza
-    siguiente_pieza = generar_pieza_aleatoria()
+    texto_historial += "\nMEJORES PARTIDAS:\n"
+    for posicion, partida in enumerate(historial.mejores(3), start=1):
+        texto_historial += f"{posicion}. {partida['puntuacion']} puntos ({partida['fecha']})\n"
     
-    # Verificar si el juego debe terminar
-    forma = obtener_forma_actual()
-    if verificar_colision(forma, pieza_actual['x'], pieza_actual['y']):
-        juego_terminado = True
-        guardar_partida_en_historial()
+    messagebox.showinfo("Historial de Partidas", texto_historial)
 
-def calcular_velocidad_actual():
-    """Calcula la velocidad basada en el nivel"""
-    velocidad = VELOCIDAD_BASE - ((nivel - 1) * REDUCCION_VELOCIDAD)
-    if velocidad < VELOCIDAD_MINIMA:
-        return VELOCIDAD_MINIMA
-    return velocidad
+def terminar_partida(motor_terminado):
+    """Guarda el historial y la repetición al terminar la partida (sin bloquear)"""
+    guardar_partida_en_historial(motor_terminado)
+    guardar_record()
+    datos_repeticion = grabador.finalizar(motor_terminado)
+    escritor.encolar(guardar_repeticion, ARCHIVO_REPETICION, datos_repeticion,
+                     al_terminar=informar_escritura)
+
+def informar_escritura(resultado, error):
+    """Aviso de una escritura en segundo plano (se ejecuta en el hilo de Tk)"""
+    if error is not None or resultado is False:
+        messagebox.showerror("Error", f"No se pudieron guardar los datos: {error or 'ver consola'}")
+
+def revisar_escrituras():
+    """Procesa los avisos del hilo escritor y vuelve a revisar más tarde"""
+    escritor.procesar_completadas()
+    planificador_escrituras.programar(INTERVALO_SONDEO_MS)
+
+def cerrar_aplicacion():
+    """Termina las escrituras pendientes y cierra la ventana"""
+    planificador.cancelar()
+    planificador_escrituras.cancelar()
+    planificador_superposicion.cancelar()
+    if jugador_automatico is not None:
+        jugador_automatico.cerrar()
+    escritor.cerrar()
+    cache_record.guardar()
+    historial.cerrar()
+    ventana.destroy()
 
 # =============================================
 # FUNCIONES DE CONTROL - MANTENIENDO SIMPLICIDAD
 # =============================================
 
 def mover_pieza_abajo():
-    """Mueve la pieza actual hacia abajo (gravedad)"""
-    global pieza_actual
-    
-    if pieza_actual is None or juego_terminado or juego_pausado:
-        return False
-        
-    nueva_y = pieza_actual['y'] + 1
-    forma = obtener_forma_actual()
-    
-    if verificar_colision(forma, pieza_actual['x'], nueva_y):
-        # No se puede mover más, fijar pieza
-        fijar_pieza_actual()
-        lineas_limpiadas = encontrar_lineas_completas()
-        actualizar_estadisticas(lineas_limpiadas)
-        crear_siguiente_pieza()
+    """Baja la pieza actual una fila (la gravedad vuelve a contar desde aquí)"""
+    if juego_pausado:
         return False
-    else:
-        # Se puede mover, actualizar posición
-        pieza_actual['y'] = nueva_y
-        return True
+
+    se_movio = motor.caida_suave()
+    if not se_movio:
+        # La pieza se fijó: puede haber cambiado la puntuación
+        actualizar_panel_informacion()
+    return se_movio
 
 def mover_izquierda():
     """Mueve la pieza actual hacia la izquierda"""
-    if pieza_actual is None or juego_terminado or juego_pausado:
+    if juego_pausado:
         return
-        
-    nueva_x = pieza_actual['x'] - 1
-    forma = obtener_forma_actual()
-    
-    if not verificar_colision(forma, nueva_x, pieza_actual['y']):
-        pieza_actual['x'] = nueva_x
+    motor.mover_izquierda()
 
 def mover_derecha():
     """Mueve la pieza actual hacia la derecha"""
-    if pieza_actual is None or juego_terminado or juego_pausado:
+    if juego_pausado:
         return
-        
-    nueva_x = pieza_actual['x'] + 1
-    forma = obtener_forma_actual()
-    
-    if not verificar_colision(forma, nueva_x, pieza_actual['y']):
-        pieza_actual['x'] = nueva_x
+    motor.mover_derecha()
 
 def rotar_pieza():
     """Rota la pieza actual si es posible"""
-    if pieza_actual is None or juego_terminado or juego_pausado:
+    if juego_pausado:
         return
-        
-    tipo_pieza = pieza_actual['tipo']
-    rotaciones_posibles = len(FORMAS_PIEZAS[tipo_pieza])
-    
-    # Calcular nueva rotación
-    nueva_rotacion = (pieza_actual['rotacion'] + 1) % rotaciones_posibles
-    
-    # Guardar rotación original por si hay colisión
-    rotacion_original = pieza_actual['rotacion']
-    pieza_actual['rotacion'] = nueva_rotacion
-    
-    forma_nueva = obtener_forma_actual()
-    
-    # Si hay colisión, revertir la rotación
-    if verificar_colision(forma_nueva, pieza_actual['x'], pieza_actual['y']):
-        pieza_actual['rotacion'] = rotacion_original
+    motor.rotar_pieza()
 
 def caida_rapida():
     """Acelera la caída de la pieza actual"""
-    global puntuacion
-    
-    if pieza_actual is None or juego_terminado or juego_pausado:
+    if juego_pausado or not motor.puede_actuar():
         return
-        
-    # Mover hacia abajo hasta que colisione
-    while True:
-        nueva_y = pieza_actual['y'] + 1
-        forma = obtener_forma_actual()
-        
-        if verificar_colision(forma, pieza_actual['x'], nueva_y):
-            break
-        else:
-            pieza_actual['y'] = nueva_y
-            # Bonus de puntos por caída rápida
-            puntuacion += BONUS_CAIDA_RAPIDA
-            
-    # Fijar la pieza y continuar
-    fijar_pieza_actual()
-    lineas_limpiadas = encontrar_lineas_completas()
-    actualizar_estadisticas(lineas_limpiadas)
-    crear_siguiente_pieza()
+    motor.caida_rapida()
+    actualizar_panel_informacion()
+
+# Función de la interfaz para cada acción del jugador automático
+FUNCIONES_ACCIONES = {
+    ACCION_IZQUIERDA: mover_izquierda,
+    ACCION_DERECHA: mover_derecha,
+    ACCION_ROTAR: rotar_pieza,
+    ACCION_BAJAR: mover_pieza_abajo,
+    ACCION_CAIDA_RAPIDA: caida_rapida,
+}
+
+def alternar_jugador_automatico():
+    """Activa o desactiva el jugador automático"""
+    global jugador_automatico
+    if jugador_automatico is not None:
+        jugador_automatico.cerrar()
+        jugador_automatico = None
+    elif TIPO_JUGADOR_AUTOMATICO == "haz":
+        jugador_automatico = JugadorHaz()
+    else:
+        jugador_automatico = JugadorAutomatico()
+
+def jugar_automaticamente():
+    """Hace la acción que toque del jugador automático (una por cuadro dibujado)"""
+    accion = jugador_automatico.accion_para_motor(motor)
+    if accion is None:
+        return
+    grabador.registrar(motor.cuadro, accion)  # Se graba como una tecla
+    FUNCIONES_ACCIONES[accion]()
 
 def pausar_juego():
     """Pausa o reanuda el juego"""
     global juego_pausado
-    
-    if juego_terminado:
+
+    if motor.juego_terminado:
         return
-        
+
     juego_pausado = not juego_pausado
-    
+
     if juego_pausado:
+        planificador.cancelar()
         mostrar_mensaje("JUEGO EN PAUSA", "yellow")
     else:
         dibujar_juego()
+        reloj.reanudar()  # No recuperar el tiempo que estuvo en pausa
+        planificador.programar(reloj.intervalo_dibujo_ms())
 
 def reiniciar_juego():
     """Reinicia completamente el juego"""
-    global tablero, pieza_actual, siguiente_pieza
-    global juego_activo, juego_pausado, juego_terminado
-    global puntuacion, nivel, lineas_completadas, tiempo_inicio
-    
-    # Reiniciar estado del juego
-    tablero = crear_tablero_vacio()
-    pieza_actual = generar_pieza_aleatoria()
-    siguiente_pieza = generar_pieza_aleatoria()
-    
+    global juego_activo, juego_pausado, tiempo_inicio, grabador
+
+    # Reiniciar estado del juego con una semilla nueva (para la repetición)
+    semilla = nueva_semilla()
+    motor.reiniciar(semilla)
+    grabador = GrabadorRepeticion(semilla)
+
     juego_activo = True
     juego_pausado = False
-    juego_terminado = False
-    
-    puntuacion = 0
-    nivel = 1
-    lineas_completadas = 0
     tiempo_inicio = time.time()
-    
+
     # Cargar récord
     cargar_record()
-    
+
     # Actualizar interfaz
     actualizar_panel_informacion()
     dibujar_juego()
     dibujar_siguiente_pieza()
+    
+    # Volver a empezar la simulación (sin duplicar el bucle)
+    reloj.reiniciar()
+    planificador.programar(reloj.intervalo_dibujo_ms())
 
 # =============================================
 # FUNCIONES DE INTERFAZ - MEJORADAS
 # =============================================
 
 def dibujar_tablero():
-    """Dibuja todas las piezas fijadas en el tablero"""
-    for fila in range(ALTO_TABLERO):
-        for columna in range(ANCHO_TABLERO):
-            tipo_pieza = tablero[fila][columna]
-            if tipo_pieza != 0:
-                color = COLORES[tipo_pieza]
-                x1 = columna * TAMANO_BLOQUE
-                y1 = fila * TAMANO_BLOQUE
-                x2 = x1 + TAMANO_BLOQUE
-                y2 = y1 + TAMANO_BLOQUE
-                
-                lienzo.create_rectangle(x1, y1, x2, y2, fill=color, outline=COLOR_CUADRICULA)
-
-def dibujar_pieza_actual():
-    """Dibuja la pieza actual que está cayendo"""
-    if pieza_actual is None:
-        return
-        
-    forma = obtener_forma_actual()
-    color = COLORES[pieza_actual['tipo']]
-    
-    for fila in range(len(forma)):
-        for columna in range(len(forma[fila])):
-            if forma[fila][columna] != 0:
-                x = (pieza_actual['x'] + columna) * TAMANO_BLOQUE
-                y = (pieza_actual['y'] + fila) * TAMANO_BLOQUE
-                
-                # Solo dibujar si está en el área visible
-                if y >= 0:
-                    x1 = x
-                    y1 = y
-                    x2 = x + TAMANO_BLOQUE
-                    y2 = y + TAMANO_BLOQUE
-                    
-                    lienzo.create_rectangle(x1, y1, x2, y2, fill=color, outline="white")
-
-def dibujar_cuadricula():
-    """Dibuja la cuadrícula del tablero"""
-    ancho_lienzo = ANCHO_TABLERO * TAMANO_BLOQUE
-    alto_lienzo = ALTO_TABLERO * TAMANO_BLOQUE
-    
-    # Líneas verticales
-    for x in range(0, ancho_lienzo + 1, TAMANO_BLOQUE):
-        lienzo.create_line(x, 0, x, alto_lienzo, fill=COLOR_CUADRICULA)
-    
-    # Líneas horizontales
-    for y in range(0, alto_lienzo + 1, TAMANO_BLOQUE):
-        lienzo.create_line(0, y, ancho_lienzo, y, fill=COLOR_CUADRICULA)
+    """Redibuja solo las celdas y la pieza que el motor marcó como cambiadas"""
+    pieza_actual = motor.pieza_actual
+    tipo_pieza = pieza_actual['tipo'] if pieza_actual is not None else None
+    renderizador.aplicar_cambios(motor.tomar_cambios(), motor.tablero.filas, tipo_pieza)
 
 def dibujar_siguiente_pieza():
     """Dibuja la siguiente pieza en el panel lateral"""
+    siguiente_pieza = motor.siguiente_pieza
     if lienzo_siguiente is None or siguiente_pieza is None:
         return
         
     # Limpiar el lienzo de siguiente pieza
     lienzo_siguiente.delete("all")
     
-    forma = FORMAS_PIEZAS[siguiente_pieza['tipo']][0]  # Primera rotación
+    forma = FORMAS_COMPILADAS[siguiente_pieza['tipo']][0]  # Primera rotación
     color = COLORES[siguiente_pieza['tipo']]
     
-    # Centrar la pieza en el lienzo pequeño
-    ancho_forma = len(forma[0])
-    alto_forma = len(forma)
-    
+    # Centrar la matriz de la pieza en el lienzo pequeño
     tamano_mini_bloque = 20
-    offset_x = (80 - ancho_forma * tamano_mini_bloque) // 2
-    offset_y = (80 - alto_forma * tamano_mini_bloque) // 2
-    
-    for fila in range(alto_forma):
-        for columna in range(ancho_forma):
-            if forma[fila][columna] != 0:
-                x1 = offset_x + columna * tamano_mini_bloque
-                y1 = offset_y + fila * tamano_mini_bloque
-                x2 = x1 + tamano_mini_bloque
-                y2 = y1 + tamano_mini_bloque
-                
-                lienzo_siguiente.create_rectangle(x1, y1, x2, y2, fill=color, outline="white")
+    offset_x = (80 - forma.lado * tamano_mini_bloque) // 2
+    offset_y = (80 - forma.lado * tamano_mini_bloque) // 2
+    
+    for columna, fila in forma.celdas:
+        x1 = offset_x + columna * tamano_mini_bloque
+        y1 = offset_y + fila * tamano_mini_bloque
+        x2 = x1 + tamano_mini_bloque
+        y2 = y1 + tamano_mini_bloque
+        
+        lienzo_siguiente.create_rectangle(x1, y1, x2, y2, fill=color, outline="white")
 
 def dibujar_juego():
     """Dibuja todo el juego en el lienzo principal"""
-    lienzo.delete("all")
     dibujar_tablero()
-    dibujar_pieza_actual()
-    dibujar_cuadricula()
     
     # Mostrar mensajes si es necesario
     if juego_pausado:
         mostrar_mensaje("JUEGO EN PAUSA", "yellow")
-    elif juego_terminado:
+    elif motor.juego_terminado:
         mostrar_mensaje("GAME OVER", "red")
+    else:
+        renderizador.ocultar_mensaje()
 
 def mostrar_mensaje(texto, color):
     """Muestra un mensaje en el centro del lienzo"""
-    ancho = ANCHO_TABLERO * TAMANO_BLOQUE
-    alto = ALTO_TABLERO * TAMANO_BLOQUE
-    
-    # Fondo semitransparente
-    lienzo.create_rectangle(
-        ancho * 0.1, alto * 0.4,
-        ancho * 0.9, alto * 0.6,
-        fill="black", outline=color, width=2
-    )
-    
-    # Texto del mensaje
-    lienzo.create_text(
-        ancho // 2, alto // 2,
-        text=texto,
-        font=("Arial", 24, "bold"),
-        fill=color
-    )
+    renderizador.mostrar_mensaje(texto, color)
 
 def actualizar_panel_informacion():
-    """Actualiza todas las etiquetas del panel lateral"""
-    if etiqueta_puntuacion:
-        etiqueta_puntuacion.config(text=f"Puntuación: {puntuacion}")
-        
-    if etiqueta_nivel:
-        etiqueta_nivel.config(text=f"Nivel: {nivel}")
-        
-    if etiqueta_lineas:
-        etiqueta_lineas.config(text=f"Líneas: {lineas_completadas}")
-        
-    if etiqueta_record:
-        etiqueta_record.config(text=f"Récord: {record}")
-        
-    if etiqueta_tiempo and juego_activo and not juego_terminado:
+    """Actualiza las etiquetas del panel lateral cuyo texto cambió"""
+    if panel is None:
+        return
+    
+    panel.mostrar("puntuacion", f"Puntuación: {motor.puntuacion}")
+    panel.mostrar("nivel", f"Nivel: {motor.nivel}")
+    panel.mostrar("lineas", f"Líneas: {motor.lineas_completadas}")
+    panel.mostrar("record", f"Récord: {motor.record}")
+    
+    # El texto del reloj solo cambia una vez por segundo
+    if juego_activo and not motor.juego_terminado:
         tiempo_transcurrido = int(time.time() - tiempo_inicio)
         minutos = tiempo_transcurrido // 60
         segundos = tiempo_transcurrido % 60
-        etiqueta_tiempo.config(text=f"Tiempo: {minutos:02d}:{segundos:02d}")
+        panel.mostrar("tiempo", f"Tiempo: {minutos:02d}:{segundos:02d}")
 
 # =============================================
 # BUCLE PRINCIPAL DEL JUEGO
 # =============================================
 
 def bucle_principal():
-    """Bucle principal que controla el juego"""
-    if juego_activo and not juego_pausado and not juego_terminado:
-        mover_pieza_abajo()
+    """
+    Bucle principal que controla el juego.
+    
+    Se ejecuta a la cadencia de dibujo; la gravedad avanza por cuadros de
+    simulación de paso fijo, tantos como indique el reloj monotónico.
+    """
+    if juego_activo and not juego_pausado and not motor.juego_terminado:
+        if jugador_automatico is not None:
+            jugar_automaticamente()
+        segundo_anterior = motor.cuadro // CUADROS_POR_SEGUNDO
+        # La gravedad no se graba: la repetición la vuelve a simular a
+        # partir del número de cuadro de cada acción
+        pieza_fijada = motor.avanzar_cuadros(reloj.avanzar())
+        
         dibujar_juego()
-        actualizar_panel_informacion()
+        if pieza_fijada or motor.cuadro // CUADROS_POR_SEGUNDO != segundo_anterior:
+            actualizar_panel_informacion()
     
-    # Programar siguiente iteración
-    velocidad = calcular_velocidad_actual()
-    ventana.after(velocidad, bucle_principal)
+    # Programar siguiente dibujo (se detiene en pausa y game over)
+    if juego_activo and not juego_pausado and not motor.juego_terminado:
+        planificador.programar(reloj.intervalo_dibujo_ms())
+
+# =============================================
+# MEDICIÓN DE RENDIMIENTO
+# =============================================
+
+def instalar_medidor():
+    """Envuelve las funciones de cada cuadro para medir cuánto tardan"""
+    global medidor, bucle_principal, dibujar_juego, dibujar_tablero, actualizar_panel_informacion
+    medidor = MedidorCuadros()
+    dibujar_tablero = medidor.envolver("dibujar_tablero", dibujar_tablero)
+    dibujar_juego = medidor.envolver("dibujar_juego", dibujar_juego)
+    actualizar_panel_informacion = medidor.envolver("actualizar_panel_informacion",
+                                                    actualizar_panel_informacion)
+    bucle_principal = medidor.envolver_bucle(
+        bucle_principal, lambda: (motor.cuadro, motor.calcular_velocidad_actual()))
+
+def alternar_superposicion():
+    """Muestra u oculta las estadísticas de rendimiento sobre el tablero"""
+    if superposicion is None:
+        return
+    if superposicion.alternar():
+        planificador_superposicion.programar(INTERVALO_SUPERPOSICION_MS)
+    else:
+        planificador_superposicion.cancelar()
+
+def refrescar_superposicion():
+    """Redibuja las estadísticas mientras estén visibles"""
+    superposicion.actualizar()
+    planificador_superposicion.programar(INTERVALO_SUPERPOSICION_MS)
+
+def exportar_perfil():
+    """Guarda los tiempos de los últimos cuadros en ARCHIVO_PERFIL (en el hilo escritor)"""
+    if medidor is None:
+        return
+    escritor.encolar(guardar_csv, ARCHIVO_PERFIL, medidor.filas(),
+                     al_terminar=informar_escritura)
 
 # =============================================
 # CONFIGURACIÓN DE LA VENTANA - MEJORADA
@@ -707,14 +470,21 @@ def bucle_principal():
 
 def configurar_ventana_principal():
     """Configura toda la interfaz gráfica"""
-    global ventana, lienzo, lienzo_siguiente
-    global etiqueta_puntuacion, etiqueta_nivel, etiqueta_lineas, etiqueta_record, etiqueta_tiempo
+    global ventana, planificador, planificador_escrituras, lienzo, lienzo_siguiente, renderizador
+    global superposicion, planificador_superposicion
+    global etiqueta_puntuacion, etiqueta_nivel, etiqueta_lineas, etiqueta_record, etiqueta_tiempo, panel
     
     # Crear ventana principal
     ventana = tk.Tk()
     ventana.title("Tetris - Versión 4")
     ventana.resizable(False, False)
     
+    # Único dueño del tick de gravedad
+    planificador = PlanificadorTicks(ventana, bucle_principal)
+    planificador_escrituras = PlanificadorTicks(ventana, revisar_escrituras)
+    planificador_superposicion = PlanificadorTicks(ventana, refrescar_superposicion)
+    ventana.protocol("WM_DELETE_WINDOW", cerrar_aplicacion)
+    
     # Calcular dimensiones
     ancho_juego = ANCHO_TABLERO * TAMANO_BLOQUE
     alto_juego = ALTO_TABLERO * TAMANO_BLOQUE
@@ -737,6 +507,14 @@ def configurar_ventana_principal():
     )
     lienzo.pack(padx=10, pady=10)
     
+    # Objetos del lienzo que se reutilizan en todos los cuadros
+    renderizador = RenderizadorTablero(
+        lienzo, ANCHO_TABLERO, ALTO_TABLERO, TAMANO_BLOQUE,
+        COLORES, COLOR_CUADRICULA
+    )
+    if medidor is not None:
+        superposicion = OverlayRendimiento(lienzo, medidor)
+    
     # ===== PANEL LATERAL DE INFORMACIÓN =====
     marco_lateral = tk.Frame(ventana, width=250, bg="#2c2c2c")
     marco_lateral.pack(side=tk.RIGHT, fill=tk.Y)
@@ -798,6 +576,14 @@ def configurar_ventana_principal():
     )
     etiqueta_tiempo.pack(pady=8)
     
+    # Último texto de cada etiqueta, para no reconfigurar las que no cambian
+    panel = PanelInformacion()
+    panel.agregar("puntuacion", etiqueta_puntuacion)
+    panel.agregar("nivel", etiqueta_nivel)
+    panel.agregar("lineas", etiqueta_lineas)
+    panel.agregar("record", etiqueta_record)
+    panel.agregar("tiempo", etiqueta_tiempo)
+    
     # Separador
     separador = tk.Frame(marco_lateral, height=2, bg="#404040")
     separador.pack(fill=tk.X, padx=20, pady=20)
@@ -867,6 +653,8 @@ CONTROLES:
 ↓    : BAJAR RÁPIDO
 ESPACIO : CAÍDA INSTANTÁNEA
 P    : PAUSA
+A    : JUGADOR AUTOMÁTICO
+F    : RENDIMIENTO (C: CSV)
     """
     etiqueta_controles = tk.Label(
         marco_lateral,
@@ -880,6 +668,11 @@ P    : PAUSA
     
     # Configurar eventos de teclado
     def manejar_tecla_presionada(evento):
+        # Grabar solo las acciones que llegan al motor
+        accion = ACCIONES_TECLAS.get(evento.keysym)
+        if accion is not None and not juego_pausado and motor.puede_actuar():
+            grabador.registrar(motor.cuadro, accion)
+
         if evento.keysym == 'Left':
             mover_izquierda()
         elif evento.keysym == 'Right':
@@ -892,6 +685,12 @@ P    : PAUSA
             caida_rapida()
         elif evento.keysym == 'p':
             pausar_juego()
+        elif evento.keysym == 'a':
+            alternar_jugador_automatico()
+        elif evento.keysym == 'f':
+            alternar_superposicion()
+        elif evento.keysym == 'c':
+            exportar_perfil()
             
         dibujar_juego()
     
@@ -904,19 +703,29 @@ P    : PAUSA
 
 def main():
     """Función principal que inicia la aplicación"""
-    global tablero, pieza_actual, siguiente_pieza, juego_activo, tiempo_inicio
-    
-    # Cargar récord existente
-    cargar_record()
+    global motor, grabador, historial, escritor, cache_record, reloj, juego_activo, tiempo_inicio
     
-    # Inicializar juego
-    tablero = crear_tablero_vacio()
-    pieza_actual = generar_pieza_aleatoria()
-    siguiente_pieza = generar_pieza_aleatoria()
+    # Inicializar juego (con semilla conocida para poder grabar la repetición)
+    semilla = nueva_semilla()
+    motor = MotorTetris(semilla=semilla)
+    motor.al_terminar = terminar_partida
+    grabador = GrabadorRepeticion(semilla)
     juego_activo = True
     tiempo_inicio = time.time()
     
-    # Configurar interfaz
+    # Abrir el historial y cargar el récord existente
+    historial = abrir_almacen_partidas()
+    escritor = EscritorEnSegundoPlano()
+    cache_record = CacheRecord(ARCHIVO_RECORD)
+    try:
+        cache_record.cargar()
+    except DatosCorruptos:
+        messagebox.showerror("Error", f"El archivo {ARCHIVO_RECORD} está corrupto")
+    cargar_record()
+    
+    # Configurar interfaz (con las funciones de cada cuadro ya envueltas)
+    if MEDIR_CUADROS:
+        instalar_medidor()
     configurar_ventana_principal()
     
     # Dibujar estado inicial
@@ -924,10 +733,12 @@ def main():
     dibujar_juego()
     dibujar_siguiente_pieza()
     
-    # Iniciar bucle del juego
+    # Iniciar bucle del juego (el reloj empieza a contar ahora)
+    reloj = RelojSimulacion()
     bucle_principal()
+    revisar_escrituras()
     
-    # Iniciar aplicación
+    # Iniciar aplicación (al cerrar la ventana se guardan las escrituras pendientes)
     ventana.mainloop()
 
 # =============================================
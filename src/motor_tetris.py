@@ -0,0 +1,761 @@
+"""
+Motor de reglas de Tetris sin interfaz gráfica.
+
+Este módulo contiene toda la lógica del juego de src/main.py (tablero,
+pieza actual y siguiente, colisiones, líneas y estadísticas) encapsulada
+en la clase MotorTetris. No importa Tkinter, por lo que se puede usar en
+servidores, simulaciones y validación de puntuaciones, y se pueden tener
+miles de partidas independientes en el mismo proceso.
+
+La interfaz Tkinter (main.py) solo crea un MotorTetris, le envía las
+acciones del jugador y dibuja su estado.
+"""
+
+from collections import namedtuple
+
+from formas_piezas import compilar_formas
+from generador_piezas import GeneradorPiezas, MODO_UNIFORME
+
+# =============================================
+# CONFIGURACIÓN DE LAS REGLAS
+# =============================================
+
+# Constantes del tablero
+ANCHO_TABLERO = 10
+ALTO_TABLERO = 20
+
+# Sistema de puntuación
+PUNTOS_POR_LINEA = 100
+BONUS_NIVEL = 50
+BONUS_CAIDA_RAPIDA = 1
+PUNTOS_LINEAS = (0, 100, 300, 500, 800)  # Por 0..4 líneas a la vez, a nivel 1
+LINEAS_POR_NIVEL = 5
+
+# Velocidades por nivel
+VELOCIDAD_BASE = 500
+VELOCIDAD_MINIMA = 100
+REDUCCION_VELOCIDAD = 40
+
+# Simulación de paso fijo: cuadros por segundo y caída máxima por cuadro
+CUADROS_POR_SEGUNDO = 60
+GRAVEDAD_MAXIMA = 20
+
+# Reglas ajustables de una partida (ver MotorTetris). Por defecto, las
+# constantes de este módulo, que son las reglas del juego de main.py.
+ReglasJuego = namedtuple("ReglasJuego", [
+    "lineas_por_nivel",      # Líneas para subir cada nivel
+    "puntos_lineas",         # Puntos por 0..4 líneas a nivel 1
+    "bonus_caida_rapida",    # Puntos por fila de caída rápida
+    "velocidad_base",        # ms entre caídas en el nivel 1
+    "velocidad_minima",      # Tope de velocidad (ms)
+    "reduccion_velocidad",   # ms que se restan por nivel
+])
+
+REGLAS_CLASICAS = ReglasJuego(
+    lineas_por_nivel=LINEAS_POR_NIVEL,
+    puntos_lineas=PUNTOS_LINEAS,
+    bonus_caida_rapida=BONUS_CAIDA_RAPIDA,
+    velocidad_base=VELOCIDAD_BASE,
+    velocidad_minima=VELOCIDAD_MINIMA,
+    reduccion_velocidad=REDUCCION_VELOCIDAD,
+)
+
+# Formas de las piezas (todas las 7 piezas clásicas)
+FORMAS_PIEZAS = [
+    [], # 0. Vacío
+
+    # Pieza I
+    [
+        [[0,0,0,0],
+         [1,1,1,1],
+         [0,0,0,0],
+         [0,0,0,0]],
+        [[0,1,0,0],
+         [0,1,0,0],
+         [0,1,0,0],
+         [0,1,0,0]]
+    ],
+
+    # Pieza O
+    [
+        [[2,2],
+         [2,2]]
+    ],
+
+    # Pieza T
+    [
+        [[0,3,0],
+         [3,3,3],
+         [0,0,0]],
+        [[0,3,0],
+         [0,3,3],
+         [0,3,0]],
+        [[0,0,0],
+         [3,3,3],
+         [0,3,0]],
+        [[0,3,0],
+         [3,3,0],
+         [0,3,0]]
+    ],
+
+    # Pieza S
+    [
+        [[0,4,4],
+         [4,4,0],
+         [0,0,0]],
+        [[0,4,0],
+         [0,4,4],
+         [0,0,4]]
+    ],
+
+    # Pieza Z
+    [
+        [[5,5,0],
+         [0,5,5],
+         [0,0,0]],
+        [[0,0,5],
+         [0,5,5],
+         [0,5,0]]
+    ],
+
+    # Pieza J
+    [
+        [[6,0,0],
+         [6,6,6],
+         [0,0,0]],
+        [[0,6,6],
+         [0,6,0],
+         [0,6,0]],
+        [[0,0,0],
+         [6,6,6],
+         [0,0,6]],
+        [[0,6,0],
+         [0,6,0],
+         [6,6,0]]
+    ],
+
+    # Pieza L
+    [
+        [[0,0,7],
+         [7,7,7],
+         [0,0,0]],
+        [[0,7,0],
+         [0,7,0],
+         [0,7,7]],
+        [[0,0,0],
+         [7,7,7],
+         [7,0,0]],
+        [[7,7,0],
+         [0,7,0],
+         [0,7,0]]
+    ]
+]
+
+# Número de tipos de pieza (índices 1..CANTIDAD_PIEZAS en FORMAS_PIEZAS)
+CANTIDAD_PIEZAS = 7
+
+# FORMAS_COMPILADAS[tipo][rotacion] -> FormaCompilada (celdas ocupadas y medidas)
+FORMAS_COMPILADAS = compilar_formas(FORMAS_PIEZAS, ANCHO_TABLERO)
+
+# =============================================
+# FUNCIONES AUXILIARES
+# =============================================
+
+def crear_tablero_vacio():
+    """Crea un tablero vacío para empezar el juego"""
+    return [[0 for _ in range(ANCHO_TABLERO)] for _ in range(ALTO_TABLERO)]
+
+def calcular_velocidad(nivel, velocidad_minima=VELOCIDAD_MINIMA,
+                       velocidad_base=VELOCIDAD_BASE, reduccion=REDUCCION_VELOCIDAD):
+    """Calcula los milisegundos entre caídas para un nivel"""
+    velocidad = velocidad_base - ((nivel - 1) * reduccion)
+    if velocidad < velocidad_minima:
+        return velocidad_minima
+    return velocidad
+
+def calcular_umbral_gravedad(nivel, velocidad_minima=VELOCIDAD_MINIMA,
+                             velocidad_base=VELOCIDAD_BASE, reduccion=REDUCCION_VELOCIDAD):
+    """
+    Calcula la gravedad de un nivel como umbral entero por cuadro.
+
+    Cada cuadro suma 1000 a un acumulador y la pieza baja una fila cada
+    vez que el acumulador supera el umbral (velocidad_ms * cuadros/seg),
+    es decir, baja 1000 / umbral filas por cuadro. Con enteros el
+    resultado es exacto y reproducible. Con velocidad_minima menor que
+    VELOCIDAD_MINIMA se pueden jugar niveles más rápidos que el tope
+    clásico de 100 ms, hasta GRAVEDAD_MAXIMA filas por cuadro.
+    """
+    velocidad = calcular_velocidad(nivel, velocidad_minima, velocidad_base, reduccion)
+    umbral = velocidad * CUADROS_POR_SEGUNDO
+    return max(umbral, 1000 // GRAVEDAD_MAXIMA)
+
+# =============================================
+# ÍNDICE DE ALTURAS DE COLUMNA
+# =============================================
+
+def calcular_alturas(filas):
+    """Altura de cada columna (0 = vacía) a partir de la matriz de filas"""
+    alturas = [0] * ANCHO_TABLERO
+    for fila in range(ALTO_TABLERO - 1, -1, -1):
+        for columna, valor in enumerate(filas[fila]):
+            if valor:
+                alturas[columna] = ALTO_TABLERO - fila
+    return alturas
+
+def actualizar_alturas_tras_lineas(tablero, lineas_eliminadas):
+    """
+    Ajusta tablero.alturas después de eliminar líneas.
+
+    Todas las líneas eliminadas estaban llenas, así que estaban por debajo
+    (o a la altura) de la celda más alta de cada columna: cada columna baja
+    exactamente 'lineas_eliminadas' filas, salvo que su nueva cima quede
+    vacía, en cuyo caso se baja hasta la siguiente celda ocupada.
+    """
+    alturas = tablero.alturas
+    for columna in range(ANCHO_TABLERO):
+        altura = alturas[columna] - lineas_eliminadas
+        while altura > 0 and not tablero.esta_ocupada(columna, ALTO_TABLERO - altura):
+            altura -= 1
+        alturas[columna] = altura
+
+def distancia_caida_por_alturas(tablero, tipo, rotacion, pos_x, pos_y):
+    """
+    Calcula cuántas filas puede caer una pieza usando las alturas de columna.
+
+    Si en todas sus columnas la pieza está por encima de la celda más alta,
+    la distancia sale directamente del perfil inferior de la forma, sin
+    ninguna prueba de colisión. Si la pieza está metida bajo un saliente,
+    se recurre a bajar fila por fila con tablero.colisiona.
+    """
+    forma = FORMAS_COMPILADAS[tipo][rotacion]
+    alturas = tablero.alturas
+    distancia = ALTO_TABLERO
+    for dx, dy in forma.perfil_inferior:
+        # Filas libres entre la celda más baja de la pieza y la cima
+        libres = ALTO_TABLERO - alturas[pos_x + dx] - 1 - (pos_y + dy)
+        if libres < 0:
+            break  # La pieza está por debajo de la cima de esta columna
+        if libres < distancia:
+            distancia = libres
+    else:
+        return distancia
+
+    distancia = 0
+    while not tablero.colisiona(tipo, rotacion, pos_x, pos_y + distancia + 1):
+        distancia += 1
+    return distancia
+
+# =============================================
+# TABLERO (LISTA DE LISTAS)
+# =============================================
+
+class TableroLista:
+    """
+    Tablero clásico: una lista de ALTO_TABLERO filas con ANCHO_TABLERO
+    enteros cada una (0 = vacío, 1..7 = tipo de pieza fijada).
+
+    Cualquier otra representación del tablero (ver tablero_bits.py) debe
+    ofrecer los mismos métodos y los mismos atributos 'filas' (para dibujar)
+    y 'alturas' (altura de cada columna: 0 = vacía, ALTO_TABLERO = llena
+    hasta arriba), que se actualiza al fijar piezas y al eliminar líneas.
+    """
+
+    def __init__(self):
+        self.filas = crear_tablero_vacio()
+        self.alturas = [0] * ANCHO_TABLERO
+
+    @classmethod
+    def desde_filas(cls, filas):
+        """Tablero con una copia de la matriz de filas dada (p. ej. una situación de prueba)"""
+        tablero = cls()
+        tablero.filas = [list(fila) for fila in filas]
+        tablero.alturas = calcular_alturas(tablero.filas)
+        return tablero
+
+    def colisiona(self, tipo, rotacion, pos_x, pos_y):
+        """Verifica si la pieza colisiona con paredes, suelo u otras piezas"""
+        forma = FORMAS_COMPILADAS[tipo][rotacion]
+
+        # Verificar paredes izquierda y derecha
+        if pos_x + forma.min_x < 0 or pos_x + forma.max_x >= ANCHO_TABLERO:
+            return True
+
+        # Verificar suelo
+        if pos_y + forma.max_y >= ALTO_TABLERO:
+            return True
+
+        # Verificar otras piezas (solo las celdas dentro del tablero)
+        filas = self.filas
+        for dx, dy in forma.celdas:
+            tablero_y = pos_y + dy
+            if tablero_y >= 0 and filas[tablero_y][pos_x + dx] != 0:
+                return True
+
+        return False
+
+    def fijar(self, tipo, rotacion, pos_x, pos_y):
+        """Escribe la pieza en el tablero"""
+        alturas = self.alturas
+        for dx, dy in FORMAS_COMPILADAS[tipo][rotacion].celdas:
+            # Solo fijar si está dentro del tablero visible
+            if pos_y + dy >= 0:
+                self.filas[pos_y + dy][pos_x + dx] = tipo
+                if ALTO_TABLERO - (pos_y + dy) > alturas[pos_x + dx]:
+                    alturas[pos_x + dx] = ALTO_TABLERO - (pos_y + dy)
+
+    def distancia_caida(self, tipo, rotacion, pos_x, pos_y):
+        """Filas que puede caer la pieza desde (pos_x, pos_y), que es válida"""
+        return distancia_caida_por_alturas(self, tipo, rotacion, pos_x, pos_y)
+
+    def esta_ocupada(self, columna, fila):
+        """Indica si la celda (columna, fila) del tablero está ocupada"""
+        return self.filas[fila][columna] != 0
+
+    def eliminar_lineas_completas(self):
+        """Elimina las filas llenas, devuelve cuántas eliminó"""
+        filas = self.filas
+        lineas_eliminadas = 0
+        fila_actual = ALTO_TABLERO - 1  # Empezar desde abajo
+
+        while fila_actual >= 0:
+            if 0 not in filas[fila_actual]:
+                # Eliminar la fila completa y añadir una vacía arriba
+                filas.pop(fila_actual)
+                filas.insert(0, [0 for _ in range(ANCHO_TABLERO)])
+                lineas_eliminadas += 1
+            else:
+                fila_actual -= 1
+
+        if lineas_eliminadas:
+            actualizar_alturas_tras_lineas(self, lineas_eliminadas)
+        return lineas_eliminadas
+
+# =============================================
+# CAMBIOS ENTRE CUADROS
+# =============================================
+
+class CambiosTablero:
+    """
+    Lo que cambió en la partida desde la última vez que se dibujó.
+
+    Atributos:
+        todo (bool): Hay que redibujar el tablero entero (partida nueva)
+        celdas (set): Celdas (columna, fila) escritas al fijar piezas
+        filas (set): Filas completas que se desplazaron al eliminar líneas
+        pieza_anterior, pieza (tuple): Celdas absolutas de la pieza activa
+            antes y ahora; pieza es None si no se movió
+        fantasma_anterior, fantasma (tuple): Igual para la pieza fantasma
+    """
+
+    __slots__ = ("todo", "celdas", "filas", "pieza_anterior", "pieza",
+                 "fantasma_anterior", "fantasma")
+
+    def __init__(self, todo=False):
+        self.todo = todo
+        self.celdas = set()
+        self.filas = set()
+        self.pieza_anterior = None
+        self.pieza = None
+        self.fantasma_anterior = None
+        self.fantasma = None
+
+    def tablero_cambio(self):
+        """Indica si cambió alguna celda fijada del tablero"""
+        return self.todo or bool(self.celdas) or bool(self.filas)
+
+# =============================================
+# MOTOR DEL JUEGO
+# =============================================
+
+class MotorTetris:
+    """
+    Estado completo de una partida de Tetris y las reglas que lo modifican.
+
+    Cada instancia es independiente: tiene su propio tablero, sus propias
+    piezas, estadísticas y su propio GeneradorPiezas con semilla.
+
+    Atributos públicos:
+        tablero: TableroLista (o TableroBits); tablero.filas es la matriz
+            ALTO_TABLERO x ANCHO_TABLERO (0 = vacío)
+        pieza_actual (dict): {'tipo', 'rotacion', 'x', 'y'}
+        siguiente_pieza (dict): Próxima pieza que entrará al tablero
+        juego_terminado (bool): True cuando la nueva pieza no cabe
+        puntuacion, nivel, lineas_completadas, record (int): Estadísticas
+        reglas (ReglasJuego): Puntuación, niveles y velocidades de la partida
+        al_terminar (callable): Se llama con el motor al terminar la partida
+
+    Después de cada acción, tomar_cambios() devuelve un CambiosTablero con
+    solo lo que hay que volver a dibujar.
+    """
+
+    def __init__(self, semilla=None, record=0, clase_tablero=TableroLista,
+                 modo_generador=MODO_UNIFORME, vista_previa=1, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            semilla: Semilla del generador de piezas (None = no reproducible)
+            record (int): Récord con el que empieza la partida
+            clase_tablero: Representación del tablero (TableroLista o TableroBits)
+            modo_generador (str): MODO_UNIFORME o MODO_BOLSA (7-bag)
+            vista_previa (int): Piezas que el generador calcula por adelantado
+            reglas (ReglasJuego): Reglas de la partida (por defecto las de main.py)
+        """
+        self.reglas = reglas
+        self.generador = GeneradorPiezas(semilla, modo_generador, vista_previa)
+        self.clase_tablero = clase_tablero
+        self.record = record
+        self.al_terminar = None
+        self.reiniciar(semilla)
+
+    # -----------------------------------------
+    # Estado de la partida
+    # -----------------------------------------
+
+    def reiniciar(self, semilla=None):
+        """
+        Reinicia el tablero, las piezas y las estadísticas.
+
+        Args:
+            semilla: Si se indica, la nueva partida usa esta semilla; si no,
+                     continúa con la secuencia del generador actual
+        """
+        if semilla is not None:
+            self.generador.reiniciar(semilla)
+        self.semilla = self.generador.semilla
+        self.tablero = self.clase_tablero()
+        self.pieza_actual = self.generar_pieza_aleatoria()
+        self.siguiente_pieza = self.generar_pieza_aleatoria()
+        self.juego_terminado = False
+
+        self.puntuacion = 0
+        self.nivel = 1
+        self.lineas_completadas = 0
+
+        # Simulación de paso fijo
+        self.cuadro = 0
+        self.gravedad_acumulada = 0
+
+        # Partida nueva: el próximo dibujo debe ser completo
+        self.cambios = CambiosTablero(todo=True)
+        self.pieza_emitida = None
+        self.fantasma_emitido = None
+
+    def generar_pieza_aleatoria(self):
+        """Genera la siguiente pieza de la secuencia del generador"""
+        tipo_pieza = self.generador.siguiente_tipo()
+        return {
+            'tipo': tipo_pieza,
+            'rotacion': 0,
+            'x': ANCHO_TABLERO // 2 - 1,  # Posición centrada
+            'y': 0  # Empieza en la parte superior
+        }
+
+    def proximos_tipos(self, cantidad):
+        """Tipos de las próximas piezas (siguiente_pieza incluida) sin consumirlas"""
+        if cantidad <= 0:
+            return []
+        return [self.siguiente_pieza['tipo']] + self.generador.ver(cantidad - 1)
+
+    def obtener_forma_actual(self):
+        """Obtiene la forma compilada de la pieza actual (o None)"""
+        if self.pieza_actual is None:
+            return None
+
+        tipo = self.pieza_actual['tipo']
+        rotacion = self.pieza_actual['rotacion']
+        return FORMAS_COMPILADAS[tipo][rotacion]
+
+    def obtener_posicion_fantasma(self):
+        """Calcula la fila donde caería la pieza actual"""
+        pieza = self.pieza_actual
+        if pieza is None:
+            return 0
+        return pieza['y'] + self.tablero.distancia_caida(
+            pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y'])
+
+    def calcular_velocidad_actual(self):
+        """Calcula la velocidad basada en el nivel"""
+        reglas = self.reglas
+        return calcular_velocidad(self.nivel, reglas.velocidad_minima,
+                                  reglas.velocidad_base, reglas.reduccion_velocidad)
+
+    def calcular_umbral_gravedad_actual(self, velocidad_minima=None):
+        """Umbral de gravedad del nivel actual (ver calcular_umbral_gravedad)"""
+        reglas = self.reglas
+        if velocidad_minima is None:
+            velocidad_minima = reglas.velocidad_minima
+        return calcular_umbral_gravedad(self.nivel, velocidad_minima,
+                                        reglas.velocidad_base, reglas.reduccion_velocidad)
+
+    # -----------------------------------------
+    # Reglas
+    # -----------------------------------------
+
+    def verificar_colision(self, tipo, rotacion, pos_x, pos_y):
+        """Verifica si una pieza en (pos_x, pos_y) colisiona con algo"""
+        return self.tablero.colisiona(tipo, rotacion, pos_x, pos_y)
+
+    def fijar_pieza_actual(self):
+        """Fija la pieza actual en el tablero"""
+        pieza = self.pieza_actual
+        if pieza is None:
+            return
+        self.tablero.fijar(pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y'])
+
+        forma = FORMAS_COMPILADAS[pieza['tipo']][pieza['rotacion']]
+        for dx, dy in forma.celdas:
+            if pieza['y'] + dy >= 0:
+                self.cambios.celdas.add((pieza['x'] + dx, pieza['y'] + dy))
+
+    def encontrar_lineas_completas(self):
+        """Encuentra y elimina líneas completas, devuelve cuántas eliminó"""
+        # Fila llena más baja: todas las filas por encima se desplazarán
+        filas = self.tablero.filas
+        fila_mas_baja = -1
+        for fila in range(ALTO_TABLERO - 1, -1, -1):
+            if 0 not in filas[fila]:
+                fila_mas_baja = fila
+                break
+
+        lineas_eliminadas = self.tablero.eliminar_lineas_completas()
+        self.lineas_completadas += lineas_eliminadas
+        if lineas_eliminadas:
+            self.cambios.filas.update(range(fila_mas_baja + 1))
+        return lineas_eliminadas
+
+    def tomar_cambios(self, con_fantasma=False):
+        """
+        Devuelve lo que cambió desde la llamada anterior y empieza de cero.
+
+        Args:
+            con_fantasma (bool): Si se calcula también la pieza fantasma
+
+        Returns:
+            CambiosTablero: Celdas, filas y huellas de pieza a redibujar
+        """
+        cambios = self.cambios
+        self.cambios = CambiosTablero()
+
+        pieza = self.pieza_actual
+        huella = ()
+        if pieza is not None:
+            forma = FORMAS_COMPILADAS[pieza['tipo']][pieza['rotacion']]
+            huella = tuple((pieza['x'] + dx, pieza['y'] + dy) for dx, dy in forma.celdas)
+
+        pieza_cambio = cambios.todo or huella != self.pieza_emitida
+        if pieza_cambio:
+            cambios.pieza_anterior = self.pieza_emitida
+            cambios.pieza = huella
+            self.pieza_emitida = huella
+
+        # El fantasma solo puede moverse si se movió la pieza o el tablero
+        if con_fantasma and (pieza_cambio or cambios.tablero_cambio()):
+            fantasma = ()
+            if pieza is not None and not self.juego_terminado:
+                caida = self.obtener_posicion_fantasma() - pieza['y']
+                fantasma = tuple((x, y + caida) for x, y in huella)
+            if cambios.todo or fantasma != self.fantasma_emitido:
+                cambios.fantasma_anterior = self.fantasma_emitido
+                cambios.fantasma = fantasma
+                self.fantasma_emitido = fantasma
+
+        return cambios
+
+    def calcular_puntuacion_lineas(self, cantidad_lineas):
+        """Calcula la puntuación ganada por limpiar líneas"""
+        if cantidad_lineas == 0:
+            return 0
+
+        # Sistema de puntuación clásico de Tetris (reglas.puntos_lineas)
+        puntos_lineas = self.reglas.puntos_lineas
+        if cantidad_lineas < len(puntos_lineas):
+            return puntos_lineas[cantidad_lineas] * self.nivel
+        else:
+            return cantidad_lineas * PUNTOS_POR_LINEA * self.nivel
+
+    def actualizar_estadisticas(self, lineas_limpiadas):
+        """Actualiza puntuación, nivel y récord"""
+        if lineas_limpiadas > 0:
+            # Sumar puntos por líneas
+            self.puntuacion += self.calcular_puntuacion_lineas(lineas_limpiadas)
+
+            # Actualizar nivel cada reglas.lineas_por_nivel líneas (5)
+            nuevo_nivel = (self.lineas_completadas // self.reglas.lineas_por_nivel) + 1
+            if nuevo_nivel > self.nivel:
+                self.nivel = nuevo_nivel
+
+            # Actualizar récord si es necesario
+            if self.puntuacion > self.record:
+                self.record = self.puntuacion
+
+    def crear_siguiente_pieza(self):
+        """Crea la siguiente pieza y verifica fin del juego"""
+        # Mover siguiente pieza a actual
+        self.pieza_actual = self.siguiente_pieza
+        self.siguiente_pieza = self.generar_pieza_aleatoria()
+
+        # Verificar si el juego debe terminar
+        pieza = self.pieza_actual
+        if self.verificar_colision(pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y']):
+            self.juego_terminado = True
+            if self.al_terminar is not None:
+                self.al_terminar(self)
+
+    def bloquear_pieza(self):
+        """Fija la pieza, limpia líneas, actualiza estadísticas y saca otra"""
+        self.gravedad_acumulada = 0  # La nueva pieza empieza a contar de cero
+        self.fijar_pieza_actual()
+        lineas_limpiadas = self.encontrar_lineas_completas()
+        self.actualizar_estadisticas(lineas_limpiadas)
+        self.crear_siguiente_pieza()
+        return lineas_limpiadas
+
+    # -----------------------------------------
+    # Acciones
+    # -----------------------------------------
+
+    def puede_actuar(self):
+        """Indica si hay una pieza activa que se pueda controlar"""
+        return self.pieza_actual is not None and not self.juego_terminado
+
+    def mover_pieza_abajo(self):
+        """Mueve la pieza actual hacia abajo; si no puede, la fija"""
+        if not self.puede_actuar():
+            return False
+
+        pieza = self.pieza_actual
+        nueva_y = pieza['y'] + 1
+
+        if self.verificar_colision(pieza['tipo'], pieza['rotacion'], pieza['x'], nueva_y):
+            # No se puede mover más, fijar pieza
+            self.bloquear_pieza()
+            return False
+
+        pieza['y'] = nueva_y
+        return True
+
+    def paso(self):
+        """Avanza un tick de gravedad"""
+        return self.mover_pieza_abajo()
+
+    def avanzar_cuadro(self, velocidad_minima=None):
+        """
+        Avanza un cuadro de la simulación de paso fijo.
+
+        La gravedad se acumula como fracción de fila por cuadro; la pieza
+        baja tantas filas enteras como se hayan completado.
+
+        Args:
+            velocidad_minima (int): Tope de velocidad en ms (ver calcular_umbral_gravedad);
+                                    None = el de las reglas
+
+        Returns:
+            bool: True si en este cuadro se fijó una pieza
+        """
+        if not self.puede_actuar():
+            return False
+
+        self.cuadro += 1
+        umbral = self.calcular_umbral_gravedad_actual(velocidad_minima)
+        self.gravedad_acumulada += 1000
+        while self.gravedad_acumulada >= umbral:
+            self.gravedad_acumulada -= umbral
+            if not self.mover_pieza_abajo():
+                return True  # Pieza fijada (el acumulador ya se reinició)
+        return False
+
+    def avanzar_cuadros(self, cantidad, velocidad_minima=None):
+        """
+        Avanza 'cantidad' cuadros de simulación.
+
+        Da exactamente el mismo resultado que llamar 'cantidad' veces a
+        avanzar_cuadro(), pero salta de golpe los cuadros en los que la
+        pieza no llega a bajar ninguna fila.
+
+        Returns:
+            bool: True si en esos cuadros se fijó alguna pieza
+        """
+        pieza_fijada = False
+        restantes = cantidad
+        while restantes > 0 and self.puede_actuar():
+            umbral = self.calcular_umbral_gravedad_actual(velocidad_minima)
+            # Cuadros hasta que el acumulador llegue al umbral (al menos 1)
+            hasta_caida = max(1, -(-(umbral - self.gravedad_acumulada) // 1000))
+            if hasta_caida > restantes:
+                self.cuadro += restantes
+                self.gravedad_acumulada += 1000 * restantes
+                break
+
+            self.cuadro += hasta_caida - 1
+            self.gravedad_acumulada += 1000 * (hasta_caida - 1)
+            if self.avanzar_cuadro(velocidad_minima):
+                pieza_fijada = True
+            restantes -= hasta_caida
+        return pieza_fijada
+
+    def caida_suave(self):
+        """Baja la pieza una fila por orden del jugador y reinicia la gravedad"""
+        se_movio = self.mover_pieza_abajo()
+        if se_movio:
+            self.reiniciar_gravedad()
+        return se_movio
+
+    def reiniciar_gravedad(self):
+        """Vuelve a contar la gravedad desde cero (p. ej. tras una caída suave)"""
+        self.gravedad_acumulada = 0
+
+    def mover(self, desplazamiento_x):
+        """Mueve la pieza horizontalmente, devuelve True si se movió"""
+        if not self.puede_actuar():
+            return False
+
+        pieza = self.pieza_actual
+        nueva_x = pieza['x'] + desplazamiento_x
+
+        if self.verificar_colision(pieza['tipo'], pieza['rotacion'], nueva_x, pieza['y']):
+            return False
+
+        pieza['x'] = nueva_x
+        return True
+
+    def mover_izquierda(self):
+        """Mueve la pieza actual hacia la izquierda"""
+        return self.mover(-1)
+
+    def mover_derecha(self):
+        """Mueve la pieza actual hacia la derecha"""
+        return self.mover(1)
+
+    def rotar_pieza(self):
+        """Rota la pieza actual si es posible, devuelve True si rotó"""
+        if not self.puede_actuar():
+            return False
+
+        pieza = self.pieza_actual
+        tipo_pieza = pieza['tipo']
+        rotaciones_posibles = len(FORMAS_PIEZAS[tipo_pieza])
+        nueva_rotacion = (pieza['rotacion'] + 1) % rotaciones_posibles
+
+        # Si hay colisión, no se rota
+        if self.verificar_colision(tipo_pieza, nueva_rotacion, pieza['x'], pieza['y']):
+            return False
+
+        pieza['rotacion'] = nueva_rotacion
+        return True
+
+    def caida_rapida(self):
+        """Deja caer la pieza hasta el fondo y la fija, devuelve filas caídas"""
+        if not self.puede_actuar():
+            return 0
+
+        # Bajar directamente hasta la posición de aterrizaje
+        pieza = self.pieza_actual
+        filas_caidas = self.tablero.distancia_caida(
+            pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y'])
+        pieza['y'] += filas_caidas
+
+        # Bonus de puntos por caída rápida
+        self.puntuacion += filas_caidas * self.reglas.bonus_caida_rapida
+
+        # Fijar la pieza y continuar
+        self.bloquear_pieza()
+        return filas_caidas
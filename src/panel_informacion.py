@@ -0,0 +1,48 @@
+"""
+Etiquetas del panel lateral que solo se reconfiguran cuando cambian.
+
+Cada label.config(text=...) hace que Tk vuelva a calcular la geometría
+del panel aunque el texto sea el mismo. PanelInformacion guarda el último
+texto mostrado en cada etiqueta y solo llama a config() si el nuevo es
+distinto, así que el bucle puede pedir el panel entero en cada tick y
+solo se tocan las etiquetas que cambiaron (el reloj, una vez por segundo).
+Lo usan main.py y la versión con velocidad.
+"""
+
+# =============================================
+# PANEL
+# =============================================
+
+class PanelInformacion:
+    """
+    Último texto mostrado de cada etiqueta del panel.
+
+    Uso típico:
+        panel = PanelInformacion()
+        panel.agregar("puntuacion", etiqueta_puntuacion)
+        panel.mostrar("puntuacion", f"Puntuación: {puntuacion}")
+    """
+
+    def __init__(self):
+        self.etiquetas = {}
+        self.textos = {}
+        self.reconfiguraciones = 0  # config() hechos de verdad (para medir)
+
+    def agregar(self, nombre, etiqueta):
+        """Registra una etiqueta con el texto que tiene ahora"""
+        self.etiquetas[nombre] = etiqueta
+        self.textos[nombre] = etiqueta.cget("text")
+
+    def mostrar(self, nombre, texto):
+        """
+        Pone 'texto' en la etiqueta si es distinto del que muestra.
+
+        Returns:
+            bool: True si hubo que reconfigurar la etiqueta
+        """
+        if self.textos.get(nombre) == texto:
+            return False
+        self.etiquetas[nombre].config(text=texto)
+        self.textos[nombre] = texto
+        self.reconfiguraciones += 1
+        return True
@@ -0,0 +1,345 @@
+"""
+Medición del tiempo de cada cuadro de la interfaz Tk.
+
+Cuando el juego da tirones no se sabe si el tiempo se va en la lógica o
+en el Canvas. MedidorCuadros envuelve las funciones de cada cuadro de
+main.py (bucle_principal, dibujar_juego, dibujar_tablero,
+actualizar_panel_informacion) y guarda por cada cuadro, en un buffer
+circular de CAPACIDAD_CUADROS cuadros:
+
+- la duración total del cuadro y la de cada función (la lógica es lo que
+  queda del cuadro fuera de las funciones de dibujo y del panel),
+- el tiempo de las mismas funciones llamadas fuera del bucle (teclas)
+  desde el cuadro anterior,
+- el intervalo real desde el cuadro anterior y los cuadros de simulación
+  que avanzó el motor en él,
+- la deriva de la gravedad: tiempo real menos tiempo simulado, acumulado.
+  Crece cuando el reloj descarta cuadros por un retraso de Tk; se muestra
+  junto a calcular_velocidad_actual() para ver cuánto de una fila supone.
+
+OverlayRendimiento lo dibuja encima del tablero (FPS, histograma de
+tiempos de cuadro, objetos del lienzo y deriva) y guardar_csv() exporta
+las filas del buffer.
+"""
+
+import csv
+import functools
+import time
+
+from motor_tetris import CUADROS_POR_SEGUNDO
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Cuadros que se guardan (10 segundos a 60 cuadros por segundo)
+CAPACIDAD_CUADROS = 600
+
+# Un hueco mayor entre cuadros es una pausa y no cuenta para la deriva (s)
+PAUSA_MINIMA = 0.5
+
+# Límites superiores (ms) de las barras del histograma; la última barra
+# cuenta los cuadros más lentos que el último límite
+LIMITES_HISTOGRAMA_MS = (2, 4, 8, 17, 33, 50)
+
+# Cada cuánto se redibuja la superposición (ms)
+INTERVALO_SUPERPOSICION_MS = 250
+
+# Funciones de dibujo cuyo tiempo no cuenta como lógica
+SECCIONES_DIBUJO = ("dibujar_juego", "actualizar_panel_informacion")
+
+# Columnas del buffer y del CSV, en orden
+COLUMNAS = (
+    "inicio_s",                          # Instante de inicio (reloj monotónico)
+    "cuadro_ms",                         # bucle_principal completo
+    "logica_ms",                         # cuadro_ms sin SECCIONES_DIBUJO
+    "dibujar_juego_ms",
+    "dibujar_tablero_ms",                # Incluido en dibujar_juego_ms
+    "actualizar_panel_informacion_ms",
+    "eventos_ms",                        # Funciones medidas fuera del bucle
+    "intervalo_ms",                      # Desde el inicio del cuadro anterior
+    "cuadros_simulados",
+    "deriva_ms",                         # Tiempo real - tiempo simulado
+    "velocidad_ms",                      # calcular_velocidad_actual()
+    "objetos_lienzo",                    # Último recuento de la superposición
+)
+
+# =============================================
+# MEDIDOR
+# =============================================
+
+class MedidorCuadros:
+    """
+    Buffer circular con los tiempos de los últimos cuadros.
+
+    Uso típico:
+        medidor = MedidorCuadros()
+        dibujar_juego = medidor.envolver("dibujar_juego", dibujar_juego)
+        bucle_principal = medidor.envolver_bucle(bucle_principal, leer_estado)
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_CUADROS, reloj=time.perf_counter):
+        """
+        Args:
+            capacidad (int): Cuadros que se guardan
+            reloj (callable): Fuente de tiempo monotónico en segundos
+        """
+        self.capacidad = capacidad
+        self.reloj = reloj
+        self.columnas = {nombre: [0] * capacidad for nombre in COLUMNAS}
+        self.siguiente = 0   # Posición donde se escribe el próximo cuadro
+        self.cantidad = 0    # Cuadros guardados (como mucho 'capacidad')
+
+        # Cuadro en curso
+        self.tiempos = {}
+        self.profundidad = 0
+        self.en_cuadro = False
+        self.eventos = 0.0
+
+        # Referencias del cuadro anterior
+        self.inicio_anterior = None
+        self.cuadro_anterior = None
+        self.deriva = 0.0
+        self.objetos_lienzo = 0
+
+    # -----------------------------------------
+    # Instrumentación
+    # -----------------------------------------
+
+    def envolver(self, nombre, funcion):
+        """
+        Devuelve 'funcion' midiendo cuánto tarda cada llamada.
+
+        Dentro de un cuadro el tiempo se suma a la columna nombre + "_ms";
+        fuera (p. ej. desde el manejador de teclas) se suma a eventos_ms
+        del siguiente cuadro, contando solo la llamada más externa.
+        """
+        reloj = self.reloj
+
+        @functools.wraps(funcion)
+        def medida(*argumentos, **opciones):
+            self.profundidad += 1
+            inicio = reloj()
+            try:
+                return funcion(*argumentos, **opciones)
+            finally:
+                duracion = reloj() - inicio
+                self.profundidad -= 1
+                if self.en_cuadro:
+                    self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + duracion
+                elif self.profundidad == 0:
+                    self.eventos += duracion
+
+        return medida
+
+    def envolver_bucle(self, funcion, leer_estado):
+        """
+        Devuelve el bucle principal 'funcion' midiendo cada llamada como un cuadro.
+
+        Args:
+            funcion (callable): bucle_principal
+            leer_estado (callable): Devuelve (cuadro de simulación del motor,
+                                    calcular_velocidad_actual()) al final del cuadro
+        """
+        reloj = self.reloj
+
+        @functools.wraps(funcion)
+        def cuadro(*argumentos, **opciones):
+            self.tiempos.clear()
+            self.en_cuadro = True
+            inicio = reloj()
+            try:
+                return funcion(*argumentos, **opciones)
+            finally:
+                duracion = reloj() - inicio
+                self.en_cuadro = False
+                self.registrar(inicio, duracion, *leer_estado())
+
+        return cuadro
+
+    def registrar(self, inicio, duracion, cuadro, velocidad_ms):
+        """Guarda en el buffer el cuadro que acaba de terminar"""
+        cuadros_simulados = 0
+        intervalo = 0.0
+        if self.inicio_anterior is not None:
+            intervalo = inicio - self.inicio_anterior
+            if cuadro < self.cuadro_anterior:
+                self.deriva = 0.0  # Partida nueva: el motor empieza en el cuadro 0
+            else:
+                cuadros_simulados = cuadro - self.cuadro_anterior
+                if intervalo < PAUSA_MINIMA:
+                    self.deriva += intervalo - cuadros_simulados / CUADROS_POR_SEGUNDO
+        self.inicio_anterior = inicio
+        self.cuadro_anterior = cuadro
+
+        tiempos = self.tiempos
+        dibujo = sum(tiempos.get(nombre, 0.0) for nombre in SECCIONES_DIBUJO)
+        valores = (
+            inicio,
+            duracion * 1000,
+            (duracion - dibujo) * 1000,
+            tiempos.get("dibujar_juego", 0.0) * 1000,
+            tiempos.get("dibujar_tablero", 0.0) * 1000,
+            tiempos.get("actualizar_panel_informacion", 0.0) * 1000,
+            self.eventos * 1000,
+            intervalo * 1000,
+            cuadros_simulados,
+            self.deriva * 1000,
+            velocidad_ms,
+            self.objetos_lienzo,
+        )
+        posicion = self.siguiente
+        for nombre, valor in zip(COLUMNAS, valores):
+            self.columnas[nombre][posicion] = valor
+        self.siguiente = (posicion + 1) % self.capacidad
+        self.cantidad = min(self.cantidad + 1, self.capacidad)
+        self.eventos = 0.0
+
+    # -----------------------------------------
+    # Consultas
+    # -----------------------------------------
+
+    def ultimos(self, columna, cantidad=None):
+        """Valores de una columna de los últimos cuadros, del más antiguo al más reciente"""
+        if cantidad is None or cantidad > self.cantidad:
+            cantidad = self.cantidad
+        valores = self.columnas[columna]
+        inicio = self.siguiente - cantidad
+        if inicio >= 0:
+            return valores[inicio:self.siguiente]
+        return valores[inicio:] + valores[:self.siguiente]
+
+    def filas(self):
+        """Todos los cuadros guardados como tuplas en el orden de COLUMNAS"""
+        return list(zip(*(self.ultimos(nombre) for nombre in COLUMNAS)))
+
+    def cuadros_por_segundo(self, ventana_s=1.0):
+        """Cuadros que empezaron en el último 'ventana_s' (contando desde el último)"""
+        inicios = self.ultimos("inicio_s")
+        if not inicios:
+            return 0.0
+        desde = inicios[-1] - ventana_s
+        return sum(1 for inicio in inicios if inicio > desde) / ventana_s
+
+    def histograma(self, limites=LIMITES_HISTOGRAMA_MS):
+        """Cuadros por intervalo de duración (una barra más para los más lentos)"""
+        barras = [0] * (len(limites) + 1)
+        for duracion in self.ultimos("cuadro_ms"):
+            barra = 0
+            while barra < len(limites) and duracion > limites[barra]:
+                barra += 1
+            barras[barra] += 1
+        return barras
+
+
+def percentil(valores, fraccion):
+    """Percentil (por el rango más cercano) de una lista sin ordenar"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+
+def guardar_csv(ruta, filas):
+    """Escribe filas de MedidorCuadros.filas() como CSV con cabecera (para el hilo escritor)"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS)
+        escritor.writerows(filas)
+    return True
+
+# =============================================
+# SUPERPOSICIÓN EN EL LIENZO
+# =============================================
+
+class OverlayRendimiento:
+    """
+    Recuadro sobre el lienzo con las estadísticas de MedidorCuadros.
+
+    Los objetos del lienzo se crean una sola vez (ocultos) y actualizar()
+    solo cambia su texto y sus coordenadas, como RenderizadorTablero.
+    """
+
+    ETIQUETA = "superposicion_rendimiento"
+    ANCHO = 200
+    ALTO_TEXTO = 76
+    ALTO_BARRAS = 40
+
+    def __init__(self, lienzo, medidor, x=5, y=5):
+        """
+        Args:
+            lienzo (tk.Canvas): Lienzo del tablero
+            medidor (MedidorCuadros): Origen de los datos
+            x, y (int): Esquina superior izquierda en píxeles
+        """
+        self.lienzo = lienzo
+        self.medidor = medidor
+        self.x = x
+        self.y = y
+        self.visible = False
+
+        alto = self.ALTO_TEXTO + self.ALTO_BARRAS + 18
+        opciones = {'state': "hidden", 'tags': (self.ETIQUETA,)}
+        self.fondo = lienzo.create_rectangle(x, y, x + self.ANCHO, y + alto, fill="black",
+                                             outline="#00ff00", stipple="gray75", **opciones)
+        self.texto = lienzo.create_text(x + 6, y + 4, anchor="nw", fill="#00ff00",
+                                        font=("Courier", 9), **opciones)
+
+        barras = len(LIMITES_HISTOGRAMA_MS) + 1
+        self.ancho_barra = (self.ANCHO - 12) // barras
+        self.base_barras = y + self.ALTO_TEXTO + self.ALTO_BARRAS
+        self.barras = [lienzo.create_rectangle(0, 0, 0, 0, fill="#00ff00", outline="",
+                                               **opciones)
+                       for _ in range(barras)]
+        nombres = [str(limite) for limite in LIMITES_HISTOGRAMA_MS] + ["+"]
+        for indice, nombre in enumerate(nombres):
+            lienzo.create_text(x + 6 + indice * self.ancho_barra + self.ancho_barra // 2,
+                               self.base_barras + 2, anchor="n", text=nombre,
+                               fill="#00ff00", font=("Courier", 7), **opciones)
+
+    def alternar(self):
+        """Muestra u oculta la superposición; devuelve si queda visible"""
+        self.visible = not self.visible
+        estado = "normal" if self.visible else "hidden"
+        self.lienzo.itemconfig(self.ETIQUETA, state=estado)
+        if self.visible:
+            self.actualizar()
+        return self.visible
+
+    def actualizar(self):
+        """Recalcula las estadísticas y las dibuja encima de todo lo demás"""
+        lienzo = self.lienzo
+        medidor = self.medidor
+        medidor.objetos_lienzo = len(lienzo.find_all())
+
+        duraciones = medidor.ultimos("cuadro_ms")
+        recientes = max(1, int(medidor.cuadros_por_segundo()))
+
+        def media(columna):
+            valores = medidor.ultimos(columna, recientes)
+            return sum(valores) / len(valores) if valores else 0.0
+
+        deriva = medidor.ultimos("deriva_ms", 1)
+        velocidad = medidor.ultimos("velocidad_ms", 1)
+        deriva = deriva[0] if deriva else 0.0
+        velocidad = velocidad[0] if velocidad else 0
+        fila_perdida = 100 * deriva / velocidad if velocidad else 0.0
+
+        lienzo.itemconfig(self.texto, text=(
+            f"FPS {medidor.cuadros_por_segundo():5.1f}  "
+            f"p50 {percentil(duraciones, 0.5):4.1f} p99 {percentil(duraciones, 0.99):4.1f}\n"
+            f"logica {media('logica_ms'):4.1f} lienzo {media('dibujar_juego_ms'):4.1f} "
+            f"panel {media('actualizar_panel_informacion_ms'):4.1f}\n"
+            f"teclas {media('eventos_ms'):4.1f} ms/cuadro\n"
+            f"objetos del lienzo {medidor.objetos_lienzo}\n"
+            f"deriva {deriva:+6.0f} ms ({fila_perdida:+.0f}% de {velocidad} ms)"
+        ))
+
+        histograma = medidor.histograma()
+        mayor = max(histograma) or 1
+        for indice, (barra, cantidad) in enumerate(zip(self.barras, histograma)):
+            x1 = self.x + 6 + indice * self.ancho_barra
+            alto = self.ALTO_BARRAS * cantidad / mayor
+            lienzo.coords(barra, x1 + 1, self.base_barras - alto,
+                          x1 + self.ancho_barra - 1, self.base_barras)
+        lienzo.tag_raise(self.ETIQUETA)
@@ -0,0 +1,236 @@
+"""
+Escritura segura de archivos de datos (récord, historial...).
+
+Abrir el archivo con 'w' y escribir directamente deja un archivo truncado
+si el programa se cierra o se va la luz a mitad de la escritura. Aquí cada
+escritura:
+
+1. escribe el contenido completo en un archivo temporal del mismo
+   directorio y hace fsync,
+2. conserva la versión anterior como copia de seguridad (.bak),
+3. sustituye el archivo con os.replace (atómico) y hace fsync del
+   directorio para que el cambio de nombre también quede en disco.
+
+En cualquier momento el archivo contiene la versión anterior completa o la
+nueva completa. Los JSON se guardan dentro de un sobre con una suma CRC32
+para detectar archivos dañados al cargarlos; si el archivo está dañado se
+usa la copia de seguridad. Los archivos antiguos sin sobre se siguen
+leyendo igual.
+
+LoteEscrituras agrupa escrituras (por ejemplo, muchos bots terminando a la
+vez): solo se escribe la última versión de cada archivo y el fsync del
+directorio se hace una vez por lote.
+"""
+
+import json
+import os
+import tempfile
+import zlib
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Sufijo de la copia de seguridad con la versión anterior
+SUFIJO_COPIA = ".bak"
+
+# Claves del sobre con suma de comprobación
+CLAVE_DATOS = "datos"
+CLAVE_SUMA = "crc32"
+
+
+class DatosCorruptos(ValueError):
+    """El archivo existe pero su contenido está dañado"""
+
+
+# =============================================
+# ESCRITURA ATÓMICA
+# =============================================
+
+def sincronizar_directorio(directorio):
+    """Hace fsync de un directorio (no disponible en Windows)"""
+    if os.name != 'posix':
+        return
+    descriptor = os.open(directorio or ".", os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def escribir_atomico(nombre_archivo, contenido, sincronizar=True,
+                     copia_seguridad=True, sincronizar_carpeta=True):
+    """
+    Sustituye el contenido de un archivo de forma atómica.
+
+    Args:
+        nombre_archivo (str): Archivo destino
+        contenido (bytes): Contenido completo nuevo
+        sincronizar (bool): Si se hace fsync (False para datos que se
+                            pueden reconstruir, como índices)
+        copia_seguridad (bool): Si se conserva la versión anterior en .bak
+        sincronizar_carpeta (bool): Si se hace fsync del directorio (un
+                                    lote lo hace una sola vez al final)
+    """
+    directorio = os.path.dirname(os.path.abspath(nombre_archivo))
+    descriptor, temporal = tempfile.mkstemp(
+        dir=directorio, prefix="." + os.path.basename(nombre_archivo) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(contenido)
+            archivo.flush()
+            if sincronizar:
+                os.fsync(archivo.fileno())
+
+        if copia_seguridad and os.path.exists(nombre_archivo):
+            # Enlace duro: la versión anterior sigue en su sitio hasta el replace
+            copia = nombre_archivo + SUFIJO_COPIA
+            try:
+                if os.path.exists(copia):
+                    os.remove(copia)
+                os.link(nombre_archivo, copia)
+            except OSError:
+                pass  # Sistemas de archivos sin enlaces duros: sin copia
+
+        os.replace(temporal, nombre_archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+    if sincronizar and sincronizar_carpeta:
+        sincronizar_directorio(directorio)
+
+
+# =============================================
+# JSON CON SUMA DE COMPROBACIÓN
+# =============================================
+
+def _serializar(datos):
+    """Forma canónica de los datos sobre la que se calcula la suma"""
+    return json.dumps(datos, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def empaquetar_json(datos):
+    """Devuelve los bytes del sobre {'datos': ..., 'crc32': ...}"""
+    suma = zlib.crc32(_serializar(datos).encode('utf-8'))
+    sobre = {CLAVE_DATOS: datos, CLAVE_SUMA: suma}
+    return json.dumps(sobre, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def desempaquetar_json(contenido):
+    """
+    Comprueba y extrae los datos de un archivo JSON.
+
+    Args:
+        contenido (bytes): Contenido del archivo
+
+    Returns:
+        Los datos guardados (los JSON antiguos sin sobre se devuelven tal cual)
+
+    Raises:
+        DatosCorruptos: Si el JSON no es válido o la suma no coincide
+    """
+    try:
+        sobre = json.loads(contenido.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise DatosCorruptos(str(error)) from error
+
+    if not (isinstance(sobre, dict) and set(sobre) == {CLAVE_DATOS, CLAVE_SUMA}):
+        return sobre  # Formato anterior, sin suma de comprobación
+
+    datos = sobre[CLAVE_DATOS]
+    if zlib.crc32(_serializar(datos).encode('utf-8')) != sobre[CLAVE_SUMA]:
+        raise DatosCorruptos("La suma de comprobación no coincide")
+    return datos
+
+
+def guardar_json(nombre_archivo, datos, sincronizar=True):
+    """Guarda datos JSON con suma de comprobación y escritura atómica"""
+    escribir_atomico(nombre_archivo, empaquetar_json(datos), sincronizar)
+
+
+def cargar_json(nombre_archivo, por_defecto=None):
+    """
+    Carga un JSON guardado con guardar_json (o uno antiguo sin sobre).
+
+    Si el archivo está dañado se intenta con la copia de seguridad.
+
+    Args:
+        nombre_archivo (str): Archivo a leer
+        por_defecto: Valor si no existe el archivo ni su copia
+
+    Returns:
+        Los datos guardados
+
+    Raises:
+        DatosCorruptos: Si el archivo y su copia están dañados
+    """
+    error_original = None
+    for ruta in (nombre_archivo, nombre_archivo + SUFIJO_COPIA):
+        try:
+            with open(ruta, 'rb') as archivo:
+                return desempaquetar_json(archivo.read())
+        except FileNotFoundError:
+            continue
+        except DatosCorruptos as error:
+            error_original = error_original or error
+    if error_original is not None:
+        raise error_original
+    return por_defecto
+
+
+# =============================================
+# LOTES DE ESCRITURAS
+# =============================================
+
+class LoteEscrituras:
+    """
+    Agrupa escrituras JSON y las confirma juntas.
+
+    Uso típico:
+        with LoteEscrituras() as lote:
+            for bot in bots_terminados:
+                lote.guardar_json("record.json", {'record': mejor})
+        # al salir: una sola escritura por archivo y un fsync por directorio
+    """
+
+    def __init__(self, sincronizar=True):
+        """
+        Args:
+            sincronizar (bool): Si se hace fsync al confirmar
+        """
+        self.sincronizar = sincronizar
+        self.pendientes = {}
+
+    def guardar_json(self, nombre_archivo, datos):
+        """Deja pendiente la escritura; sustituye a otra anterior del mismo archivo"""
+        self.pendientes[nombre_archivo] = empaquetar_json(datos)
+
+    def confirmar(self):
+        """
+        Escribe todos los archivos pendientes.
+
+        Returns:
+            int: Número de archivos escritos
+        """
+        directorios = set()
+        for nombre_archivo, contenido in self.pendientes.items():
+            escribir_atomico(nombre_archivo, contenido, self.sincronizar,
+                             sincronizar_carpeta=False)
+            directorios.add(os.path.dirname(os.path.abspath(nombre_archivo)))
+        if self.sincronizar:
+            for directorio in directorios:
+                sincronizar_directorio(directorio)
+        escritos = len(self.pendientes)
+        self.pendientes = {}
+        return escritos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_error, error, traza):
+        if tipo_error is None:
+            self.confirmar()
+        return False
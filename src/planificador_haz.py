@@ -0,0 +1,291 @@
+"""
+Planificador de varias piezas por delante con búsqueda en haz.
+
+JugadorAutomatico (jugador_automatico.py) mira una sola pieza más. Este
+módulo busca 2..5 piezas de profundidad con la cola de próximas piezas
+(motor.proximos_tipos):
+
+- En cada nivel se expanden todos los tableros del haz con todas las
+  colocaciones de la pieza de ese nivel y se quedan los ANCHO_HAZ mejores
+  (haz = "beam").
+- Varias secuencias de jugadas llevan muchas veces al mismo tablero; una
+  tabla de transposición por nivel, con el tablero (sus máscaras de
+  columna) como clave, deja solo la de más valor.
+- Las expansiones de cada nivel se pueden repartir en lotes entre un
+  grupo de procesos (concurrent.futures); cada proceso devuelve solo los
+  mejores hijos de su lote para que la comunicación sea pequeña.
+- Hay un presupuesto de tiempo por jugada: si se agota, la jugada sale
+  del último nivel completo. Así el planificador puede llamarse desde
+  bucle_principal sin congelar la interfaz. La excepción es el nivel 0
+  (la pieza actual), que siempre se completa para tener alguna jugada;
+  solo cuesta una expansión de un tablero.
+- Con procesos, cada tarea recibe el mismo límite y lo comprueba ella
+  misma (perf_counter usa el reloj monótono del sistema, común a todos
+  los procesos). Future.cancel() no para una tarea que ya se está
+  ejecutando, así que no se envía trabajo nuevo mientras queden tareas de
+  antes en marcha: el tiempo que les falta sale del presupuesto.
+  Con presupuestos de pocos ms el viaje a otro proceso pesa más que lo
+  que se reparte: con profundidad 4 y 10 ms, en una máquina de un núcleo,
+  4 procesos completan unos 1,4-1,6 niveles por jugada frente a 1,8 en el
+  mismo proceso. Por eso el grupo es opcional (procesos=1 por defecto) y
+  solo tiene sentido con varios núcleos libres y presupuestos mayores.
+"""
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from colocaciones import enumerar_colocaciones, mascaras_columnas
+from jugador_automatico import PESOS, X_APARICION, EstadoTablero, Jugada, JugadorAutomatico
+from motor_tetris import FORMAS_COMPILADAS
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Piezas que se miran (la actual incluida)
+PROFUNDIDAD = 3
+
+# Tableros que se conservan en cada nivel
+ANCHO_HAZ = 24
+
+# Tiempo máximo para decidir una jugada (ms)
+PRESUPUESTO_MS = 10
+
+# Tableros del haz por tarea cuando se usan procesos
+TABLEROS_POR_LOTE = 8
+
+# =============================================
+# EXPANSIÓN DE UN NIVEL
+# =============================================
+
+def expandir_lote(lote, tipo, partida, ancho, pesos=PESOS, limite=None):
+    """
+    Hijos de unos cuantos tableros del haz con todas las colocaciones de 'tipo'.
+
+    Es una función de módulo para poder ejecutarla en otro proceso; los
+    tableros van y vienen como tuplas de máscaras de columna.
+
+    Args:
+        lote (list): (columnas, líneas acumuladas, primera jugada) de cada tablero
+        tipo (int): Pieza que se coloca en este nivel
+        partida (tuple): (rotación, x, y) de la que parte la pieza
+        ancho (int): Hijos que se devuelven como mucho
+        pesos (tuple): Pesos de la evaluación
+        limite (float): time.perf_counter() a partir del cual se abandona
+
+    Returns:
+        tuple: (hijos, repetidos): los 'ancho' mejores (valor, columnas,
+               líneas, primera jugada) sin tableros repetidos y cuántos
+               repetidos se descartaron; None si se pasó el límite
+    """
+    peso_lineas = pesos[1]
+    formas = FORMAS_COMPILADAS[tipo]
+    candidatos = []
+    for columnas, lineas, primera in lote:
+        if limite is not None and time.perf_counter() > limite:
+            return None
+        estado = EstadoTablero(list(columnas))
+        for rotacion, x, y in enumerar_colocaciones(None, tipo, *partida, columnas=estado.columnas):
+            valor, _ = estado.evaluar(formas[rotacion], x, y, pesos)
+            candidatos.append((valor + peso_lineas * lineas, estado, (rotacion, x, y),
+                               lineas, primera))
+
+    # Solo se construyen los tableros de los mejores candidatos
+    mejores = []
+    vistos = set()
+    repetidos = 0
+    for valor, estado, (rotacion, x, y), lineas, primera in heapq.nlargest(
+            ancho * 2, candidatos, key=lambda candidato: candidato[0]):
+        if limite is not None and time.perf_counter() > limite:
+            return None
+        nuevo, lineas_hijo = estado.colocar(formas[rotacion], x, y)
+        clave = tuple(nuevo.columnas)
+        if clave in vistos:
+            repetidos += 1  # Transposición: otra secuencia ya llegó con más valor
+            continue
+        vistos.add(clave)
+        mejores.append((valor, clave, lineas + lineas_hijo, primera or (rotacion, x, y)))
+        if len(mejores) == ancho:
+            break
+    return mejores, repetidos
+
+# =============================================
+# PLANIFICADOR
+# =============================================
+
+class PlanificadorHaz:
+    """
+    Búsqueda en haz con tabla de transposición y presupuesto de tiempo.
+
+    Uso típico:
+        planificador = PlanificadorHaz(profundidad=4)
+        jugada = planificador.elegir(columnas, (tipo, rot, x, y), motor.proximos_tipos(3))
+        planificador.cerrar()       # si se usaron procesos
+    """
+
+    def __init__(self, profundidad=PROFUNDIDAD, ancho_haz=ANCHO_HAZ,
+                 presupuesto_ms=PRESUPUESTO_MS, procesos=1, pesos=PESOS):
+        """
+        Args:
+            profundidad (int): Piezas que se miran, la actual incluida (2..5)
+            ancho_haz (int): Tableros que se conservan por nivel
+            presupuesto_ms (float): Tiempo máximo por jugada (None = sin límite)
+            procesos (int): Procesos para expandir (1 = en este mismo proceso,
+                            el valor por defecto; None = uno por núcleo)
+            pesos (tuple): Pesos de la evaluación (ver jugador_automatico.PESOS)
+        """
+        self.profundidad = profundidad
+        self.ancho_haz = ancho_haz
+        self.presupuesto_ms = presupuesto_ms
+        self.pesos = pesos
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+        self.procesos = procesos
+        self.grupo = ProcessPoolExecutor(procesos) if procesos > 1 else None
+        self.en_curso = []  # Tareas enviadas al grupo que aún no han terminado
+
+        # Estadísticas de la última jugada
+        self.niveles_completos = 0
+        self.transposiciones = 0
+
+    def cerrar(self):
+        """Detiene los procesos del grupo"""
+        if self.grupo is not None:
+            self.grupo.shutdown(cancel_futures=True)
+            self.grupo = None
+            self.en_curso = []
+
+    def _expandir(self, haz, tipo, partida, limite):
+        """
+        Expande un nivel entero (en lotes por el grupo de procesos si lo hay).
+
+        Returns:
+            list: Hijos de todos los lotes, o None si se acabó el tiempo
+        """
+        # Un solo lote (el nivel 0 siempre) no compensa el viaje a otro proceso
+        if self.grupo is None or len(haz) <= TABLEROS_POR_LOTE:
+            resultado = expandir_lote(haz, tipo, partida, self.ancho_haz, self.pesos, limite)
+            if resultado is None:
+                return None
+            hijos, repetidos = resultado
+            self.transposiciones += repetidos
+            return hijos
+
+        # Tareas de una jugada anterior que siguen ocupando procesos
+        espera = None if limite is None else max(0, limite - time.perf_counter())
+        _, self.en_curso = wait(self.en_curso, timeout=espera)
+        if self.en_curso:
+            return None
+
+        tareas = [
+            self.grupo.submit(expandir_lote, haz[inicio:inicio + TABLEROS_POR_LOTE],
+                              tipo, partida, self.ancho_haz, self.pesos, limite)
+            for inicio in range(0, len(haz), TABLEROS_POR_LOTE)
+        ]
+        espera = None if limite is None else max(0, limite - time.perf_counter())
+        hechas, pendientes = wait(tareas, timeout=espera)
+        if pendientes:
+            # Las que no han empezado se cancelan; las que corren paran solas al ver el límite
+            self.en_curso = [tarea for tarea in pendientes if not tarea.cancel()]
+            return None
+        hijos = []
+        for tarea in hechas:
+            resultado = tarea.result()
+            if resultado is None:
+                return None
+            hijos.extend(resultado[0])
+            self.transposiciones += resultado[1]
+        return hijos
+
+    def elegir(self, columnas, pieza, proximas=(), x_aparicion=X_APARICION):
+        """
+        Mejor colocación de la pieza actual mirando las próximas piezas.
+
+        Args:
+            columnas (list): Máscaras de columna del tablero
+            pieza (tuple): (tipo, rotación, x, y) de la pieza actual
+            proximas (list): Tipos de las próximas piezas (se usan profundidad - 1)
+            x_aparicion (int): x en la que aparecen las piezas nuevas
+
+        Returns:
+            Jugada: o None si la pieza actual no tiene ninguna colocación
+        """
+        limite = None
+        if self.presupuesto_ms is not None:
+            limite = time.perf_counter() + self.presupuesto_ms / 1000
+
+        tipos = [pieza[0]] + list(proximas)[:self.profundidad - 1]
+        haz = [(tuple(columnas), 0, None)]
+        mejor = None
+        self.niveles_completos = 0
+        self.transposiciones = 0
+
+        for nivel, tipo in enumerate(tipos):
+            partida = pieza[1:] if nivel == 0 else (0, x_aparicion, 0)
+            # El nivel 0 no tiene límite: la pieza actual siempre recibe una jugada
+            hijos = self._expandir(haz, tipo, partida, limite if nivel else None)
+            if not hijos:
+                break  # Sin tiempo, o ninguna colocación posible (fin de partida)
+
+            # Tabla de transposición del nivel: un tablero, una entrada (la mejor)
+            tabla = {}
+            for hijo in hijos:
+                anterior = tabla.get(hijo[1])
+                if anterior is None or hijo[0] > anterior[0]:
+                    tabla[hijo[1]] = hijo
+            self.transposiciones += len(hijos) - len(tabla)
+
+            seleccion = heapq.nlargest(self.ancho_haz, tabla.values(),
+                                       key=lambda hijo: hijo[0])
+            valor, _, _, primera = seleccion[0]
+            mejor = Jugada(primera[0], primera[1], primera[2], valor, False)
+            haz = [(clave, lineas, primera) for _, clave, lineas, primera in seleccion]
+            self.niveles_completos = nivel + 1
+
+        return mejor
+
+# =============================================
+# JUGADOR CON BÚSQUEDA EN HAZ
+# =============================================
+
+class JugadorHaz(JugadorAutomatico):
+    """
+    JugadorAutomatico que elige cada jugada con un PlanificadorHaz.
+
+    Misma interfaz (accion_para_motor, siguiente_accion); no usa la pieza
+    guardada (hold).
+    """
+
+    def __init__(self, profundidad=PROFUNDIDAD, ancho_haz=ANCHO_HAZ,
+                 presupuesto_ms=PRESUPUESTO_MS, procesos=1, pesos=PESOS):
+        super().__init__(pesos)
+        self.planificador = PlanificadorHaz(profundidad, ancho_haz, presupuesto_ms,
+                                            procesos, pesos)
+
+    def elegir_jugada(self, columnas, pieza, siguiente=None, guardada=None,
+                      puede_guardar=False, x_aparicion=X_APARICION):
+        """Como JugadorAutomatico.elegir_jugada, con 'siguiente' como lista de tipos"""
+        if siguiente is None:
+            proximas = []
+        elif isinstance(siguiente, int):
+            proximas = [siguiente]
+        else:
+            proximas = siguiente
+        return self.planificador.elegir(columnas, pieza, proximas, x_aparicion)
+
+    def accion_para_motor(self, motor):
+        """siguiente_accion() con la cola de próximas piezas del motor"""
+        if not motor.puede_actuar():
+            return None
+        pieza = motor.pieza_actual
+        return self.siguiente_accion(
+            mascaras_columnas(motor.tablero),
+            (pieza['tipo'], pieza['rotacion'], pieza['x'], pieza['y']),
+            motor.proximos_tipos(self.planificador.profundidad - 1),
+        )
+
+    def cerrar(self):
+        """Detiene los procesos del planificador"""
+        self.planificador.cerrar()
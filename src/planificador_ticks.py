@@ -0,0 +1,79 @@
+"""
+Planificador de ticks para el bucle de juego con Tkinter.
+
+Cada llamada a widget.after() programa una nueva ejecución; si el bucle de
+juego se llama desde varios sitios (tecla de bajada, reanudar la pausa...)
+se acumulan varias cadenas de after() a la vez y la pieza cae más rápido
+de lo que indica el nivel. PlanificadorTicks es el único dueño del
+identificador after pendiente: programar de nuevo siempre cancela el
+anterior, así que nunca hay más de un tick en espera.
+"""
+
+# =============================================
+# PLANIFICADOR
+# =============================================
+
+class PlanificadorTicks:
+    """
+    Mantiene como mucho un after() pendiente que llama a 'funcion'.
+
+    Uso típico:
+        planificador = PlanificadorTicks(ventana, bucle_juego)
+        planificador.programar(500)     # primer tick
+        planificador.cancelar()         # pausa o game over
+        planificador.reprogramar(300)   # cambio de nivel o caída suave
+    """
+
+    def __init__(self, widget, funcion):
+        """
+        Args:
+            widget (tk.Misc): Widget cuyo after() se usa (normalmente la ventana)
+            funcion (callable): Función sin argumentos que se ejecuta en cada tick
+        """
+        self.widget = widget
+        self.funcion = funcion
+        self.id_pendiente = None
+
+    def programar(self, milisegundos):
+        """Programa el próximo tick, cancelando el que hubiera pendiente"""
+        self.cancelar()
+        self.id_pendiente = self.widget.after(int(milisegundos), self._ejecutar)
+
+    def reprogramar(self, milisegundos):
+        """Vuelve a empezar la cuenta del tick pendiente con otro intervalo"""
+        self.programar(milisegundos)
+
+    def cancelar(self):
+        """Cancela el tick pendiente, si lo hay"""
+        if self.id_pendiente is not None:
+            self.widget.after_cancel(self.id_pendiente)
+            self.id_pendiente = None
+
+    def esta_programado(self):
+        """Indica si hay un tick pendiente"""
+        return self.id_pendiente is not None
+
+    def pendientes(self):
+        """Número de ticks pendientes de este planificador (0 o 1)"""
+        return 1 if self.id_pendiente is not None else 0
+
+    def _ejecutar(self):
+        """Ejecuta el tick; la función decide si programa el siguiente"""
+        self.id_pendiente = None
+        self.funcion()
+
+
+def temporizadores_tk(widget):
+    """
+    Cuenta todos los after() pendientes en el intérprete Tcl del widget.
+
+    Sirve para comprobar que no quedan bucles duplicados: con un único
+    PlanificadorTicks en marcha debería devolver 1.
+
+    Args:
+        widget (tk.Misc): Cualquier widget de la aplicación
+
+    Returns:
+        int: Número de temporizadores after() pendientes
+    """
+    return len(widget.tk.splitlist(widget.tk.call("after", "info")))
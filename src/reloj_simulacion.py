@@ -0,0 +1,87 @@
+"""
+Reloj de simulación de paso fijo.
+
+La simulación avanza en cuadros de duración fija (CUADROS_POR_SEGUNDO de
+motor_tetris.py) medidos con un reloj monotónico, independientemente de
+cada cuánto se dibuje. Si la interfaz se retrasa (Tk ocupado, ventana
+arrastrada...), el reloj indica cuántos cuadros hay que simular para
+ponerse al día, con un tope para no congelar la interfaz. Como la
+simulación solo avanza por cuadros enteros, el resultado no depende de la
+latencia de Tk y es reproducible.
+"""
+
+import time
+
+from motor_tetris import CUADROS_POR_SEGUNDO
+
+# =============================================
+# CONFIGURACIÓN DEL RELOJ
+# =============================================
+
+# Cuadros por segundo máximos del dibujo
+FPS_DIBUJO_MAXIMO = 60
+
+# Máximo de cuadros que se simulan de golpe para recuperar un retraso;
+# el tiempo que sobrepase este tope se descarta
+MAX_CUADROS_RECUPERACION = 15
+
+# =============================================
+# RELOJ
+# =============================================
+
+class RelojSimulacion:
+    """
+    Convierte tiempo real en un número entero de cuadros de simulación.
+
+    Uso típico en el bucle de dibujo:
+        for _ in range(reloj.avanzar()):
+            motor.avanzar_cuadro()
+        dibujar_juego()
+    """
+
+    def __init__(self, fps=CUADROS_POR_SEGUNDO, max_recuperacion=MAX_CUADROS_RECUPERACION,
+                 reloj=time.monotonic):
+        """
+        Args:
+            fps (int): Cuadros de simulación por segundo
+            max_recuperacion (int): Tope de cuadros simulados por llamada
+            reloj (callable): Fuente de tiempo monotónico en segundos
+        """
+        self.duracion_cuadro = 1.0 / fps
+        self.max_recuperacion = max_recuperacion
+        self.reloj = reloj
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Empieza a contar desde ahora, sin cuadros pendientes"""
+        self.ultimo_instante = self.reloj()
+        self.acumulado = 0.0
+        self.cuadros_descartados = 0
+
+    def reanudar(self):
+        """Continúa tras una pausa sin intentar recuperar el tiempo pausado"""
+        self.ultimo_instante = self.reloj()
+
+    def avanzar(self):
+        """
+        Mide el tiempo transcurrido desde la última llamada.
+
+        Returns:
+            int: Cuadros de simulación que hay que ejecutar ahora
+        """
+        ahora = self.reloj()
+        self.acumulado += ahora - self.ultimo_instante
+        self.ultimo_instante = ahora
+
+        cuadros = int(self.acumulado / self.duracion_cuadro)
+        self.acumulado -= cuadros * self.duracion_cuadro
+
+        if cuadros > self.max_recuperacion:
+            # Retraso demasiado grande: se simula el tope y se descarta el resto
+            self.cuadros_descartados += cuadros - self.max_recuperacion
+            cuadros = self.max_recuperacion
+        return cuadros
+
+    def intervalo_dibujo_ms(self, fps_dibujo=FPS_DIBUJO_MAXIMO):
+        """Milisegundos entre dibujos para no superar fps_dibujo"""
+        return max(1, int(1000 / fps_dibujo))
@@ -0,0 +1,249 @@
+"""
+Renderizador retenido del tablero de Tetris sobre un tk.Canvas.
+
+En lugar de borrar el lienzo con delete("all") y volver a crear cientos de
+rectángulos en cada cuadro, RenderizadorTablero crea una sola vez los
+rectángulos de todas las celdas, la cuadrícula y los de la pieza activa y
+la pieza fantasma. Después, en cada cuadro:
+
+- solo hace itemconfig(fill=...) sobre las celdas cuyo color cambió
+  desde el cuadro anterior, y
+- mueve los rectángulos de la pieza y del fantasma con coords().
+
+Si el juego usa MotorTetris, aplicar_cambios() recibe el CambiosTablero
+del motor y solo revisa las celdas y filas que el motor marcó, sin
+recorrer el tablero completo. Lo usan tanto main.py como la versión con
+velocidad (esta última compara el tablero entero con dibujar_tablero).
+"""
+
+# =============================================
+# RENDERIZADOR DEL TABLERO
+# =============================================
+
+class RenderizadorTablero:
+    """
+    Objetos del lienzo reutilizables para dibujar el tablero.
+
+    El orden de apilado es: celdas, fantasma, pieza activa, cuadrícula y
+    mensaje (el mensaje queda siempre encima).
+    """
+
+    # Rectángulos reservados para la pieza activa y para el fantasma
+    CELDAS_POR_PIEZA = 4
+
+    def __init__(self, lienzo, ancho, alto, tamano_bloque, colores,
+                 color_cuadricula, color_fantasma=None,
+                 contorno_pieza="white", dibujar_cuadricula=True):
+        """
+        Args:
+            lienzo (tk.Canvas): Lienzo donde dibujar
+            ancho, alto (int): Dimensiones del tablero en celdas
+            tamano_bloque (int): Tamaño de cada celda en píxeles
+            colores (list): Color de relleno por tipo de celda (0 = vacío)
+            color_cuadricula (str): Color del contorno de celdas y cuadrícula
+            color_fantasma (str): Contorno de la pieza fantasma (None = sin fantasma)
+            contorno_pieza (str): Contorno de la pieza activa
+            dibujar_cuadricula (bool): Si se dibujan líneas de cuadrícula encima
+        """
+        self.lienzo = lienzo
+        self.ancho = ancho
+        self.alto = alto
+        self.tamano_bloque = tamano_bloque
+        self.colores = colores
+
+        # Rectángulo de cada celda y el tipo que muestra actualmente
+        self.celdas = []
+        for fila in range(alto):
+            fila_items = []
+            for columna in range(ancho):
+                x1 = columna * tamano_bloque
+                y1 = fila * tamano_bloque
+                fila_items.append(lienzo.create_rectangle(
+                    x1, y1, x1 + tamano_bloque, y1 + tamano_bloque,
+                    fill=colores[0], outline=color_cuadricula
+                ))
+            self.celdas.append(fila_items)
+        self.tipos_mostrados = [[0] * ancho for _ in range(alto)]
+
+        # Pieza fantasma y pieza activa (ocultas hasta el primer dibujo)
+        self.items_fantasma = []
+        if color_fantasma is not None:
+            self.items_fantasma = [
+                lienzo.create_rectangle(0, 0, 0, 0, fill="", outline=color_fantasma,
+                                        width=2, state="hidden")
+                for _ in range(self.CELDAS_POR_PIEZA)
+            ]
+        self.items_pieza = [
+            lienzo.create_rectangle(0, 0, 0, 0, fill=colores[0], outline=contorno_pieza,
+                                    state="hidden")
+            for _ in range(self.CELDAS_POR_PIEZA)
+        ]
+        self.color_pieza = None
+        self.items_visibles = set()
+
+        # Cuadrícula
+        if dibujar_cuadricula:
+            ancho_lienzo = ancho * tamano_bloque
+            alto_lienzo = alto * tamano_bloque
+            for x in range(0, ancho_lienzo + 1, tamano_bloque):
+                lienzo.create_line(x, 0, x, alto_lienzo, fill=color_cuadricula)
+            for y in range(0, alto_lienzo + 1, tamano_bloque):
+                lienzo.create_line(0, y, ancho_lienzo, y, fill=color_cuadricula)
+
+        # Mensaje central (pausa, game over)
+        ancho_lienzo = ancho * tamano_bloque
+        alto_lienzo = alto * tamano_bloque
+        self.fondo_mensaje = lienzo.create_rectangle(
+            ancho_lienzo * 0.1, alto_lienzo * 0.4,
+            ancho_lienzo * 0.9, alto_lienzo * 0.6,
+            fill="black", width=2, state="hidden"
+        )
+        self.texto_mensaje = lienzo.create_text(
+            ancho_lienzo // 2, alto_lienzo // 2,
+            text="", font=("Arial", 24, "bold"), state="hidden"
+        )
+        self.mensaje_actual = None
+
+    # -----------------------------------------
+    # Tablero
+    # -----------------------------------------
+
+    def dibujar_tablero(self, filas):
+        """
+        Actualiza las celdas cuyo tipo cambió desde el último dibujo.
+
+        Args:
+            filas (list): Matriz alto x ancho con el tipo de cada celda
+
+        Returns:
+            int: Número de celdas que se actualizaron en el lienzo
+        """
+        lienzo = self.lienzo
+        colores = self.colores
+        actualizadas = 0
+        for fila in range(self.alto):
+            tipos_fila = filas[fila]
+            mostrados_fila = self.tipos_mostrados[fila]
+            if tipos_fila == mostrados_fila:
+                continue
+            items_fila = self.celdas[fila]
+            for columna in range(self.ancho):
+                tipo = tipos_fila[columna]
+                if tipo != mostrados_fila[columna]:
+                    lienzo.itemconfig(items_fila[columna], fill=colores[tipo])
+                    mostrados_fila[columna] = tipo
+                    actualizadas += 1
+        return actualizadas
+
+    def _actualizar_celda(self, columna, fila, tipo):
+        """Cambia el color de una celda si su tipo cambió"""
+        if self.tipos_mostrados[fila][columna] != tipo:
+            self.lienzo.itemconfig(self.celdas[fila][columna], fill=self.colores[tipo])
+            self.tipos_mostrados[fila][columna] = tipo
+            return 1
+        return 0
+
+    def aplicar_cambios(self, cambios, filas, tipo_pieza=None):
+        """
+        Dibuja solo lo indicado en un CambiosTablero del motor.
+
+        Args:
+            cambios (CambiosTablero): Cambios devueltos por tomar_cambios()
+            filas (list): Matriz alto x ancho con el tipo de cada celda
+            tipo_pieza (int): Tipo de la pieza activa (para su color)
+
+        Returns:
+            int: Número de objetos del lienzo modificados
+        """
+        modificados = 0
+        if cambios.todo:
+            modificados += self.dibujar_tablero(filas)
+        else:
+            for fila in cambios.filas:
+                for columna in range(self.ancho):
+                    modificados += self._actualizar_celda(columna, fila, filas[fila][columna])
+            for columna, fila in cambios.celdas:
+                if fila not in cambios.filas:
+                    modificados += self._actualizar_celda(columna, fila, filas[fila][columna])
+
+        if cambios.fantasma is not None:
+            self.dibujar_fantasma(cambios.fantasma)
+            modificados += len(self.items_fantasma)
+        if cambios.pieza is not None:
+            if tipo_pieza is None:
+                self.ocultar_piezas()
+            else:
+                self.dibujar_pieza(cambios.pieza, tipo_pieza)
+            modificados += len(self.items_pieza)
+        return modificados
+
+    # -----------------------------------------
+    # Pieza activa y fantasma
+    # -----------------------------------------
+
+    def _colocar_items(self, items, celdas):
+        """Mueve los rectángulos a las celdas visibles y oculta el resto"""
+        lienzo = self.lienzo
+        tamano = self.tamano_bloque
+        visibles = [(columna, fila) for columna, fila in celdas if fila >= 0]
+        for indice, item in enumerate(items):
+            if indice < len(visibles):
+                columna, fila = visibles[indice]
+                x1 = columna * tamano
+                y1 = fila * tamano
+                lienzo.coords(item, x1, y1, x1 + tamano, y1 + tamano)
+                if item not in self.items_visibles:
+                    lienzo.itemconfig(item, state="normal")
+                    self.items_visibles.add(item)
+            elif item in self.items_visibles:
+                lienzo.itemconfig(item, state="hidden")
+                self.items_visibles.discard(item)
+
+    def dibujar_pieza(self, celdas, tipo):
+        """
+        Coloca la pieza activa.
+
+        Args:
+            celdas (list): Celdas absolutas (columna, fila) de la pieza
+            tipo (int): Tipo de la pieza (índice en la paleta)
+        """
+        color = self.colores[tipo]
+        if color != self.color_pieza:
+            for item in self.items_pieza:
+                self.lienzo.itemconfig(item, fill=color)
+            self.color_pieza = color
+        self._colocar_items(self.items_pieza, celdas)
+
+    def dibujar_fantasma(self, celdas):
+        """Coloca la pieza fantasma en las celdas absolutas dadas"""
+        self._colocar_items(self.items_fantasma, celdas)
+
+    def ocultar_piezas(self):
+        """Oculta la pieza activa y la pieza fantasma"""
+        self._colocar_items(self.items_pieza, [])
+        self._colocar_items(self.items_fantasma, [])
+
+    # -----------------------------------------
+    # Mensajes
+    # -----------------------------------------
+
+    def mostrar_mensaje(self, texto, color):
+        """Muestra un mensaje en el centro del lienzo"""
+        if self.mensaje_actual == (texto, color):
+            return
+        self.lienzo.itemconfig(self.fondo_mensaje, outline=color, state="normal")
+        self.lienzo.itemconfig(self.texto_mensaje, text=texto, fill=color, state="normal")
+        self.mensaje_actual = (texto, color)
+
+    def ocultar_mensaje(self):
+        """Oculta el mensaje central"""
+        if self.mensaje_actual is None:
+            return
+        self.lienzo.itemconfig(self.fondo_mensaje, state="hidden")
+        self.lienzo.itemconfig(self.texto_mensaje, state="hidden")
+        self.mensaje_actual = None
+
+
+def celdas_absolutas(forma, pos_x, pos_y):
+    """Convierte las celdas de una FormaCompilada en celdas del tablero"""
+    return [(pos_x + dx, pos_y + dy) for dx, dy in forma.celdas]
@@ -0,0 +1,275 @@
+"""
+Repeticiones compactas de partidas de Tetris.
+
+Como MotorTetris es determinista (semilla del generador + simulación de
+paso fijo), para reproducir una partida basta con guardar la semilla y la
+lista de acciones del jugador con el cuadro de simulación en que ocurrió
+cada una. La gravedad no se guarda: al reproducir, los cuadros entre una
+acción y la siguiente se vuelven a simular con el mismo motor.
+
+Formato binario (todos los enteros son varints LEB128 sin signo):
+
+    b"TTRP"                     identificador
+    versión (1 byte)
+    modo del generador (1 byte: 0 = uniforme, 1 = bolsa)
+    semilla
+    eventos: (cuadros desde el evento anterior << 3) | acción
+    ... terminados por un evento ACCION_FIN en el último cuadro
+    puntuación, líneas y nivel finales (para verificar)
+
+Casi todos los eventos ocupan 1 o 2 bytes, así que una partida de 10
+minutos ocupa unos pocos KB.
+"""
+
+import random
+
+from motor_tetris import MotorTetris, VELOCIDAD_MINIMA
+from generador_piezas import MODO_UNIFORME, MODO_BOLSA
+from tablero_bits import TableroBits
+from persistencia import escribir_atomico
+
+# =============================================
+# CONFIGURACIÓN DEL FORMATO
+# =============================================
+
+IDENTIFICADOR = b"TTRP"
+VERSION = 1
+
+# Acciones (3 bits)
+ACCION_FIN = 0
+ACCION_IZQUIERDA = 1
+ACCION_DERECHA = 2
+ACCION_ROTAR = 3
+ACCION_BAJAR = 4
+ACCION_CAIDA_RAPIDA = 5
+BITS_ACCION = 3
+
+# Método del motor que ejecuta cada acción
+METODOS_ACCIONES = {
+    ACCION_IZQUIERDA: "mover_izquierda",
+    ACCION_DERECHA: "mover_derecha",
+    ACCION_ROTAR: "rotar_pieza",
+    ACCION_BAJAR: "caida_suave",
+    ACCION_CAIDA_RAPIDA: "caida_rapida",
+}
+
+CODIGOS_MODO = {MODO_UNIFORME: 0, MODO_BOLSA: 1}
+MODOS_POR_CODIGO = {codigo: modo for modo, codigo in CODIGOS_MODO.items()}
+
+
+class RepeticionInvalida(ValueError):
+    """El archivo no es una repetición válida"""
+
+
+# =============================================
+# VARINTS
+# =============================================
+
+def escribir_varint(destino, valor):
+    """Añade 'valor' (entero >= 0) a un bytearray como varint LEB128"""
+    while valor >= 0x80:
+        destino.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    destino.append(valor)
+
+
+def leer_varint(datos, posicion):
+    """
+    Lee un varint de 'datos' a partir de 'posicion'.
+
+    Returns:
+        tuple: (valor, posición siguiente)
+    """
+    valor = 0
+    desplazamiento = 0
+    while True:
+        if posicion >= len(datos):
+            raise RepeticionInvalida("Repetición truncada")
+        byte = datos[posicion]
+        posicion += 1
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return valor, posicion
+        desplazamiento += 7
+
+
+def nueva_semilla():
+    """Semilla aleatoria del sistema para una partida que se va a grabar"""
+    return random.SystemRandom().getrandbits(63)
+
+
+# =============================================
+# GRABACIÓN
+# =============================================
+
+class GrabadorRepeticion:
+    """
+    Va escribiendo las acciones de una partida en formato binario.
+
+    Uso típico:
+        grabador = GrabadorRepeticion(semilla)
+        grabador.registrar(motor.cuadro, ACCION_IZQUIERDA)   # en cada tecla
+        datos = grabador.finalizar(motor)                     # al terminar
+    """
+
+    def __init__(self, semilla, modo_generador=MODO_UNIFORME):
+        """
+        Args:
+            semilla (int): Semilla del generador de la partida (>= 0)
+            modo_generador (str): MODO_UNIFORME o MODO_BOLSA
+        """
+        self.semilla = semilla
+        self.modo_generador = modo_generador
+        self.datos = bytearray(IDENTIFICADOR)
+        self.datos.append(VERSION)
+        self.datos.append(CODIGOS_MODO[modo_generador])
+        escribir_varint(self.datos, semilla)
+        self.ultimo_cuadro = 0
+        self.eventos = 0
+        self.finalizada = False
+
+    def registrar(self, cuadro, accion):
+        """
+        Añade una acción del jugador.
+
+        Args:
+            cuadro (int): motor.cuadro en el momento de la acción
+            accion (int): Una de las constantes ACCION_*
+        """
+        if self.finalizada:
+            return
+        escribir_varint(self.datos, ((cuadro - self.ultimo_cuadro) << BITS_ACCION) | accion)
+        self.ultimo_cuadro = cuadro
+        self.eventos += 1
+
+    def finalizar(self, motor):
+        """
+        Cierra la repetición con el último cuadro y el resultado final.
+
+        Args:
+            motor (MotorTetris): Motor de la partida grabada
+
+        Returns:
+            bytes: Repetición completa
+        """
+        if not self.finalizada:
+            self.registrar(motor.cuadro, ACCION_FIN)
+            escribir_varint(self.datos, motor.puntuacion)
+            escribir_varint(self.datos, motor.lineas_completadas)
+            escribir_varint(self.datos, motor.nivel)
+            self.finalizada = True
+        return bytes(self.datos)
+
+    def guardar(self, nombre_archivo, motor):
+        """Finaliza la repetición y la escribe en un archivo"""
+        return guardar_repeticion(nombre_archivo, self.finalizar(motor))
+
+
+def guardar_repeticion(nombre_archivo, datos):
+    """Escribe una repetición ya finalizada (se puede llamar desde otro hilo)"""
+    try:
+        escribir_atomico(nombre_archivo, datos, copia_seguridad=False)
+        return True
+    except OSError as e:
+        print(f"Error guardando {nombre_archivo}: {e}")
+        return False
+
+
+# =============================================
+# LECTURA Y REPRODUCCIÓN
+# =============================================
+
+def leer_repeticion(datos):
+    """
+    Decodifica una repetición.
+
+    Args:
+        datos (bytes): Contenido del archivo
+
+    Returns:
+        dict: {'semilla', 'modo_generador', 'eventos': [(cuadro, accion), ...],
+               'resultado': (puntuacion, lineas, nivel)}
+    """
+    if datos[:len(IDENTIFICADOR)] != IDENTIFICADOR:
+        raise RepeticionInvalida("No es un archivo de repetición")
+    posicion = len(IDENTIFICADOR)
+    if len(datos) < posicion + 2:
+        raise RepeticionInvalida("Repetición truncada")
+    version = datos[posicion]
+    if version != VERSION:
+        raise RepeticionInvalida(f"Versión de repetición no soportada: {version}")
+    modo = MODOS_POR_CODIGO.get(datos[posicion + 1])
+    if modo is None:
+        raise RepeticionInvalida("Modo de generador desconocido")
+    semilla, posicion = leer_varint(datos, posicion + 2)
+
+    eventos = []
+    cuadro = 0
+    while True:
+        valor, posicion = leer_varint(datos, posicion)
+        cuadro += valor >> BITS_ACCION
+        accion = valor & ((1 << BITS_ACCION) - 1)
+        if accion != ACCION_FIN and accion not in METODOS_ACCIONES:
+            raise RepeticionInvalida(f"Acción desconocida: {accion}")
+        eventos.append((cuadro, accion))
+        if accion == ACCION_FIN:
+            break
+
+    resultado = []
+    for _ in range(3):
+        valor, posicion = leer_varint(datos, posicion)
+        resultado.append(valor)
+
+    return {
+        'semilla': semilla,
+        'modo_generador': modo,
+        'eventos': eventos,
+        'resultado': tuple(resultado),
+    }
+
+
+def reproducir_repeticion(datos, clase_tablero=TableroBits,
+                          velocidad_minima=VELOCIDAD_MINIMA):
+    """
+    Vuelve a jugar una repetición sin interfaz, tan rápido como se pueda.
+
+    Los cuadros sin acciones se saltan con avanzar_cuadros(), que solo
+    simula los cuadros en los que la pieza baja.
+
+    Args:
+        datos (bytes): Repetición
+        clase_tablero: Representación del tablero del motor
+        velocidad_minima (int): La misma que usó la partida grabada
+
+    Returns:
+        MotorTetris: Motor en el estado final de la partida
+    """
+    repeticion = leer_repeticion(datos)
+    motor = MotorTetris(semilla=repeticion['semilla'], clase_tablero=clase_tablero,
+                        modo_generador=repeticion['modo_generador'])
+    metodos = {accion: getattr(motor, nombre) for accion, nombre in METODOS_ACCIONES.items()}
+
+    for cuadro, accion in repeticion['eventos']:
+        if cuadro > motor.cuadro:
+            motor.avanzar_cuadros(cuadro - motor.cuadro, velocidad_minima)
+        if accion != ACCION_FIN:
+            metodos[accion]()
+    return motor
+
+
+def verificar_repeticion(datos, clase_tablero=TableroBits):
+    """
+    Comprueba que la repetición reproduce el resultado que tiene guardado.
+
+    Returns:
+        bool: True si puntuación, líneas y nivel coinciden
+    """
+    resultado = leer_repeticion(datos)['resultado']
+    motor = reproducir_repeticion(datos, clase_tablero)
+    return (motor.puntuacion, motor.lineas_completadas, motor.nivel) == resultado
+
+
+def cargar_repeticion(nombre_archivo):
+    """Lee el contenido binario de un archivo de repetición"""
+    with open(nombre_archivo, 'rb') as archivo:
+        return archivo.read()
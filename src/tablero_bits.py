@@ -0,0 +1,153 @@
+"""
+Tablero de Tetris representado con máscaras de bits.
+
+Cada una de las ALTO_TABLERO filas es un entero en el que el bit 'x'
+vale 1 si la columna 'x' está ocupada. Cada rotación de FORMAS_PIEZAS se
+precompila (a partir de FORMAS_COMPILADAS), para cada posición horizontal
+válida, en una tupla de (desplazamiento_y, máscara_de_fila). Así verificar
+una colisión son unas pocas operaciones AND y una fila llena es
+simplemente fila == FILA_LLENA.
+
+TableroBits ofrece la misma interfaz que TableroLista (motor_tetris.py) y
+el mismo resultado en todas las operaciones; se elige al crear el motor:
+
+    motor = MotorTetris(clase_tablero=TableroBits)
+"""
+
+from motor_tetris import (
+    ANCHO_TABLERO, ALTO_TABLERO, FORMAS_COMPILADAS,
+    actualizar_alturas_tras_lineas, calcular_alturas, distancia_caida_por_alturas
+)
+
+# Máscara de una fila completamente ocupada
+FILA_LLENA = (1 << ANCHO_TABLERO) - 1
+
+# Posición horizontal más a la izquierda que puede tener una matriz de
+# forma (las matrices tienen como mucho 4 columnas)
+X_MINIMA = -3
+
+# =============================================
+# PRECOMPILACIÓN DE LAS FORMAS
+# =============================================
+
+def compilar_mascaras(forma):
+    """
+    Precompila una forma en máscaras de fila por posición horizontal.
+
+    Args:
+        forma (FormaCompilada): Forma con sus celdas ocupadas
+
+    Returns:
+        list: Para cada x desde X_MINIMA hasta ANCHO_TABLERO - 1, una tupla
+              de (desplazamiento_y, máscara) o None si la forma se sale por
+              una pared en esa posición
+    """
+    mascaras_fila = {}
+    for dx, dy in forma.celdas:
+        mascaras_fila[dy] = mascaras_fila.get(dy, 0) | (1 << dx)
+    filas_forma = sorted(mascaras_fila.items())
+
+    por_posicion = []
+    for pos_x in range(X_MINIMA, ANCHO_TABLERO):
+        if pos_x + forma.min_x < 0 or pos_x + forma.max_x >= ANCHO_TABLERO:
+            por_posicion.append(None)
+        elif pos_x >= 0:
+            por_posicion.append(tuple((dy, m << pos_x) for dy, m in filas_forma))
+        else:
+            por_posicion.append(tuple((dy, m >> -pos_x) for dy, m in filas_forma))
+    return por_posicion
+
+
+# MASCARAS_PIEZAS[tipo][rotacion][x - X_MINIMA] -> ((dy, máscara), ...) o None
+MASCARAS_PIEZAS = [
+    [compilar_mascaras(forma) for forma in rotaciones]
+    for rotaciones in FORMAS_COMPILADAS
+]
+
+# =============================================
+# TABLERO
+# =============================================
+
+class TableroBits:
+    """
+    Tablero con una máscara de bits por fila.
+
+    'bits' es la representación que usan las colisiones y las líneas;
+    'filas' guarda además el tipo de pieza de cada celda para poder
+    dibujarla, y solo se modifica al fijar piezas y al eliminar líneas.
+    """
+
+    def __init__(self):
+        self.bits = [0] * ALTO_TABLERO
+        self.filas = [[0] * ANCHO_TABLERO for _ in range(ALTO_TABLERO)]
+        self.alturas = [0] * ANCHO_TABLERO
+
+    @classmethod
+    def desde_filas(cls, filas):
+        """Tablero con una copia de la matriz de filas dada (p. ej. una situación de prueba)"""
+        tablero = cls()
+        tablero.filas = [list(fila) for fila in filas]
+        tablero.bits = [sum(1 << columna for columna, valor in enumerate(fila) if valor)
+                        for fila in tablero.filas]
+        tablero.alturas = calcular_alturas(tablero.filas)
+        return tablero
+
+    def colisiona(self, tipo, rotacion, pos_x, pos_y):
+        """Verifica si la pieza colisiona con paredes, suelo u otras piezas"""
+        por_posicion = MASCARAS_PIEZAS[tipo][rotacion]
+        indice = pos_x - X_MINIMA
+        if indice < 0 or indice >= len(por_posicion):
+            return True
+
+        mascaras = por_posicion[indice]
+        if mascaras is None:
+            return True  # Se sale por una pared
+
+        bits = self.bits
+        for desplazamiento_y, mascara in mascaras:
+            fila = pos_y + desplazamiento_y
+            if fila >= ALTO_TABLERO:
+                return True
+            if fila >= 0 and bits[fila] & mascara:
+                return True
+        return False
+
+    def fijar(self, tipo, rotacion, pos_x, pos_y):
+        """Escribe la pieza en el tablero"""
+        bits = self.bits
+        for desplazamiento_y, mascara in MASCARAS_PIEZAS[tipo][rotacion][pos_x - X_MINIMA]:
+            # Solo fijar si está dentro del tablero visible
+            if pos_y + desplazamiento_y >= 0:
+                bits[pos_y + desplazamiento_y] |= mascara
+
+        filas = self.filas
+        alturas = self.alturas
+        for dx, dy in FORMAS_COMPILADAS[tipo][rotacion].celdas:
+            if pos_y + dy >= 0:
+                filas[pos_y + dy][pos_x + dx] = tipo
+                if ALTO_TABLERO - (pos_y + dy) > alturas[pos_x + dx]:
+                    alturas[pos_x + dx] = ALTO_TABLERO - (pos_y + dy)
+
+    def distancia_caida(self, tipo, rotacion, pos_x, pos_y):
+        """Filas que puede caer la pieza desde (pos_x, pos_y), que es válida"""
+        return distancia_caida_por_alturas(self, tipo, rotacion, pos_x, pos_y)
+
+    def esta_ocupada(self, columna, fila):
+        """Indica si la celda (columna, fila) del tablero está ocupada"""
+        return (self.bits[fila] >> columna) & 1 == 1
+
+    def eliminar_lineas_completas(self):
+        """Elimina las filas llenas, devuelve cuántas eliminó"""
+        bits = self.bits
+        if FILA_LLENA not in bits:
+            return 0
+
+        filas = self.filas
+        conservar = [i for i in range(ALTO_TABLERO) if bits[i] != FILA_LLENA]
+        lineas_eliminadas = ALTO_TABLERO - len(conservar)
+
+        self.bits = [0] * lineas_eliminadas + [bits[i] for i in conservar]
+        self.filas = ([[0] * ANCHO_TABLERO for _ in range(lineas_eliminadas)]
+                      + [filas[i] for i in conservar])
+        actualizar_alturas_tras_lineas(self, lineas_eliminadas)
+        return lineas_eliminadas
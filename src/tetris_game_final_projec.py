@@ -1,6 +1,6 @@
 import tkinter as tk
 import random
-import json
+from persistencia import DatosCorruptos, cargar_json, guardar_json
 
 # --- 1. Constantes del Juego (Expandidas) ---
 
@@ -321,18 +321,16 @@ def toggle_pause():
 # --- Lógica de JSON ---
 
 def load_high_score():
+    # Mismo formato (con suma CRC32) que la versión con velocidad
     try:
-        with open(HIGH_SCORE_FILE, 'r') as f:
-            data = json.load(f)
-            return data.get('high_score', 0)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return cargar_json(HIGH_SCORE_FILE, {}).get('high_score', 0)
+    except (DatosCorruptos, AttributeError):
         return 0
 
 def save_high_score(new_score):
     data = {'high_score': new_score}
     try:
-        with open(HIGH_SCORE_FILE, 'w') as f:
-            json.dump(data, f)
+        guardar_json(HIGH_SCORE_FILE, data)  # Escritura atómica
     except IOError as e:
         print(f"No se pudo guardar el récord: {e}")
 
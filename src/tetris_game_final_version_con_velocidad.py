@@ -16,8 +16,18 @@ Versión: 1.0
 """
 
 import tkinter as tk
-import random
-import json
+
+from formas_piezas import compilar_formas
+from renderizador import RenderizadorTablero, celdas_absolutas
+from planificador_ticks import PlanificadorTicks
+from generador_piezas import GeneradorPiezas
+from panel_informacion import PanelInformacion
+from persistencia import DatosCorruptos, cargar_json, guardar_json
+from colocaciones import mascaras_columnas
+from jugador_automatico import ACCION_GUARDAR, JugadorAutomatico
+from repeticion import (
+    ACCION_BAJAR, ACCION_CAIDA_RAPIDA, ACCION_DERECHA, ACCION_IZQUIERDA, ACCION_ROTAR
+)
 
 # ============================================================================
 # CONFIGURACIÓN Y CONSTANTES DEL JUEGO
@@ -53,6 +63,7 @@ BASE_SPEED = 500          # Velocidad inicial en milisegundos
 SPEED_DECREMENT = 40      # Reducción de velocidad por nivel
 MIN_SPEED = 100           # Velocidad mínima (máxima dificultad)
 LEVEL_UP_LINES = 10       # Líneas necesarias para subir de nivel
+AUTO_PLAY_INTERVAL = 50   # Milisegundos entre acciones del jugador automático
 
 # ----------------------------------------------------------------------------
 # Sistema de puntuación
@@ -144,14 +155,20 @@ PIECE_SHAPES = [
     ]
 ]
 
+# Tabla precompilada: PIECE_SHAPES_COMPILED[tipo][rotacion] -> FormaCompilada
+# (celdas ocupadas y medidas, calculadas una sola vez al importar)
+PIECE_SHAPES_COMPILED = compilar_formas(PIECE_SHAPES, BOARD_WIDTH)
+
 # ============================================================================
 # VARIABLES GLOBALES DE ESTADO
 # ============================================================================
 
 # Estado del tablero
 board_state = []          # Matriz que representa el estado del tablero
+column_heights = [0] * BOARD_WIDTH  # Altura de cada columna (0 = vacía)
 
 # Estado del juego
+piece_generator = GeneradorPiezas()  # Secuencia de piezas propia de la partida
 current_piece = None      # Pieza actual en movimiento
 next_piece = None         # Siguiente pieza que aparecerá
 held_piece = None         # Pieza guardada (puede ser None)
@@ -169,12 +186,17 @@ is_paused = False         # True si el juego está en pausa
 
 # Referencias a widgets de Tkinter
 window = None             # Ventana principal
+gravity_scheduler = None  # Planificador del tick de gravedad
+auto_scheduler = None     # Planificador de las acciones del jugador automático
+auto_player = None        # Jugador automático (tecla A), None si juega la persona
 canvas = None             # Lienzo principal del juego
+board_renderer = None     # Objetos reutilizables del lienzo principal
 next_canvas = None        # Lienzo para mostrar siguiente pieza
 hold_canvas = None        # Lienzo para mostrar pieza guardada
 score_label = None        # Etiqueta para mostrar puntuación
 high_score_label = None   # Etiqueta para mostrar récord
 level_label = None        # Etiqueta para mostrar nivel
+info_panel = None         # Último texto de cada etiqueta del panel
 
 # ============================================================================
 # FUNCIONES DE UTILIDAD GENERAL
@@ -190,6 +212,22 @@ def crear_tablero_vacio():
     return [[0 for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
 
 
+def recalcular_alturas():
+    """
+    Recalcula column_heights a partir de board_state.
+    
+    Se usa al crear el tablero y tras eliminar líneas; al fijar una pieza
+    basta con actualizar las columnas que ocupa.
+    """
+    for x in range(BOARD_WIDTH):
+        altura = 0
+        for y in range(BOARD_HEIGHT):
+            if board_state[y][x] != 0:
+                altura = BOARD_HEIGHT - y
+                break
+        column_heights[x] = altura
+
+
 def crear_pieza_aleatoria():
     """
     Crea una nueva pieza aleatoria.
@@ -197,7 +235,7 @@ def crear_pieza_aleatoria():
     Returns:
         dict: Diccionario con la información de la pieza
     """
-    shape_index = random.randint(1, 7)  # Índice entre 1 y 7 (excluye vacío)
+    shape_index = piece_generator.siguiente_tipo()  # Índice entre 1 y 7 (excluye vacío)
     
     return {
         'shape_index': shape_index,
@@ -209,18 +247,18 @@ def crear_pieza_aleatoria():
 
 def obtener_forma_actual():
     """
-    Obtiene la forma matricial de la pieza actual.
+    Obtiene la forma compilada de la pieza actual.
     
     Returns:
-        list: Matriz que representa la forma actual de la pieza
+        FormaCompilada: Celdas ocupadas de la forma actual (o None)
     """
     if not current_piece:
-        return []
+        return None
     
     shape_index = current_piece['shape_index']
     rotation = current_piece['rotation']
     
-    return PIECE_SHAPES[shape_index][rotation]
+    return PIECE_SHAPES_COMPILED[shape_index][rotation]
 
 
 def leer_puntuacion_maxima():
@@ -231,10 +269,9 @@ def leer_puntuacion_maxima():
         int: Puntuación máxima guardada, o 0 si hay error
     """
     try:
-        with open(HIGH_SCORE_FILE, 'r') as archivo:
-            datos = json.load(archivo)
-            return datos.get('high_score', 0)
-    except (FileNotFoundError, json.JSONDecodeError):
+        datos = cargar_json(HIGH_SCORE_FILE, {})
+        return datos.get('high_score', 0)
+    except (DatosCorruptos, AttributeError):
         return 0
 
 
@@ -248,8 +285,7 @@ def guardar_puntuacion_maxima(nuevo_record):
     datos = {'high_score': nuevo_record}
     
     try:
-        with open(HIGH_SCORE_FILE, 'w') as archivo:
-            json.dump(datos, archivo, indent=2)
+        guardar_json(HIGH_SCORE_FILE, datos)  # Escritura atómica
     except IOError as error:
         print(f"Error al guardar el récord: {error}")
 
@@ -263,30 +299,26 @@ def verificar_colision(forma, x, y):
     Verifica si una forma en posición (x, y) colisiona con algo.
     
     Args:
-        forma (list): Matriz que representa la forma
+        forma (FormaCompilada): Forma precompilada de la pieza
         x (int): Posición horizontal
         y (int): Posición vertical
         
     Returns:
         bool: True si hay colisión, False si la posición es válida
     """
-    for y_offset, fila in enumerate(forma):
-        for x_offset, valor_celda in enumerate(fila):
-            if valor_celda != 0:
-                tablero_x = x + x_offset
-                tablero_y = y + y_offset
-                
-                # Verificar límites izquierdo/derecho
-                if tablero_x < 0 or tablero_x >= BOARD_WIDTH:
-                    return True
-                
-                # Verificar límite inferior
-                if tablero_y >= BOARD_HEIGHT:
-                    return True
-                
-                # Verificar colisión con otras piezas (solo dentro del tablero)
-                if tablero_y >= 0 and board_state[tablero_y][tablero_x] != 0:
-                    return True
+    # Verificar límites izquierdo/derecho
+    if x + forma.min_x < 0 or x + forma.max_x >= BOARD_WIDTH:
+        return True
+    
+    # Verificar límite inferior
+    if y + forma.max_y >= BOARD_HEIGHT:
+        return True
+    
+    # Verificar colisión con otras piezas (solo dentro del tablero)
+    for x_offset, y_offset in forma.celdas:
+        tablero_y = y + y_offset
+        if tablero_y >= 0 and board_state[tablero_y][x + x_offset] != 0:
+            return True
     
     return False
 
@@ -302,11 +334,11 @@ def fijar_pieza_actual():
     pieza_y = current_piece['y']
     color_index = current_piece['shape_index']
     
-    for y, fila in enumerate(forma):
-        for x, valor_celda in enumerate(fila):
-            if valor_celda != 0:
-                if pieza_y + y >= 0:  # Solo fijar si está dentro del tablero
-                    board_state[pieza_y + y][pieza_x + x] = color_index
+    for x, y in forma.celdas:
+        if pieza_y + y >= 0:  # Solo fijar si está dentro del tablero
+            board_state[pieza_y + y][pieza_x + x] = color_index
+            column_heights[pieza_x + x] = max(column_heights[pieza_x + x],
+                                              BOARD_HEIGHT - (pieza_y + y))
 
 
 def limpiar_lineas_completas():
@@ -331,6 +363,7 @@ def limpiar_lineas_completas():
         
         # Combinar filas vacías con el nuevo tablero
         board_state = filas_vacias + nuevo_tablero
+        recalcular_alturas()
     
     return lineas_eliminadas
 
@@ -377,7 +410,7 @@ def actualizar_puntuacion_y_nivel(lineas_eliminadas):
     # 1. Actualizar puntuación
     puntos_base = SCORE_VALUES.get(lineas_eliminadas, 0)
     score += puntos_base * level
-    score_label.config(text=f"Puntuación:\n{score}")
+    info_panel.mostrar("puntuacion", f"Puntuación:\n{score}")
     
     # 2. Actualizar nivel
     lines_cleared_count += lineas_eliminadas
@@ -385,12 +418,16 @@ def actualizar_puntuacion_y_nivel(lineas_eliminadas):
     if lines_cleared_count >= LEVEL_UP_LINES:
         level += 1
         lines_cleared_count -= LEVEL_UP_LINES
-        level_label.config(text=f"Nivel:\n{level}")
+        info_panel.mostrar("nivel", f"Nivel:\n{level}")
+        
+        # El tick pendiente usa la velocidad del nivel anterior
+        if gravity_scheduler.esta_programado():
+            gravity_scheduler.reprogramar(obtener_velocidad_juego())
     
     # 3. Verificar y actualizar récord
     if score > high_score:
         high_score = score
-        high_score_label.config(text=f"Récord:\n{score}")
+        info_panel.mostrar("record", f"Récord:\n{score}")
 
 
 def obtener_velocidad_juego():
@@ -404,6 +441,39 @@ def obtener_velocidad_juego():
     return max(MIN_SPEED, velocidad)
 
 
+def calcular_distancia_caida(forma, x, y):
+    """
+    Calcula cuántas filas puede caer una forma desde (x, y), que es válida.
+    
+    Con las alturas de columna y el perfil inferior de la forma sale sin
+    pruebas de colisión; solo si la pieza está metida bajo un saliente se
+    baja fila por fila con verificar_colision.
+    
+    Args:
+        forma (FormaCompilada): Forma precompilada de la pieza
+        x (int): Posición horizontal
+        y (int): Posición vertical
+        
+    Returns:
+        int: Filas que puede bajar
+    """
+    distancia = BOARD_HEIGHT
+    for x_offset, y_offset in forma.perfil_inferior:
+        # Filas libres entre la celda más baja de la pieza y la cima
+        libres = BOARD_HEIGHT - column_heights[x + x_offset] - 1 - (y + y_offset)
+        if libres < 0:
+            break  # La pieza está por debajo de la cima de esta columna
+        if libres < distancia:
+            distancia = libres
+    else:
+        return distancia
+    
+    distancia = 0
+    while not verificar_colision(forma, x, y + distancia + 1):
+        distancia += 1
+    return distancia
+
+
 def obtener_posicion_fantasma():
     """
     Calcula la posición más baja posible para la pieza actual (posición fantasma).
@@ -414,16 +484,9 @@ def obtener_posicion_fantasma():
     if not current_piece:
         return 0
     
-    forma = obtener_forma_actual()
-    pieza_x = current_piece['x']
-    
     # Encontrar la posición Y más baja posible
-    y_fantasma = current_piece['y']
-    
-    while not verificar_colision(forma, pieza_x, y_fantasma + 1):
-        y_fantasma += 1
-    
-    return y_fantasma
+    return current_piece['y'] + calcular_distancia_caida(
+        obtener_forma_actual(), current_piece['x'], current_piece['y'])
 
 
 # ============================================================================
@@ -456,7 +519,7 @@ def rotar_pieza():
         return
     
     shape_index = current_piece['shape_index']
-    rotaciones = PIECE_SHAPES[shape_index]
+    rotaciones = PIECE_SHAPES_COMPILED[shape_index]
     num_rotaciones = len(rotaciones)
     nueva_rotacion = (current_piece['rotation'] + 1) % num_rotaciones
     nueva_forma = rotaciones[nueva_rotacion]
@@ -480,14 +543,8 @@ def caida_dura():
         return
     
     # Encontrar la posición más baja posible
-    y_prueba = current_piece['y']
-    
-    while not verificar_colision(obtener_forma_actual(), 
-                                 current_piece['x'], 
-                                 y_prueba + 1):
-        y_prueba += 1
-    
-    current_piece['y'] = y_prueba
+    current_piece['y'] += calcular_distancia_caida(
+        obtener_forma_actual(), current_piece['x'], current_piece['y'])
     
     # Fijar la pieza y pasar al siguiente turno
     fijar_pieza_y_siguiente_turno()
@@ -526,6 +583,43 @@ def guardar_pieza():
     dibujar_juego()
 
 
+def alternar_jugador_automatico():
+    """
+    Activa o desactiva el jugador automático (también usa guardar pieza).
+    """
+    global auto_player
+    
+    if auto_player:
+        auto_player = None
+        auto_scheduler.cancelar()
+    else:
+        auto_player = JugadorAutomatico()
+        auto_scheduler.programar(AUTO_PLAY_INTERVAL)
+
+
+def paso_automatico():
+    """
+    Ejecuta una acción del jugador automático y programa la siguiente.
+    """
+    if not auto_player or game_over_flag:
+        return
+    
+    if not is_paused and current_piece:
+        accion = auto_player.siguiente_accion(
+            mascaras_columnas(board_state),
+            (current_piece['shape_index'], current_piece['rotation'],
+             current_piece['x'], current_piece['y']),
+            next_piece['shape_index'] if next_piece else None,
+            (held_piece['shape_index'], held_piece['rotation']) if held_piece else None,
+            can_hold,
+            x_aparicion=(BOARD_WIDTH // 2) - 2
+        )
+        if accion is not None:
+            AUTO_PLAY_ACTIONS[accion]()
+    
+    auto_scheduler.programar(AUTO_PLAY_INTERVAL)
+
+
 def alternar_pausa():
     """
     Alterna el estado de pausa del juego.
@@ -538,7 +632,8 @@ def alternar_pausa():
     is_paused = not is_paused
     
     if is_paused:
-        # Mostrar mensaje de pausa
+        # Detener la gravedad y mostrar mensaje de pausa
+        gravity_scheduler.cancelar()
         canvas.create_text(
             GAME_WIDTH / 2, GAME_HEIGHT / 2,
             text="PAUSADO",
@@ -549,7 +644,7 @@ def alternar_pausa():
     else:
         # Eliminar mensaje de pausa y reanudar juego
         canvas.delete("mensaje_pausa")
-        bucle_juego()  # Reanudar el bucle
+        gravity_scheduler.programar(obtener_velocidad_juego())
 
 
 # ============================================================================
@@ -558,71 +653,37 @@ def alternar_pausa():
 
 def dibujar_estado_tablero():
     """
-    Dibuja el estado actual del tablero (piezas fijas).
+    Actualiza en el lienzo las celdas del tablero que cambiaron.
     """
-    for y in range(BOARD_HEIGHT):
-        for x in range(BOARD_WIDTH):
-            x1 = x * SQUARE_SIZE
-            y1 = y * SQUARE_SIZE
-            x2 = x1 + SQUARE_SIZE
-            y2 = y1 + SQUARE_SIZE
-            
-            valor_celda = board_state[y][x]
-            color = PIECE_COLORS[valor_celda]
-            
-            canvas.create_rectangle(x1, y1, x2, y2, 
-                                    fill=color, outline=GRID_COLOR)
+    board_renderer.dibujar_tablero(board_state)
 
 
 def dibujar_pieza_fantasma():
     """
-    Dibuja la pieza fantasma (sombra de la pieza actual).
+    Coloca la pieza fantasma (sombra de la pieza actual).
     """
     if not current_piece:
+        board_renderer.dibujar_fantasma([])
         return
     
     forma = obtener_forma_actual()
-    pieza_x = current_piece['x']
     y_fantasma = obtener_posicion_fantasma()
-    
-    for y, fila in enumerate(forma):
-        for x, valor_celda in enumerate(fila):
-            if valor_celda != 0:
-                canvas_x = (pieza_x + x) * SQUARE_SIZE
-                canvas_y = (y_fantasma + y) * SQUARE_SIZE
-                
-                if canvas_y >= 0:
-                    canvas.create_rectangle(
-                        canvas_x, canvas_y,
-                        canvas_x + SQUARE_SIZE, canvas_y + SQUARE_SIZE,
-                        fill="", outline=GHOST_COLOR, width=2
-                    )
+    board_renderer.dibujar_fantasma(
+        celdas_absolutas(forma, current_piece['x'], y_fantasma))
 
 
 def dibujar_pieza_actual():
     """
-    Dibuja la pieza actual en movimiento.
+    Coloca la pieza actual en movimiento.
     """
     if not current_piece:
+        board_renderer.ocultar_piezas()
         return
     
     forma = obtener_forma_actual()
-    color_pieza = PIECE_COLORS[current_piece['shape_index']]
-    pieza_x = current_piece['x']
-    pieza_y = current_piece['y']
-    
-    for y, fila in enumerate(forma):
-        for x, valor_celda in enumerate(fila):
-            if valor_celda != 0:
-                canvas_x = (pieza_x + x) * SQUARE_SIZE
-                canvas_y = (pieza_y + y) * SQUARE_SIZE
-                
-                if canvas_y >= 0:
-                    canvas.create_rectangle(
-                        canvas_x, canvas_y,
-                        canvas_x + SQUARE_SIZE, canvas_y + SQUARE_SIZE,
-                        fill=color_pieza, outline="white"
-                    )
+    board_renderer.dibujar_pieza(
+        celdas_absolutas(forma, current_piece['x'], current_piece['y']),
+        current_piece['shape_index'])
 
 
 def dibujar_pieza_mini(lienzo_mini, pieza):
@@ -640,36 +701,31 @@ def dibujar_pieza_mini(lienzo_mini, pieza):
     
     # Usar siempre la primera rotación para visualización
     shape_index = pieza['shape_index']
-    forma = PIECE_SHAPES[shape_index][0]
+    forma = PIECE_SHAPES_COMPILED[shape_index][0]
     color = PIECE_COLORS[shape_index]
     
-    # Calcular desplazamiento para centrar la pieza
-    desplazamiento_x = (MINI_CANVAS_WIDTH - (len(forma[0]) * SQUARE_SIZE_SMALL)) / 2
-    desplazamiento_y = (MINI_CANVAS_HEIGHT - (len(forma) * SQUARE_SIZE_SMALL)) / 2
+    # Calcular desplazamiento para centrar la matriz de la pieza
+    desplazamiento_x = (MINI_CANVAS_WIDTH - (forma.lado * SQUARE_SIZE_SMALL)) / 2
+    desplazamiento_y = (MINI_CANVAS_HEIGHT - (forma.lado * SQUARE_SIZE_SMALL)) / 2
     
-    for y, fila in enumerate(forma):
-        for x, valor_celda in enumerate(fila):
-            if valor_celda != 0:
-                x1 = desplazamiento_x + x * SQUARE_SIZE_SMALL
-                y1 = desplazamiento_y + y * SQUARE_SIZE_SMALL
-                x2 = x1 + SQUARE_SIZE_SMALL
-                y2 = y1 + SQUARE_SIZE_SMALL
-                
-                lienzo_mini.create_rectangle(x1, y1, x2, y2, 
-                                             fill=color, outline="white")
+    for x, y in forma.celdas:
+        x1 = desplazamiento_x + x * SQUARE_SIZE_SMALL
+        y1 = desplazamiento_y + y * SQUARE_SIZE_SMALL
+        x2 = x1 + SQUARE_SIZE_SMALL
+        y2 = y1 + SQUARE_SIZE_SMALL
+        
+        lienzo_mini.create_rectangle(x1, y1, x2, y2, 
+                                     fill=color, outline="white")
 
 
 def dibujar_juego():
     """
-    Función principal de dibujo: limpia y redibuja todo el juego.
+    Función principal de dibujo: actualiza solo lo que cambió.
     """
     if game_over_flag:
         return
     
-    # Limpiar el lienzo
-    canvas.delete("all")
-    
-    # Dibujar todos los componentes
+    # Actualizar todos los componentes
     dibujar_estado_tablero()
     dibujar_pieza_fantasma()
     dibujar_pieza_actual()
@@ -681,11 +737,14 @@ def mostrar_mensaje_game_over():
     """
     global high_score
     
+    # Detener la gravedad
+    gravity_scheduler.cancelar()
+    
     # Guardar nuevo récord si es necesario
     if score > high_score:
         high_score = score
         guardar_puntuacion_maxima(score)
-        high_score_label.config(text=f"Récord:\n{high_score} (¡NUEVO!)")
+        info_panel.mostrar("record", f"Récord:\n{high_score} (¡NUEVO!)")
     
     # Mostrar mensaje de Game Over
     canvas.create_text(
@@ -711,31 +770,71 @@ def fijar_pieza_y_siguiente_turno():
     crear_nueva_pieza()
 
 
+def bajar_pieza_un_paso():
+    """
+    Baja la pieza actual una fila o, si no puede, la fija en el tablero.
+    """
+    if not current_piece:
+        return
+    
+    nueva_y = current_piece['y'] + 1
+    
+    # Verificar colisión
+    if not verificar_colision(obtener_forma_actual(), 
+                              current_piece['x'], 
+                              nueva_y):
+        current_piece['y'] = nueva_y
+    else:
+        # Colisión detectada: fijar pieza y pasar al siguiente turno
+        fijar_pieza_y_siguiente_turno()
+
+
 def bucle_juego():
     """
     Función principal del bucle del juego (game loop).
+    
+    Solo la ejecuta gravity_scheduler, que mantiene un único tick pendiente.
     """
     if game_over_flag or is_paused:
         return  # Detener el bucle si el juego terminó o está en pausa
     
     # Mover la pieza hacia abajo (gravedad)
-    if current_piece:
-        nueva_y = current_piece['y'] + 1
-        
-        # Verificar colisión
-        if not verificar_colision(obtener_forma_actual(), 
-                                  current_piece['x'], 
-                                  nueva_y):
-            current_piece['y'] = nueva_y
-        else:
-            # Colisión detectada: fijar pieza y pasar al siguiente turno
-            fijar_pieza_y_siguiente_turno()
+    bajar_pieza_un_paso()
     
     # Redibujar el juego
     dibujar_juego()
     
-    # Programar próximo ciclo del bucle
-    window.after(obtener_velocidad_juego(), bucle_juego)
+    # Programar próximo ciclo del bucle (si la partida sigue)
+    if not game_over_flag:
+        gravity_scheduler.programar(obtener_velocidad_juego())
+
+
+def caida_suave():
+    """
+    Baja la pieza una fila por orden del jugador (tecla abajo).
+    
+    Reinicia la cuenta del tick de gravedad en lugar de lanzar otro bucle,
+    así la pieza no cae dos veces seguidas.
+    """
+    if game_over_flag or is_paused:
+        return
+    
+    bajar_pieza_un_paso()
+    dibujar_juego()
+    
+    if not game_over_flag:
+        gravity_scheduler.reprogramar(obtener_velocidad_juego())
+
+
+# Función de cada acción del jugador automático
+AUTO_PLAY_ACTIONS = {
+    ACCION_IZQUIERDA: lambda: mover_pieza(-1),
+    ACCION_DERECHA: lambda: mover_pieza(1),
+    ACCION_ROTAR: rotar_pieza,
+    ACCION_BAJAR: caida_suave,
+    ACCION_CAIDA_RAPIDA: caida_dura,
+    ACCION_GUARDAR: guardar_pieza,
+}
 
 
 # ============================================================================
@@ -746,8 +845,8 @@ def configurar_ventana():
     """
     Configura la ventana principal y todos los widgets.
     """
-    global window, canvas, next_canvas, hold_canvas
-    global score_label, high_score_label, level_label
+    global window, gravity_scheduler, auto_scheduler, canvas, board_renderer, next_canvas, hold_canvas
+    global score_label, high_score_label, level_label, info_panel
     global high_score, next_piece, board_state
     
     # ------------------------------------------------------------------------
@@ -757,11 +856,16 @@ def configurar_ventana():
     window.title("Tetris - Versión Mejorada")
     window.resizable(False, False)
     
+    # Único dueño del tick de gravedad
+    gravity_scheduler = PlanificadorTicks(window, bucle_juego)
+    auto_scheduler = PlanificadorTicks(window, paso_automatico)
+    
     # ------------------------------------------------------------------------
     # Cargar récord y crear tablero
     # ------------------------------------------------------------------------
     high_score = leer_puntuacion_maxima()
     board_state = crear_tablero_vacio()
+    recalcular_alturas()
     
     # ------------------------------------------------------------------------
     # Crear frames (contenedores)
@@ -820,6 +924,11 @@ def configurar_ventana():
     )
     level_label.pack(pady=20)
     
+    info_panel = PanelInformacion()
+    info_panel.agregar("record", high_score_label)
+    info_panel.agregar("puntuacion", score_label)
+    info_panel.agregar("nivel", level_label)
+    
     # Sección Hold
     etiqueta_hold = tk.Label(
         frame_lateral,
@@ -867,7 +976,8 @@ def configurar_ventana():
              "↓ : Caída rápida\n"
              "Espacio : Caída dura\n"
              "C : Guardar pieza\n"
-             "P : Pausa",
+             "P : Pausa\n"
+             "A : Jugador automático",
         font=("Arial", 10),
         fg="grey",
         bg=SIDE_PANEL_BG,
@@ -887,16 +997,25 @@ def configurar_ventana():
     )
     canvas.pack()
     
+    # Rectángulos de celdas, pieza y fantasma creados una sola vez
+    board_renderer = RenderizadorTablero(
+        canvas, BOARD_WIDTH, BOARD_HEIGHT, SQUARE_SIZE,
+        PIECE_COLORS, GRID_COLOR,
+        color_fantasma=GHOST_COLOR,
+        dibujar_cuadricula=False
+    )
+    
     # ------------------------------------------------------------------------
     # Configurar controles de teclado
     # ------------------------------------------------------------------------
     window.bind("<Left>", lambda evento: mover_pieza(-1))
     window.bind("<Right>", lambda evento: mover_pieza(1))
     window.bind("<Up>", lambda evento: rotar_pieza())
-    window.bind("<Down>", lambda evento: bucle_juego())  # Caída rápida
+    window.bind("<Down>", lambda evento: caida_suave())  # Caída rápida
     window.bind("<space>", lambda evento: caida_dura())
     window.bind("<c>", lambda evento: guardar_pieza())
     window.bind("<p>", lambda evento: alternar_pausa())
+    window.bind("<a>", lambda evento: alternar_jugador_automatico())
     
     # ------------------------------------------------------------------------
     # Inicializar juego
@@ -0,0 +1,310 @@
+"""
+Comprobación de que MotorVectorizado juega igual que MotorTetris.
+
+MotorVectorizado (motor_vectorizado.py) promete el mismo resultado que
+MotorTetris, colocación a colocación, con cualquier ReglasJuego y en los
+dos modos del generador. Este script lo comprueba con semillas fijas:
+
+- Partidas movimiento a movimiento: cada colocación se juega en
+  MotorTetris con rotar_pieza / mover_izquierda / mover_derecha /
+  caida_rapida y en MotorVectorizado con colocar(), y tras cada una se
+  comparan tablero, piezas, puntuación, líneas, nivel y fin de partida,
+  y antes de cada una colocaciones_validas() con los caminos que admite
+  MotorTetris. Se juega con politica_codiciosa (partidas largas, con
+  dobles y triples) y con una política al azar que también pide
+  rotaciones de más y colocaciones imposibles.
+- Reglas: REGLAS_CLASICAS, una tabla de puntos corta (las líneas sin
+  entrada puntúan como en calcular_puntuacion_lineas) y unas reglas con
+  otra puntuación, otro bonus y otros niveles.
+- Generador: generar_secuencia() en bloque da los mismos tipos que
+  siguiente_tipo() de uno en uno.
+- Repetición: el mismo lote jugado otra vez, y cada partida jugada sola,
+  da exactamente lo mismo.
+
+    python verificar_motor_vectorizado.py
+    python verificar_motor_vectorizado.py --partidas 20 --maximo-piezas 500
+
+Devuelve 1 (y escribe las diferencias) si algo no coincide. Necesita NumPy.
+"""
+
+import argparse
+import random
+import sys
+
+from generador_piezas import MODOS, GeneradorPiezas
+from granja_simulacion import politica_codiciosa
+from motor_tetris import ANCHO_TABLERO, FORMAS_PIEZAS, REGLAS_CLASICAS, MotorTetris, TableroLista
+from motor_vectorizado import ROTACIONES, X_MINIMA, MotorVectorizado
+
+# =============================================
+# CONFIGURACIÓN
+# =============================================
+
+# Partidas por combinación (la partida i usa la semilla i) y tope de piezas
+PARTIDAS = 4
+MAXIMO_PIEZAS = 300
+
+# Reglas con las que se comparan los motores
+REGLAS_PRUEBA = {
+    "clasicas": REGLAS_CLASICAS,
+    # Sin entrada para 3 y 4 líneas: n * PUNTOS_POR_LINEA * nivel
+    "tabla_corta": REGLAS_CLASICAS._replace(puntos_lineas=(0, 100, 300)),
+    "otras": REGLAS_CLASICAS._replace(puntos_lineas=(0, 40, 100, 300, 1200),
+                                      lineas_por_nivel=3, bonus_caida_rapida=1),
+}
+
+# Cantidades de generar_secuencia() (por debajo y por encima de MINIMO_EN_BLOQUE)
+CANTIDADES_GENERADOR = (1, 5, 63, 64, 100, 1000, 20000)
+
+# Partidas del lote de la comprobación de repetición
+PARTIDAS_REPETICION = 16
+
+# =============================================
+# COLOCACIONES EN MOTORTETRIS
+# =============================================
+
+def alcanzable(motor, rotacion, x):
+    """Si la pieza puede girar en la aparición hasta 'rotacion' y desplazarse hasta x"""
+    pieza = motor.pieza_actual
+    tipo, x_inicio, y = pieza['tipo'], pieza['x'], pieza['y']
+    for paso in range(1, rotacion + 1):
+        if motor.verificar_colision(tipo, paso, x_inicio, y):
+            return False
+    direccion = 1 if x >= x_inicio else -1
+    for columna in range(x_inicio, x + direccion, direccion):
+        if motor.verificar_colision(tipo, rotacion, columna, y):
+            return False
+    return True
+
+
+def colocar(motor, rotacion, x):
+    """
+    Lo que hace MotorVectorizado.colocar(), con las teclas de MotorTetris.
+
+    La rotación cuenta módulo las de la pieza; si el camino no está libre,
+    la pieza cae desde la aparición sin girar ni moverse.
+
+    Returns:
+        int: Líneas eliminadas
+    """
+    lineas_antes = motor.lineas_completadas
+    rotacion %= len(FORMAS_PIEZAS[motor.pieza_actual['tipo']])
+    if alcanzable(motor, rotacion, x):
+        for _ in range(rotacion):
+            motor.rotar_pieza()
+        while motor.pieza_actual['x'] < x:
+            motor.mover_derecha()
+        while motor.pieza_actual['x'] > x:
+            motor.mover_izquierda()
+    motor.caida_rapida()
+    return motor.lineas_completadas - lineas_antes
+
+
+def colocaciones_validas(motor):
+    """Lo que debería dar colocaciones_validas() para la pieza actual de MotorTetris"""
+    if not motor.puede_actuar():
+        return [[False] * (ANCHO_TABLERO - X_MINIMA) for _ in range(ROTACIONES)]
+    rotaciones = len(FORMAS_PIEZAS[motor.pieza_actual['tipo']])
+    return [[alcanzable(motor, rotacion % rotaciones, x) for x in range(X_MINIMA, ANCHO_TABLERO)]
+            for rotacion in range(ROTACIONES)]
+
+# =============================================
+# COMPROBACIONES
+# =============================================
+
+def crear_politica_aleatoria(semilla):
+    """Rotación 0..3 y cualquier x, también las que no caben"""
+    aleatorio = random.Random(semilla)
+
+    def politica(motor):
+        return aleatorio.randrange(ROTACIONES), aleatorio.randrange(X_MINIMA, ANCHO_TABLERO)
+
+    return politica
+
+
+def diferencias_estado(motor, lote, indice):
+    """Campos en los que MotorTetris y la partida 'indice' del lote no coinciden"""
+    esperado = {
+        'tablero': [list(fila) for fila in motor.tablero.filas],
+        'pieza_actual': motor.pieza_actual['tipo'] if not motor.juego_terminado else None,
+        'siguiente_pieza': motor.siguiente_pieza['tipo'] if not motor.juego_terminado else None,
+        'puntuacion': motor.puntuacion,
+        'lineas': motor.lineas_completadas,
+        'nivel': motor.nivel,
+        'terminado': motor.juego_terminado,
+    }
+    terminado = bool(lote.terminado[indice])
+    obtenido = {
+        'tablero': lote.tableros[indice].tolist(),
+        'pieza_actual': int(lote.pieza_actual[indice]) if not terminado else None,
+        'siguiente_pieza': int(lote.siguiente_pieza[indice]) if not terminado else None,
+        'puntuacion': int(lote.puntuacion[indice]),
+        'lineas': int(lote.lineas[indice]),
+        'nivel': int(lote.nivel[indice]),
+        'terminado': terminado,
+    }
+    return [campo for campo in esperado if esperado[campo] != obtenido[campo]]
+
+
+def comprobar_partida(semilla, reglas, crear_politica, modo_generador, maximo_piezas=MAXIMO_PIEZAS):
+    """
+    Juega una partida en los dos motores y las compara tras cada colocación.
+
+    Returns:
+        tuple: (piezas jugadas, lista de diferencias; vacía si coinciden)
+    """
+    motor = MotorTetris(semilla=semilla, clase_tablero=TableroLista,
+                        modo_generador=modo_generador, reglas=reglas)
+    lote = MotorVectorizado(1, semillas=[semilla], modo_generador=modo_generador, reglas=reglas)
+    politica = crear_politica(semilla)
+
+    pieza = 0
+    while pieza < maximo_piezas and not motor.juego_terminado:
+        if lote.colocaciones_validas()[0].tolist() != colocaciones_validas(motor):
+            return pieza, [f"pieza {pieza}: colocaciones_validas"]
+        rotacion, x = politica(motor)
+        lineas = colocar(motor, rotacion, x)
+        try:
+            lineas_lote = int(lote.colocar([rotacion], [x])[0])
+        except Exception as error:  # Lo que falle en el lote es una diferencia más
+            return pieza, [f"pieza {pieza}: colocar({rotacion}, {x}) lanzó {error!r}"]
+        campos = diferencias_estado(motor, lote, 0)
+        if lineas != lineas_lote:
+            campos.append(f"líneas eliminadas {lineas} != {lineas_lote}")
+        if campos:
+            return pieza, [f"pieza {pieza}, colocar({rotacion}, {x}): {', '.join(campos)}"]
+        pieza += 1
+    return pieza, []
+
+
+def comprobar_generador(semilla, modo):
+    """
+    Compara generar_secuencia() con siguiente_tipo(), mezclando las dos y ver().
+
+    Returns:
+        list: Diferencias (vacía si coinciden)
+    """
+    en_bloque = GeneradorPiezas(semilla, modo, vista_previa=3)
+    de_uno_en_uno = GeneradorPiezas(semilla, modo, vista_previa=1)
+    diferencias = []
+    for cantidad in CANTIDADES_GENERADOR:
+        en_bloque.ver(2)
+        obtenidas = list(en_bloque.generar_secuencia(cantidad))
+        obtenidas.append(en_bloque.siguiente_tipo())
+        esperadas = [de_uno_en_uno.siguiente_tipo() for _ in range(cantidad + 1)]
+        if obtenidas != esperadas:
+            diferencias.append(f"generar_secuencia({cantidad}) tras ver(2)")
+    return diferencias
+
+
+def estado_final(lote, indice):
+    """Estado de la partida 'indice' de un lote, para comparar"""
+    return (lote.tableros[indice].tolist(), int(lote.puntuacion[indice]),
+            int(lote.lineas[indice]), int(lote.nivel[indice]), int(lote.piezas[indice]),
+            bool(lote.terminado[indice]))
+
+
+def jugar_lote(semillas, modo_generador, reglas, maximo_piezas, colocaciones=None):
+    """
+    Juega un lote entero.
+
+    Args:
+        colocaciones (list): [(rotaciones, xs), ...] a repetir; si es None se
+                             eligen al azar entre las válidas (fijas por semilla)
+
+    Returns:
+        tuple: (lote, colocaciones jugadas)
+    """
+    lote = MotorVectorizado(len(semillas), semillas=semillas, modo_generador=modo_generador,
+                            reglas=reglas)
+    if colocaciones is not None:
+        for rotaciones, xs in colocaciones:
+            lote.colocar(rotaciones, xs)
+        return lote, colocaciones
+
+    aleatorio = random.Random(semillas[0])
+    jugadas = []
+    for _ in range(maximo_piezas):
+        if lote.terminado.all():
+            break
+        # Entre las válidas, para que las partidas duren
+        validas = lote.colocaciones_validas()
+        rotaciones = []
+        xs = []
+        for indice in range(len(semillas)):
+            opciones = [(r, p) for r in range(ROTACIONES) for p in range(validas.shape[2])
+                        if validas[indice, r, p]] or [(0, 0)]
+            rotacion, posicion = aleatorio.choice(opciones)
+            rotaciones.append(rotacion)
+            xs.append(posicion + X_MINIMA)
+        lote.colocar(rotaciones, xs)
+        jugadas.append((rotaciones, xs))
+    return lote, jugadas
+
+
+def comprobar_repeticion(modo_generador, reglas, maximo_piezas=MAXIMO_PIEZAS):
+    """
+    Repite un lote con sus mismas colocaciones, entero y partida a partida.
+
+    Returns:
+        list: Diferencias (vacía si coinciden)
+    """
+    semillas = list(range(100, 100 + PARTIDAS_REPETICION))
+    lote, jugadas = jugar_lote(semillas, modo_generador, reglas, maximo_piezas)
+    esperados = [estado_final(lote, indice) for indice in range(len(semillas))]
+
+    diferencias = []
+    repetido, _ = jugar_lote(semillas, modo_generador, reglas, maximo_piezas, jugadas)
+    if [estado_final(repetido, indice) for indice in range(len(semillas))] != esperados:
+        diferencias.append("el lote repetido no coincide")
+    for indice, semilla in enumerate(semillas):
+        sola = [([rotaciones[indice]], [xs[indice]]) for rotaciones, xs in jugadas]
+        partida, _ = jugar_lote([semilla], modo_generador, reglas, maximo_piezas, sola)
+        if estado_final(partida, 0) != esperados[indice]:
+            diferencias.append(f"la partida de la semilla {semilla} sola no coincide")
+    return diferencias
+
+# =============================================
+# LÍNEA DE COMANDOS
+# =============================================
+
+POLITICAS = {
+    "codiciosa": lambda semilla: politica_codiciosa,
+    "aleatoria": crear_politica_aleatoria,
+}
+
+
+def main(argumentos=None):
+    """Hace todas las comprobaciones; devuelve 1 si alguna falla"""
+    parser = argparse.ArgumentParser(description="Compara MotorVectorizado con MotorTetris")
+    parser.add_argument("--partidas", type=int, default=PARTIDAS,
+                        help="Partidas por reglas, política y modo del generador")
+    parser.add_argument("--maximo-piezas", type=int, default=MAXIMO_PIEZAS)
+    opciones = parser.parse_args(argumentos)
+
+    fallos = []
+    for modo in MODOS:
+        for nombre_reglas, reglas in REGLAS_PRUEBA.items():
+            for nombre_politica, crear_politica in POLITICAS.items():
+                piezas = 0
+                for semilla in range(opciones.partidas):
+                    jugadas, diferencias = comprobar_partida(
+                        semilla, reglas, crear_politica, modo, opciones.maximo_piezas)
+                    piezas += jugadas
+                    fallos += [f"{modo}/{nombre_reglas}/{nombre_politica}/semilla {semilla}: {d}"
+                               for d in diferencias]
+                print(f"{modo}/{nombre_reglas}/{nombre_politica}: {piezas} colocaciones")
+            fallos += [f"{modo}/{nombre_reglas}/repetición: {d}"
+                       for d in comprobar_repeticion(modo, reglas, opciones.maximo_piezas)]
+        for semilla in range(opciones.partidas):
+            fallos += [f"{modo}/generador/semilla {semilla}: {d}"
+                       for d in comprobar_generador(semilla, modo)]
+
+    for fallo in fallos:
+        print(f"Diferencia: {fallo}", file=sys.stderr)
+    print("Todo coincide" if not fallos else f"{len(fallos)} diferencias")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())